@@ -0,0 +1,4 @@
+"""
+pytest root: having this file here puts the repository root on sys.path, so tests import the game packages
+(data, engine, source, utility) the same way main.py does
+"""
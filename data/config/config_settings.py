@@ -25,5 +25,36 @@ DATALOADER_SETTINGS = {
     'data_paths': {
         'station_data': r'/data/locations/stations',
         'ship_data': r'/data/vessels/ships',
-    }
+    },
+    'cache_enabled': True,
+    'cache_dir': r'/data/cache',    # compiled (pickled) data files, rebuilt when a source file changes
+    'pack_mode': False,             # open data files as indexed packs, entries decoded on demand (pays off for
+                                    # single entry reads only, world loading walks every station)
+    'pack_cache_entries': 256,      # decoded entries kept per pack (LRU)
+}
+TEXT_CACHE_SETTINGS = {
+    'capacity': 1024,               # rendered text surfaces kept (LRU), shared by radar and panels
+    'radar_km_step': 5,             # radar distance labels below 1 Mm are rounded to this many km
+    'radar_Mm_step': 0.1,           # radar distance labels from 1 Mm
+    'panel_km_step': 0.1,           # panel target distance below 1 Mm
+    'panel_Mm_step': 0.1,           # panel target distance from 1 Mm
+}
+RADAR_LABEL_SETTINGS = {
+    'budget': 40,                   # vessels labelled per frame at most (selected, locked, then nearest first)
+    'cell_size': 8,                 # pixels per occupancy grid cell
+    'box_estimate': (60, 33),       # label block size tested before its text is rendered
+    'avoid_blips': True,            # labels do not cover other blips
+    'blip_radius': 1,               # occupancy cells marked around each blip
+}
+PROFILER_SETTINGS = {
+    'enabled': True,                # per-phase frame timing in the game loop (one perf_counter call per phase)
+    'window': 600,                  # frames in the rolling percentiles (10 s at 60 fps)
+    'percentiles': (50, 95, 99),
+    'histogram_bins': 120,          # log spaced bins for the whole run percentiles
+    'histogram_range_ms': (0.01, 1000.0),
+    'overlay': False,               # show the overlay at start, toggled with overlay_key
+    'overlay_key': 'F3',            # pygame key name
+    'overlay_refresh': 30,          # frames between overlay text updates
+    'output_dir': r'/utility/tools/logs',
+    'output_format': 'json',        # 'json' or 'csv', written when the game exits
 }
@@ -1 +1,62 @@
-
+SPATIAL_INDEX_SETTINGS = {
+    'location_cell_size': 1000.0,   # world units per grid cell for static locations
+    'vessel_cell_size': 1000.0,     # world units per grid cell for vessels (rebuilt every tick)
+}
+LOD_SETTINGS = {
+    'enabled': True,
+    'reassign_interval': 0.5,       # simulation seconds between tier promotion/demotion passes
+    # tiers ordered near -> far, a vessel uses the first tier whose max_distance (world units from the
+    # player) it is within; update_interval = advance every n-th tick with n times the dt
+    'tiers': [
+        {'max_distance': 6000.0, 'update_interval': 1},     # radar range and a margin: full rate
+        {'max_distance': 20000.0, 'update_interval': 4},
+        {'max_distance': None, 'update_interval': 16},
+    ],
+}
+SHARD_SETTINGS = {
+    'enabled': False,               # step NPC flight in sector worker processes
+    'sectors': (2, 2),              # sector grid (columns, rows) over WorldManager.SHIP_SPAWN_RANGE
+    'workers': None,                # worker processes, None = one per sector capped at the cpu count
+    'gather_radius': 6000.0,        # world units around the player whose vessels are sent back every tick,
+                                    # widened to the player's sensor reach while detection is enabled
+}
+UNIVERSE_GENERATOR_SETTINGS = {
+    'bounds': {'x': [-100000, 100000], 'y': [-100000, 100000]},
+    'stations_per_cluster': 250,    # average, the cluster count follows from the station count
+    'cluster_spread': 2500.0,       # std deviation (world units) of stations around their cluster center
+    'cluster_size_sigma': 1.0,      # lognormal sigma of cluster sizes, higher = denser core systems
+    'background_fraction': 0.1,     # stations scattered uniformly outside any cluster
+    'planets_per_cluster': 3,       # parent locations per cluster, stations orbit one of them
+    'ships_per_station': 0.5,       # NPC ships in the generated spawn table
+    'ship_weights': {'scout_01': 5, 'freighter_omega': 2, 'corsair_07': 3},
+    'chunk_size': 10000,            # entries generated and written per batch
+    'station_types': ['orbital', 'outpost', 'depot', 'shipyard'],
+    'factions': ['Iron Confederacy', 'Silverwind Trade Guild', 'Free Traders', 'neutral'],
+    'services': ['docking', 'fuel', 'market', 'repair', 'missions', 'mining_jobs', 'shipyard'],
+    'security_levels': ['low', 'medium', 'high'],
+    'name_prefixes': ['Iron', 'Silver', 'Nova', 'Helix', 'Obsidian', 'Aurora', 'Cinder', 'Vega', 'Drift', 'Tycho'],
+    'name_suffixes': ['Station', 'Port', 'Outpost', 'Hub', 'Depot', 'Anchorage', 'Relay'],
+}
+DETECTION_SETTINGS = {
+    'enabled': False,               # sensor fog of war, off until ship signatures and sensor ranges are tuned
+                                    # (a scout is only picked up at ~1.6 Mm on a radar showing ~4.5 Mm)
+    'interval': 0.1,                # simulation seconds between detection passes
+    'reference_signature': 0.1,     # a sensor sees a contact of this signature at exactly its range_Mm
+    'max_signature': 1.0,           # upper bound of signature values, sizes the broad-phase query
+    'max_range_Mm': 50.0,           # cap of the broad-phase query radius
+}
+NAVIGATION_SETTINGS = {
+    'enabled': True,
+    'neighbors': 6,                 # every location is linked to its k nearest locations (edges are symmetric)
+    'max_edge_range': None,         # world units, longer links are left out (None = no limit)
+    'path_cache_size': 4096,        # shortest paths kept in the shared route cache (LRU)
+    'cache_file': r'/data/cache/navigation_graph.npz',     # graph and route cache, reused while locations match
+}
+DESTINATION_SETTINGS = {
+    'enabled': True,
+    'leaf_size': 16,                # locations per KD-tree leaf
+    'candidates': 16,               # nearest locations an AI ship picks its next destination from
+    'radius': None,                 # world units, only pick destinations this close (None = nearest candidates)
+    'distance_offset': 500.0,       # pick weight = 1 / (distance + offset) ** falloff
+    'distance_falloff': 1.0,        # 0 = uniform over the candidates, higher = stronger bias to close ones
+}
@@ -7,6 +7,7 @@ Game core orchestration.
 - RadarSystem computes blips
 - RadarRenderer draws radar + blips + selection/lock/destination markers
 - PanelRenderer draws left/right panels and handles panel button clicks
+- FrameProfiler times every loop phase, ProfilerOverlay shows the percentiles (F3)
 
 Drop this file into engine/core/ and import Game from your entrypoint.
 """
@@ -14,13 +15,18 @@ Drop this file into engine/core/ and import Game from your entrypoint.
 from __future__ import annotations
 
 import pygame
+from datetime import datetime
+from os.path import abspath, dirname
 from typing import Iterable, Optional
 
 from engine.managers.world_manager import WorldManager
 from engine.input.input_manager import InputManager
 from engine.logic.radar_class import Radar_System
-from engine.renderers.radar_renderer import RadarRenderer
+from engine.renderers.radar_renderer import RadarRenderer, BACKGROUND_COLOR
 from engine.renderers.panel_renderer import PanelRenderer
+from engine.renderers.profiler_overlay import ProfilerOverlay
+from data.config.config_settings import PROFILER_SETTINGS
+from utility.tools.frame_profiler import FrameProfiler
 from source.classes.location._location import Location
 from source.classes.ship._vessel import Vessel
 from source.classes.player.player import Player
@@ -66,6 +72,13 @@ class Game:
         self.right_panel = PanelRenderer(self.screen, right_panel_rect, side="right")
         self.left_panel = PanelRenderer(self.screen, left_panel_rect, side="left")
 
+        self._radar_rect: pygame.Rect | None = None     # radar screen area of the last frame
+
+        # Frame profiler: per-phase timings of run(), overlay below the left panel
+        self.profiler = FrameProfiler(["update", "blips", "events", "radar", "panels", "display"])
+        self.profiler_overlay = ProfilerOverlay(self.screen, (40, 670), self.profiler)
+        self.profiler_key = pygame.key.key_code(PROFILER_SETTINGS['overlay_key'])
+
         # register panel actions that call Game methods
         self.right_panel.register_action("Confirm Move", self._confirm_move)
         self.right_panel.register_action("Cancel Move", self._cancel_move)
@@ -107,40 +120,51 @@ class Game:
         self.input_manager.toggle_lock()
 
     def _confirm_move(self):
+        selected = self.input_manager.selected
+        coords = self.input_manager.pending_destination.get("coords")
         moved = self.input_manager.confirm_move()
         if moved:
             # pending_destination cleared by InputManager.confirm_move()
-            # no extra state required here
+            # a pending destination on the selected location is reached over the navigation graph, anything
+            # else (empty space clicked while a location stays selected, vessels) is flown to directly
+            if isinstance(selected, Location) and tuple(coords) == tuple(selected.coordinates):
+                self.player.follow_route(self.world_manager.plan_route(self.player.coordinates, selected))
+            else:
+                self.player.follow_route([])
             return True
         return False
 
     def _cancel_move(self):
         self.input_manager.cancel_move()
 
+    def _write_profile(self):
+        """Save the frame profile to PROFILER_SETTINGS['output_dir'], one timestamped file per session"""
+        if not self.profiler.enabled or not self.profiler.frames:
+            return
+        root = dirname(dirname(dirname(abspath(__file__))))
+        time_start = datetime.now().strftime("%Y-%m-%d_%Hh-%Mm-%Ss")
+        path = f"{root}{PROFILER_SETTINGS['output_dir']}/frame-profile-{time_start}.{PROFILER_SETTINGS['output_format']}"
+        print(f"[Game] Frame profile written to {self.profiler.write(path)}")
+
     # -------------------------
     # Main loop
     # -------------------------
     def run(self):
+        profiler = self.profiler
         while self.running:
             dt = self.clock.tick(60) / 1000.0
+            profiler.begin_frame()      # after tick(), the frame cap sleep is not part of the frame
 
             # --- update simulation ---
-            # update player and vessels (vessel.update should move them if they have destinations)
-            self.player.update_flight(dt)
-            for v in self.vessels:
-                v.update(dt)
+            # player and vessels share one fleet state, flight is advanced in a single batched pass
+            self.world_manager.update(dt)
+            profiler.mark("update")
 
             # --- radar blips ---
-            # compute blips for world_locations (and optionally vessels)
-            # radar_system.get_blips expects player and a list of Location-like objects
-            blips: list[Location | Vessel | Player] = []
-            # include world_locations and vessels as blippable objects
-            blips.extend(self.radar_system.get_blips(self.player, self.world_locations))
-            # for vessels, convert to same interface (if you want them on radar)
-            # NOTE: Radar_System.get_blips mutates objects with radar_dx/radar_dy
-            if self.vessels:
-                vessel_blips = self.radar_system.get_blips(self.player, self.vessels)
-                blips.extend(vessel_blips)
+            # one vectorized pass over world_locations and vessels near the player,
+            # returns a BlipBuffer consumed by the input hit-testing and the renderer
+            blips = self.radar_system.get_blips(self.player, self.world_manager)
+            profiler.mark("blips")
 
             # --- event handling ---
             # engine/core/game_core.py (inside Game.run)
@@ -149,6 +173,11 @@ class Game:
                     self.running = False
                     break
 
+                if event.type == pygame.KEYDOWN and event.key == self.profiler_key:
+                    self.profiler_overlay.toggle()
+                    self._radar_rect = None     # full redraw, a hidden overlay leaves its area to be cleared
+                    continue
+
                 # let panels consume clicks first (they return True if they handled the event)
                 panel_consumed = self.right_panel.handle_event(event) or self.left_panel.handle_event(event)
                 if panel_consumed:
@@ -164,10 +193,18 @@ class Game:
                 # Panels handle their own button click detection
                 self.right_panel.handle_event(event)
                 self.left_panel.handle_event(event)
+            profiler.mark("events")
 
             # --- drawing ---
-            self.screen.fill((20, 20, 20))
-
+            # only the radar area is cleared and redrawn every frame, panels keep their content on screen
+            # until it changes; the display is updated for the dirty rects only
+            radar_rect = self.radar_renderer.bounds
+            full_redraw = radar_rect != self._radar_rect
+            self._radar_rect = radar_rect
+            damaged = self.screen.get_rect() if full_redraw else radar_rect
+            self.screen.fill(BACKGROUND_COLOR, damaged)
+
+            self.screen.set_clip(radar_rect)
             self.radar_renderer.draw(
                 blips,
                 self.player,
@@ -175,21 +212,35 @@ class Game:
                 locked=self.input_manager.locked_target,
                 destination_marker=self.input_manager.pending_destination
             )
+            self.screen.set_clip(None)
+            profiler.mark("radar")
 
-            self.right_panel.draw(
+            dirty = [radar_rect]
+            dirty += self.right_panel.draw(
                 self.player,
                 selected=self.input_manager.selected,
                 locked=self.input_manager.locked_target,
-                pending_destination=self.input_manager.pending_destination
+                pending_destination=self.input_manager.pending_destination,
+                damaged=damaged,
             )
 
-            self.left_panel.draw(
+            dirty += self.left_panel.draw(
                 self.player,
                 selected=self.input_manager.selected,
                 locked=self.input_manager.locked_target,
-                pending_destination=self.input_manager.pending_destination
+                pending_destination=self.input_manager.pending_destination,
+                damaged=damaged,
             )
-
-            pygame.display.flip()
-
+            dirty += self.profiler_overlay.draw(damaged=damaged)
+            profiler.mark("panels")
+
+            if full_redraw:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            profiler.mark("display")
+            profiler.end_frame()
+
+        self._write_profile()
+        self.world_manager.close()
         pygame.quit()
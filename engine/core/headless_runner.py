@@ -0,0 +1,136 @@
+# engine/core/headless_runner.py
+"""
+Headless simulation runner.
+
+- Builds the world through WorldManager.load()
+- Steps the world and Radar_System.get_blips for N ticks as fast as possible
+- No display, no pygame, no renderer imports
+- Reports ticks/sec, per-phase timings and peak memory
+
+Used to measure simulation scaling on machines without a display and to separate simulation cost
+from render cost. Start it through headless_main.py.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from engine.logic.radar_class import Radar_System
+from engine.managers.world_manager import WorldManager
+
+
+class HeadlessRunner:
+    """Runs the simulation without rendering and collects throughput statistics."""
+
+    def __init__(
+        self,
+        ticks: int = 1000,
+        dt: float = 1 / 60,
+        ship_count: int | None = None,
+        station_count: int | None = None,
+        time_scale: float = 1.0,
+        trace_memory: bool = True,
+        verbose: bool = False,
+        sharded: bool = False,
+        catalogue: str | None = None,
+    ):
+        self.ticks = ticks
+        self.dt = dt
+        self.ship_count = ship_count
+        self.station_count = station_count
+        self.time_scale = time_scale
+        self.trace_memory = trace_memory
+        self.verbose = verbose
+        self.sharded = sharded
+        self.catalogue = catalogue
+
+        # same radar configuration as Game
+        self.radar_system = Radar_System(5000, 0.1, 450)
+
+        self.world_manager: WorldManager | None = None
+        self.phase_times: dict[str, float] = {}
+        self.results: dict = {}
+
+
+    def _timed(self, phase: str, start: float) -> float:
+        """Add the time since start to phase, return a new start time."""
+        now = time.perf_counter()
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + (now - start)
+        return now
+
+
+    def run(self) -> dict:
+        """
+        Build the world and step it self.ticks times
+
+        :return: results dict (also stored in self.results)
+        """
+        if self.trace_memory:
+            tracemalloc.start()
+
+        # --- world ---
+        start = time.perf_counter()
+        self.world_manager = WorldManager(sharded=self.sharded)
+        self.world_manager.logger.logger_enabled = self.verbose
+        self.world_manager.clock.time_scale = self.time_scale
+        if self.ship_count is not None:
+            self.world_manager.scale_spawn_table(self.ship_count)
+        locations, vessels, player = self.world_manager.load(station_count=self.station_count, catalogue=self.catalogue)
+        load_time = time.perf_counter() - start
+
+        # --- simulation loop ---
+        self.phase_times = {"world_update": 0.0, "blips": 0.0}
+        blip_count = 0
+        loop_start = time.perf_counter()
+        for _ in range(self.ticks):
+            t = time.perf_counter()
+            self.world_manager.update(self.dt)
+            t = self._timed("world_update", t)
+
+            blips = self.radar_system.get_blips(player, self.world_manager)
+            self._timed("blips", t)
+            blip_count += len(blips)
+        loop_time = time.perf_counter() - loop_start
+        self.world_manager.close()
+
+        peak_memory = None
+        if self.trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        self.results = {
+            "ships": len(vessels),
+            "stations": len(locations),
+            "ticks": self.ticks,
+            "sim_seconds": self.world_manager.clock.now,
+            "load_seconds": load_time,
+            "loop_seconds": loop_time,
+            "ticks_per_second": self.ticks / loop_time if loop_time > 0 else float("inf"),
+            "phase_ms_per_tick": {k: v * 1000 / max(self.ticks, 1) for k, v in self.phase_times.items()},
+            "avg_blips_per_tick": blip_count / max(self.ticks, 1),
+            "peak_memory_bytes": peak_memory,
+        }
+        return self.results
+
+
+    def report(self) -> str:
+        """
+        Format the last run's results as a human readable report
+
+        :return: report string
+        """
+        r = self.results
+        lines = [
+            f"ships: {r['ships']}  stations: {r['stations']}  ticks: {r['ticks']}",
+            f"load:        {r['load_seconds'] * 1000:.1f} ms",
+            f"loop:        {r['loop_seconds']:.3f} s  ({r['sim_seconds']:.1f} s simulated)",
+            f"throughput:  {r['ticks_per_second']:.1f} ticks/s",
+            f"avg blips:   {r['avg_blips_per_tick']:.1f} per tick",
+            "phases (ms/tick):",
+        ]
+        for phase, ms in r["phase_ms_per_tick"].items():
+            lines.append(f"  {phase:<16} {ms:.4f}")
+        if r["peak_memory_bytes"] is not None:
+            lines.append(f"peak memory: {r['peak_memory_bytes'] / (1024 * 1024):.2f} MiB (tracemalloc)")
+        return "\n".join(lines)
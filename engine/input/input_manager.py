@@ -1,7 +1,7 @@
 # engine/input/input_manager.py
 import pygame
-from typing import Iterable
 from engine.core.tools import mouse_to_world
+from engine.logic.blip_buffer import BlipBuffer
 
 HIT_RADIUS_PX = 6
 HIT_RADIUS_SQ = HIT_RADIUS_PX * HIT_RADIUS_PX
@@ -38,7 +38,7 @@ class InputManager:
         r = self.radar_renderer.size
         return (mx - cx) ** 2 + (my - cy) ** 2 <= r * r
 
-    def handle_event(self, event: pygame.event.Event, blip_object_list: Iterable):
+    def handle_event(self, event: pygame.event.Event, blips: BlipBuffer):
         # keyboard
         if event.type == pygame.KEYDOWN:
             self._handle_keyboard(event)
@@ -46,7 +46,7 @@ class InputManager:
         # left mouse button
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.inside_radar(event.pos):
-                self._handle_radar_click(event.pos, blip_object_list)
+                self._handle_radar_click(event.pos, blips)
             else:
                 self._handle_world_click(event.pos)
 
@@ -69,6 +69,9 @@ class InputManager:
         elif event.key == pygame.K_DOWN:
             self.render_scale = max(0.001, self.render_scale - 0.005)
             self.render_label_scale += 0.010
+        elif event.key == pygame.K_l:
+            # vessel labels on/off (without them the radar shows many more contacts per frame)
+            self.radar_renderer.show_labels = not self.radar_renderer.show_labels
 
         # sync values
         self.radar_system.scale = self.render_scale
@@ -76,25 +79,25 @@ class InputManager:
         self.radar_renderer.label_scale = self.render_label_scale
 
     # ----- radar click handling -----
-    def _handle_radar_click(self, pos: tuple[int, int], blip_object_list: Iterable):
+    def _handle_radar_click(self, pos: tuple[int, int], blips: BlipBuffer):
         mx, my = pos
         cx, cy = self.radar_renderer.center
 
-        clicked_on_blip = False
         self._last_selection = None
 
-        for obj in blip_object_list:
-            bx, by = cx + getattr(obj, "radar_dx", 0), cy + getattr(obj, "radar_dy", 0)
-            if (mx - bx) ** 2 + (my - by) ** 2 <= HIT_RADIUS_SQ:
-                clicked_on_blip = True
-                self.selected = obj
-                self._last_selection = obj
-                # prepare pending destination to object's world coordinates (preview)
-                self.pending_destination["active"] = True
-                self.pending_destination["coords"] = tuple(obj.coordinates)
-                # store approximate screen position for UI (used by panel or overlays)
-                self.pending_destination["screen_pos"] = (bx, by)
-                return
+        # vectorized hit-test against the blip buffer offsets
+        hit = blips.hit_test((mx - cx, my - cy), HIT_RADIUS_SQ)
+        if hit is not None:
+            obj = blips.object_at(hit)
+            bx, by = cx + float(blips.offsets[hit, 0]), cy + float(blips.offsets[hit, 1])
+            self.selected = obj
+            self._last_selection = obj
+            # prepare pending destination to object's world coordinates (preview)
+            self.pending_destination["active"] = True
+            self.pending_destination["coords"] = tuple(obj.coordinates)
+            # store approximate screen position for UI (used by panel or overlays)
+            self.pending_destination["screen_pos"] = (bx, by)
+            return
 
         # if not clicking a blip: set pending destination to clicked radar point (convert to world)
         dest_world = mouse_to_world(mx, my, self.radar_renderer.center, self.player, self.radar_system.scale)
@@ -0,0 +1,77 @@
+"""
+Blip buffer
+
+Compact, array-backed result of a radar pass. Instead of writing radar_dx/radar_dy onto every Location
+or Vessel, Radar_System returns one BlipBuffer per frame holding:
+
+    indices  (n,)   int32   index into the source list of the blip's kind
+    offsets  (n, 2) float32 radar-space offset in pixels relative to the radar center
+    kinds    (n,)   uint8   KIND_LOCATION or KIND_VESSEL
+    identified (n,) bool    False for sensor contacts that are detected but not identified
+
+The renderer and the input hit-testing consume these arrays directly.
+"""
+import numpy as np
+
+KIND_LOCATION = 0
+KIND_VESSEL = 1
+
+
+class BlipBuffer:
+    def __init__(self, indices: np.ndarray, offsets: np.ndarray, kinds: np.ndarray, sources: dict,
+                 identified: np.ndarray | None = None):
+        """
+        :param indices: index of each blip into sources[kind]
+        :param offsets: radar-space pixel offsets (dx, dy) of each blip
+        :param kinds: kind flag of each blip
+        :param sources: kind -> list of objects the indices refer to
+        :param identified: per blip identification flag, defaults to all identified
+        """
+        self.indices: np.ndarray = indices
+        self.offsets: np.ndarray = offsets
+        self.kinds: np.ndarray = kinds
+        self.sources: dict = sources
+        self.identified: np.ndarray = identified if identified is not None else np.ones(len(indices), dtype=bool)
+
+
+    @classmethod
+    def empty(cls) -> "BlipBuffer":
+        return cls(np.empty(0, dtype=np.int32), np.empty((0, 2), dtype=np.float32), np.empty(0, dtype=np.uint8), {})
+
+
+    def __len__(self):
+        return len(self.indices)
+
+
+    def object_at(self, i: int):
+        """
+        Resolve blip i to its Location or Vessel object
+
+        :param i: blip position in the buffer
+        :return: object
+        """
+        return self.sources[int(self.kinds[i])][int(self.indices[i])]
+
+
+    def objects(self) -> list:
+        """
+        Resolve all blips to their objects, in buffer order
+
+        :return: list of objects
+        """
+        return [self.sources[kind][index] for kind, index in zip(self.kinds.tolist(), self.indices.tolist())]
+
+
+    def hit_test(self, offset: tuple[float, float], radius_sq: float) -> int | None:
+        """
+        Find the first blip within sqrt(radius_sq) pixels of a radar-space offset
+
+        :param offset: (dx, dy) in pixels relative to the radar center
+        :param radius_sq: squared hit radius in pixels
+        :return: blip position in the buffer, or None
+        """
+        if not len(self):
+            return None
+        delta = self.offsets - np.asarray(offset, dtype=np.float32)
+        hits = np.flatnonzero(np.einsum('ij,ij->i', delta, delta) <= radius_sq)
+        return int(hits[0]) if hits.size else None
@@ -0,0 +1,152 @@
+"""
+KD-tree spatial index
+
+Static 2d index for points that do not move (locations). Built once by recursive median splits along the
+wider axis of each node's bounding box, items of a node are one contiguous range of the order array so a
+leaf is a single slice. Nearest-k queries bound the k-th distance from the deepest node around the query
+point holding k items and gather the leaves whose boxes reach into that bound, radius queries take fully
+covered nodes without testing their items.
+Both cost O(log n) node visits plus the size of the answer.
+
+Unlike SpatialGrid the query cost does not depend on a cell size matching the point density, which makes
+it the better fit for clustered catalogues (dense core systems next to nearly empty space).
+"""
+import numpy as np
+
+
+class KDTree:
+    def __init__(self, positions: np.ndarray, leaf_size: int = 16):
+        """
+        :param positions: (n, 2) array of world positions, item i of later queries is row i
+        :param leaf_size: max items per leaf
+        """
+        self.positions: np.ndarray = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.leaf_size: int = max(1, leaf_size)
+        self.order: np.ndarray = np.arange(len(self.positions), dtype=np.int64)    # item indices, node ranges
+
+        # per node: item range [start, end), bounding box and children (-1 for leaves)
+        self._start: list[int] = []
+        self._end: list[int] = []
+        self._box: list[tuple[float, float, float, float]] = []
+        self._left: list[int] = []
+        self._right: list[int] = []
+
+        if len(self.positions):
+            self._build(0, len(self.positions))
+
+
+    def __len__(self):
+        return len(self.positions)
+
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self._start)
+        items = self.order[start:end]
+        points = self.positions[items]
+        (x_min, y_min), (x_max, y_max) = points.min(axis=0).tolist(), points.max(axis=0).tolist()
+        self._start.append(start)
+        self._end.append(end)
+        self._box.append((x_min, y_min, x_max, y_max))
+        self._left.append(-1)
+        self._right.append(-1)
+
+        if end - start > self.leaf_size:
+            # median split along the wider axis
+            axis = 0 if x_max - x_min >= y_max - y_min else 1
+            mid = (start + end) // 2
+            self.order[start:end] = items[np.argpartition(points[:, axis], mid - start)]
+            self._left[node] = self._build(start, mid)
+            self._right[node] = self._build(mid, end)
+        return node
+
+
+    def _box_distance_sq(self, node: int, cx: float, cy: float) -> float:
+        x_min, y_min, x_max, y_max = self._box[node]
+        dx = x_min - cx if cx < x_min else (cx - x_max if cx > x_max else 0.0)
+        dy = y_min - cy if cy < y_min else (cy - y_max if cy > y_max else 0.0)
+        return dx * dx + dy * dy
+
+
+    def query_nearest(self, center: tuple, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k items closest to center
+
+        :param center: world position (x, y)
+        :param k: number of items
+        :return: item indices and their distances, nearest first (fewer than k if the tree is smaller)
+        """
+        n = len(self.positions)
+        if not n or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        k = min(k, n)
+        cx, cy = center
+
+        # --- bound: k-th distance within the deepest node on the way to center that holds k items ---
+        node = bound_node = 0
+        while self._left[node] >= 0:
+            left, right = self._left[node], self._right[node]
+            node = left if self._box_distance_sq(left, cx, cy) <= self._box_distance_sq(right, cx, cy) else right
+            if self._end[node] - self._start[node] < k:
+                break
+            bound_node = node
+        items = self.order[self._start[bound_node]:self._end[bound_node]]
+        delta = self.positions[items] - (cx, cy)
+        bound = np.partition(np.einsum('ij,ij->i', delta, delta), k - 1)[k - 1]
+
+        # --- gather every leaf that can hold an item within the bound, then pick the k nearest ---
+        spans = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance_sq(node, cx, cy) > bound:
+                continue
+            if self._left[node] >= 0:
+                stack.extend((self._left[node], self._right[node]))
+            else:
+                spans.append(self.order[self._start[node]:self._end[node]])
+        candidates = np.concatenate(spans)
+        delta = self.positions[candidates] - (cx, cy)
+        distances = np.einsum('ij,ij->i', delta, delta)
+        if len(candidates) > k:
+            nearest = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[nearest], distances[nearest]
+        ranked = np.argsort(distances, kind='stable')
+        return candidates[ranked], np.sqrt(distances[ranked])
+
+
+    def query_radius(self, center: tuple, radius: float) -> np.ndarray:
+        """
+        Find all items within radius of center
+
+        :param center: world position (x, y)
+        :param radius: query radius in world units
+        :return: sorted array of item indices (rows of the positions passed in)
+        """
+        if not len(self.positions):
+            return np.empty(0, dtype=np.int64)
+
+        cx, cy = center
+        radius_sq = radius * radius
+        inside, candidates = [], []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance_sq(node, cx, cy) > radius_sq:
+                continue
+            x_min, y_min, x_max, y_max = self._box[node]
+            far_x, far_y = max(cx - x_min, x_max - cx), max(cy - y_min, y_max - cy)
+            items = self.order[self._start[node]:self._end[node]]
+            if far_x * far_x + far_y * far_y <= radius_sq:
+                inside.append(items)            # whole box covered, no per item test
+            elif self._left[node] >= 0:
+                stack.extend((self._left[node], self._right[node]))
+            else:
+                candidates.append(items)
+
+        if candidates:
+            candidates = np.concatenate(candidates)
+            delta = self.positions[candidates] - (cx, cy)
+            inside.append(candidates[np.einsum('ij,ij->i', delta, delta) <= radius_sq])
+        if not inside:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(inside))
@@ -0,0 +1,97 @@
+"""
+Label occupancy grid
+
+Screen-space grid of cell_size pixel cells marking what is already covered this frame (placed labels,
+blips). Labels are placed greedily in priority order: a label whose box touches an occupied cell is
+skipped instead of drawn on top of another one. Tests and marks are slices of one bool array, so a
+placement pass costs O(labels tried) and not O(labels²).
+"""
+import numpy as np
+
+
+class LabelGrid:
+    def __init__(self, size: tuple[int, int], cell_size: int = 8):
+        """
+        :param size: (width, height) of the screen area in pixels
+        :param cell_size: pixels per grid cell, smaller = tighter packing
+        """
+        self.cell_size: int = cell_size
+        width, height = size
+        self.cells = np.zeros((-(-height // cell_size), -(-width // cell_size)), dtype=bool)
+
+
+    def clear(self) -> None:
+        self.cells[:] = False
+
+
+    def _span(self, x: int, y: int, w: int, h: int) -> tuple[slice, slice]:
+        cs = self.cell_size
+        rows, cols = self.cells.shape
+        return (slice(min(max(y // cs, 0), rows), min(max((y + h - 1) // cs + 1, 0), rows)),
+                slice(min(max(x // cs, 0), cols), min(max((x + w - 1) // cs + 1, 0), cols)))
+
+
+    def is_free(self, x: int, y: int, w: int, h: int) -> bool:
+        """
+        Nothing placed under the box yet (parts off the grid count as free)
+
+        :param x: left
+        :param y: top
+        :param w: width
+        :param h: height
+        :return: box is free
+        """
+        return not self.cells[self._span(x, y, w, h)].any()
+
+
+    def free_mask(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        is_free() for many boxes at once against the current marks (summed area table), used to drop
+        candidates before the placement loop; cells only get marked, so a box that is not free now never
+        becomes free later in the pass
+
+        :param boxes: (n, 4) int array of x, y, w, h
+        :return: (n,) bool, box is free
+        """
+        rows, cols = self.cells.shape
+        table = np.zeros((rows + 1, cols + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(self.cells, axis=0), axis=1, out=table[1:, 1:])
+
+        cs = self.cell_size
+        x, y, w, h = np.asarray(boxes, dtype=np.int64).T
+        r0, r1 = np.clip(y // cs, 0, rows), np.clip((y + h - 1) // cs + 1, 0, rows)
+        c0, c1 = np.clip(x // cs, 0, cols), np.clip((x + w - 1) // cs + 1, 0, cols)
+        covered = table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0]
+        return covered == 0
+
+
+    def occupy(self, x: int, y: int, w: int, h: int) -> None:
+        """
+        Mark a box as covered
+
+        :param x: left
+        :param y: top
+        :param w: width
+        :param h: height
+        :return:
+        """
+        self.cells[self._span(x, y, w, h)] = True
+
+
+    def occupy_points(self, points: np.ndarray, radius: int = 0) -> None:
+        """
+        Mark the cells around many points at once (e.g. every blip on screen)
+
+        :param points: (n, 2) pixel positions
+        :param radius: extra cells marked on each side of a point's cell
+        :return:
+        """
+        if not len(points):
+            return
+        rows, cols = self.cells.shape
+        cells = np.asarray(points) // self.cell_size
+        for dr in range(-radius, radius + 1):
+            for dc in range(-radius, radius + 1):
+                r, c = cells[:, 1] + dr, cells[:, 0] + dc
+                inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+                self.cells[r[inside], c[inside]] = True
@@ -1,4 +1,7 @@
-from source.classes.location._location import Location
+import numpy as np
+
+from engine.logic.blip_buffer import BlipBuffer, KIND_LOCATION, KIND_VESSEL
+from engine.logic.spatial_grid import SpatialGrid
 from source.classes.player.player import Player
 
 
@@ -9,18 +12,63 @@ class Radar_System:
         self.size = radar_size
 
 
-    def get_blips(self, player: Player, loc_list: list[Location]):
-        blips = []
-        sx, sy = player.coordinates
-        for location in loc_list:
-            dx = location.coordinates[0] - sx
-            dy = location.coordinates[1] - sy
+    def _radar_offsets(self, positions: np.ndarray, center: tuple) -> np.ndarray:
+        """
+        Remap world positions to radar-space pixel offsets (ship-centered + player orientation)
+
+        Axis mapping:
+            Up = +x, Right = +y → radar_dx = dy, radar_dy = -dx
+
+        :param positions: (n, 2) world positions
+        :param center: player world position
+        :return: (n, 2) float32 offsets
+        """
+        rel = positions - center
+        offsets = np.empty((len(positions), 2), dtype=np.float32)
+        offsets[:, 0] = rel[:, 1] * self.scale
+        offsets[:, 1] = -rel[:, 0] * self.scale
+        return offsets
+
+
+    def get_blips(self, player: Player, world_manager) -> BlipBuffer:
+        """
+        Compute every location and detected vessel within radar range in one vectorized pass
+
+        :param player: player ship, radar center
+        :param world_manager: WorldManager owning the locations, vessels and their spatial indexes
+        :return: BlipBuffer (locations first, then vessels)
+        """
+        center = player.coordinates
+        world_radius = self.size / self.scale
+
+        location_index: SpatialGrid = world_manager.location_index
+        vessel_index: SpatialGrid = world_manager.vessel_index
+
+        locations = location_index.query_radius(center, world_radius)
+        vessels = vessel_index.query_radius(center, world_radius)
+        # invisible vessels (docked etc.) never become blips
+        vessels = vessels[world_manager.fleet.visible[world_manager.vessel_rows[vessels]]]
+
+        # fog of war: only vessels the player's sensors detect, unidentified ones are flagged
+        identified = np.ones(len(locations) + len(vessels), dtype=bool)
+        if world_manager.detection.enabled:
+            contacts = world_manager.player_contacts
+            positions_in_contacts = np.searchsorted(contacts.indices, vessels)
+            detected = positions_in_contacts < len(contacts)
+            detected[detected] = contacts.indices[positions_in_contacts[detected]] == vessels[detected]
+            vessels = vessels[detected]
+            identified = np.concatenate((np.ones(len(locations), dtype=bool),
+                                         contacts.identified[positions_in_contacts[detected]]))
 
-            # remap axes (ship-centered + player orientation) and attach to object
-            location.radar_dx = dy * self.scale
-            location.radar_dy = -dx * self.scale
+        positions = np.concatenate((location_index.positions[locations], vessel_index.positions[vessels]))
+        kinds = np.empty(len(positions), dtype=np.uint8)
+        kinds[:len(locations)] = KIND_LOCATION
+        kinds[len(locations):] = KIND_VESSEL
 
-            dist = (location.radar_dx ** 2 + location.radar_dy ** 2) ** 0.5
-            if dist <= self.size:
-                blips.append(location)
-        return blips
+        return BlipBuffer(
+            indices=np.concatenate((locations, vessels)).astype(np.int32),
+            offsets=self._radar_offsets(positions, center),
+            kinds=kinds,
+            sources={KIND_LOCATION: world_manager.locations, KIND_VESSEL: world_manager.vessels},
+            identified=identified,
+        )
@@ -0,0 +1,75 @@
+"""
+Uniform grid spatial index
+
+Buckets 2d positions into square cells and answers circular range queries by only looking at the
+cells that overlap the query circle. Built from a NumPy position array in one vectorized pass, so it
+is cheap enough to rebuild every tick for moving vessels.
+
+Cells are stored as one sorted key array (key = column * stride + row), which makes every grid column
+inside the query box a single contiguous key range that is found with one searchsorted call.
+"""
+import numpy as np
+
+
+class SpatialGrid:
+    _OFFSET = 1 << 31       # shifts cell coordinates into positive range
+    _STRIDE = 1 << 32       # key distance between neighbouring grid columns
+
+    def __init__(self, cell_size: float = 1000.0):
+        self.cell_size: float = float(cell_size)
+        self.positions: np.ndarray = np.empty((0, 2))
+        self._order: np.ndarray = np.empty(0, dtype=np.int64)      # item indices sorted by cell key
+        self._keys: np.ndarray = np.empty(0, dtype=np.int64)       # sorted cell keys
+
+
+    def __len__(self):
+        return len(self.positions)
+
+
+    def _cells(self, positions: np.ndarray) -> np.ndarray:
+        return np.floor(positions / self.cell_size).astype(np.int64) + self._OFFSET
+
+
+    def build(self, positions: np.ndarray) -> None:
+        """
+        (Re)build the index over positions
+
+        :param positions: (n, 2) array of world positions, item i of later queries is row i
+        :return:
+        """
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        cells = self._cells(self.positions)
+        keys = cells[:, 0] * self._STRIDE + cells[:, 1]
+        self._order = np.argsort(keys, kind='stable')
+        self._keys = keys[self._order]
+
+
+    def query_radius(self, center: tuple, radius: float) -> np.ndarray:
+        """
+        Find all items within radius of center
+
+        :param center: world position (x, y)
+        :param radius: query radius in world units
+        :return: array of item indices (rows of the positions passed to build())
+        """
+        if self._keys.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        cx, cy = center
+        (col_min, row_min), (col_max, row_max) = self._cells(
+            np.array(((cx - radius, cy - radius), (cx + radius, cy + radius)))
+        )
+
+        columns = np.arange(col_min, col_max + 1, dtype=np.int64) * self._STRIDE
+        starts = np.searchsorted(self._keys, columns + row_min, side='left')
+        ends = np.searchsorted(self._keys, columns + row_max, side='right')
+
+        spans = [self._order[s:e] for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.concatenate(spans)
+
+        # exact circle test on the candidates from the overlapping cells
+        delta = self.positions[candidates] - (cx, cy)
+        inside = np.einsum('ij,ij->i', delta, delta) <= radius * radius
+        return np.sort(candidates[inside])
@@ -0,0 +1,303 @@
+# engine/managers/sector_shards.py
+"""
+Sector-sharded NPC simulation.
+
+- Space is partitioned into a grid of sectors over the world bounds (SHIP_SPAWN_RANGE-style dict)
+- Every sector is owned by a worker process that holds its vessels' fleet rows and runs the
+  flight kernel (and level of detail) for them
+- Ships crossing a sector boundary are handed to the worker owning their new sector
+- The main process keeps the AI state machines; each tick it only gathers what radar, UI and AI need:
+  vessels near the player, vessels that just left that area, arrivals and migrating ships
+
+Rows are identified by their row in the main process FleetState. Flight state flows from the workers
+to the main process (KINEMATIC_COLUMNS); AI decisions flow back as CONTROL_COLUMNS.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+import numpy as np
+
+from source.simulation.fleet_state import FleetState
+from source.simulation.level_of_detail import LevelOfDetail
+from source.simulation.sim_clock import SimulationClock
+
+# worker -> main: flight state the main process mirrors
+KINEMATIC_COLUMNS = (
+    'positions', 'velocities', 'speeds', 'orientations', 'has_destination',
+    'trail_points', 'trail_times', 'trail_heads',
+)
+# main -> worker: state changed by AI decisions
+CONTROL_COLUMNS = ('destinations', 'has_destination', 'active', 'visible')
+
+
+class SectorGrid:
+    """Uniform sector grid over rectangular bounds, positions outside are clamped to the edge sectors."""
+
+    def __init__(self, bounds: dict, sectors: tuple[int, int]):
+        self.x_min, self.x_max = bounds['x']
+        self.y_min, self.y_max = bounds['y']
+        self.columns, self.rows = sectors
+
+    def __len__(self):
+        return self.columns * self.rows
+
+    def sector_of(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Sector id of each position
+
+        :param positions: (n, 2) world positions
+        :return: (n,) sector ids
+        """
+        ix = (positions[:, 0] - self.x_min) * self.columns // (self.x_max - self.x_min)
+        iy = (positions[:, 1] - self.y_min) * self.rows // (self.y_max - self.y_min)
+        ix = np.clip(ix, 0, self.columns - 1).astype(np.int64)
+        iy = np.clip(iy, 0, self.rows - 1).astype(np.int64)
+        return ix * self.rows + iy
+
+
+def _sector_worker(conn, grid: SectorGrid, sector_ids: list[int], lod_settings: dict, arrival_radius: float) -> None:
+    """
+    Worker process loop: owns the fleet rows of its sectors and steps them on request
+
+    :param conn: pipe end to the main process
+    :param grid: sector grid shared with the main process
+    :param sector_ids: sectors owned by this worker
+    :param lod_settings: LOD_SETTINGS used for this worker's rows
+    :param arrival_radius: traveling vessels closer than this to their destination are reported
+    :return:
+    """
+    clock = SimulationClock()
+    fleet = FleetState(capacity=256, clock=clock)       # owners are main process rows
+    lod = LevelOfDetail(lod_settings)
+    my_sectors = np.array(sector_ids)
+    local_rows: dict[int, int] = {}                     # main row -> local row
+    gathered = np.empty(0, dtype=np.int64)              # main rows reported as near last tick
+
+    while True:
+        command, payload = conn.recv()
+        if command == 'stop':
+            break
+
+        # --- ships handed over from other sectors, then AI decisions from the main process ---
+        if payload['adds'] is not None:
+            ids, columns = payload['adds']
+            rows = np.array([fleet.add(i, (0.0, 0.0)) for i in ids.tolist()], dtype=np.int64)
+            local_rows.update(zip(ids.tolist(), rows.tolist()))
+            fleet.import_rows(rows, columns)
+        if payload['controls'] is not None:
+            ids, columns = payload['controls']
+            fleet.import_rows(np.array([local_rows[i] for i in ids.tolist()], dtype=np.int64), columns)
+
+        if command == 'collect':
+            rows = np.arange(fleet.count)
+            conn.send((np.array(fleet.owners, dtype=np.int64), fleet.export_rows(rows)))
+            continue
+
+        # --- step ---
+        clock.now = payload['now']
+        center = payload['center']
+        gather_radius = payload['radius']       # vessels within this distance of the player are reported
+        count = fleet.count
+        if lod.enabled:
+            lod.assign_tiers(fleet, np.arange(count), center, clock.now)
+            rows, row_dt = lod.due_rows(fleet, payload['dt'], payload['tick'])
+            fleet.update_flight(row_dt, rows)
+        else:
+            fleet.update_flight(payload['dt'])
+
+        owners = np.array(fleet.owners, dtype=np.int64)
+        positions = fleet.positions[:count]
+
+        offset = fleet.destinations[:count] - positions
+        arrived = np.flatnonzero(fleet.active[:count] & (np.einsum('ij,ij->i', offset, offset) < arrival_radius ** 2))
+
+        delta = positions - center
+        near = np.flatnonzero(np.einsum('ij,ij->i', delta, delta) <= gather_radius ** 2)
+        # rows that were near last tick and moved out must be reported once more, so the main
+        # process never keeps a stale position inside the gather area
+        left = np.flatnonzero(np.isin(owners, gathered) & ~np.isin(owners, owners[near]))
+        report = np.concatenate((near, left))
+
+        sectors = grid.sector_of(positions)
+        leaving = np.flatnonzero(~np.isin(sectors, my_sectors))
+
+        result = {
+            'arrivals': (owners[arrived], fleet.export_rows(arrived, KINEMATIC_COLUMNS)),
+            'gathered': (owners[report], fleet.export_rows(report, KINEMATIC_COLUMNS)),
+            'emigrants': (owners[leaving], fleet.export_rows(leaving), sectors[leaving]),
+        }
+        gathered = owners[near]
+
+        # remove emigrants from the highest row down so swap-remove never moves a row still to remove
+        for row in sorted(leaving.tolist(), reverse=True):
+            del local_rows[fleet.owners[row]]
+            moved = fleet.remove(row)
+            if moved is not None:
+                local_rows[moved] = row
+
+        conn.send(result)
+
+    conn.close()
+
+
+class SectorShards:
+    """Main process side of the sharded simulation: routes vessels to sector workers and gathers results."""
+
+    def __init__(self, fleet: FleetState, rows: np.ndarray, bounds: dict, settings: dict, lod_settings: dict,
+                 arrival_radius: float):
+        """
+        :param fleet: main process fleet, its rows for the given vessels become mirrors of the workers
+        :param rows: main fleet rows to simulate in the workers (NPC vessels)
+        :param bounds: {'x': [min, max], 'y': [min, max]} sectors are laid out over
+        :param settings: SHARD_SETTINGS
+        :param lod_settings: LOD_SETTINGS applied inside the workers
+        :param arrival_radius: distance at which traveling vessels count as arrived
+        """
+        self.fleet = fleet
+        self.grid = SectorGrid(bounds, settings['sectors'])
+        self.gather_radius: float = settings['gather_radius']
+
+        worker_count = settings['workers'] or min(len(self.grid), os.cpu_count() or 1)
+        worker_count = max(1, min(worker_count, len(self.grid)))
+        # sector -> worker, sectors are dealt out round robin
+        self.sector_worker = np.arange(len(self.grid)) % worker_count
+
+        self.connections = []
+        self.processes = []
+        for w in range(worker_count):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_sector_worker,
+                args=(child_conn, self.grid, np.flatnonzero(self.sector_worker == w).tolist(), lod_settings,
+                      arrival_radius),
+                daemon=True,
+            )
+            process.start()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+        self.owner_worker: dict[int, int] = {}                # main row -> worker index
+        self._pending_adds: list[list[tuple[np.ndarray, dict]]] = [[] for _ in range(worker_count)]
+        self._pending_controls: list[set[int]] = [set() for _ in range(worker_count)]
+
+        rows = np.asarray(rows, dtype=np.int64)
+        workers = self.sector_worker[self.grid.sector_of(fleet.positions[rows])]
+        for w in range(worker_count):
+            mine = rows[workers == w]
+            self._queue_add(w, mine, fleet.export_rows(mine))
+
+
+    def _queue_add(self, worker: int, rows: np.ndarray, columns: dict) -> None:
+        if not len(rows):
+            return
+        self._pending_adds[worker].append((rows, columns))
+        self.owner_worker.update(dict.fromkeys(rows.tolist(), worker))
+
+
+    @staticmethod
+    def _merge(batches: list[tuple[np.ndarray, dict]]) -> tuple[np.ndarray, dict] | None:
+        if not batches:
+            return None
+        ids = np.concatenate([ids for ids, _ in batches])
+        columns = {name: np.concatenate([c[name] for _, c in batches]) for name in batches[0][1]}
+        return ids, columns
+
+
+    def push_controls(self, rows: list[int]) -> None:
+        """
+        Queue the control columns of the given main rows for their workers (sent with the next step)
+
+        :param rows: main fleet rows whose AI state changed
+        :return:
+        """
+        for row in rows:
+            self._pending_controls[self.owner_worker[row]].add(row)
+
+
+    def _flush(self, worker: int) -> dict:
+        """
+        Take the queued hand-overs and AI decisions of a worker, they ride along with its next command
+
+        :param worker: worker index
+        :return: {'adds': (ids, columns) or None, 'controls': (ids, columns) or None}
+        """
+        controls = None
+        if self._pending_controls[worker]:
+            ids = np.array(sorted(self._pending_controls[worker]), dtype=np.int64)
+            controls = (ids, self.fleet.export_rows(ids, CONTROL_COLUMNS))
+            self._pending_controls[worker].clear()
+        adds = self._merge(self._pending_adds[worker])
+        self._pending_adds[worker].clear()
+        return {'adds': adds, 'controls': controls}
+
+
+    def step(self, dt: float, now: float, tick: int, center: tuple, radius: float | None = None) -> np.ndarray:
+        """
+        Step every sector worker in parallel and mirror the gathered state into the main fleet
+
+        :param dt: simulation tick length
+        :param now: simulation time after the tick
+        :param tick: tick counter (level of detail phases)
+        :param center: player world position
+        :param radius: gather radius around center for this tick, at least settings['gather_radius']
+            (callers reading vessels further out, e.g. sensor detection, pass their own reach)
+        :return: main fleet rows that arrived at their destination this tick
+        """
+        radius = self.gather_radius if radius is None else max(radius, self.gather_radius)
+        for w, conn in enumerate(self.connections):
+            conn.send(('step', {
+                'dt': dt, 'now': now, 'tick': tick, 'center': np.asarray(center, dtype=np.float64), 'radius': radius,
+                **self._flush(w),
+            }))
+
+        arrivals = []
+        for conn in self.connections:
+            result = conn.recv()
+
+            ids, columns = result['gathered']
+            self.fleet.import_rows(ids, columns)
+
+            ids, columns = result['arrivals']
+            self.fleet.import_rows(ids, columns)
+            arrivals.append(ids)
+
+            ids, columns, sectors = result['emigrants']
+            if len(ids):
+                self.fleet.import_rows(ids, {name: columns[name] for name in KINEMATIC_COLUMNS})
+                targets = self.sector_worker[sectors]
+                for w in np.unique(targets).tolist():
+                    mask = targets == w
+                    self._queue_add(w, ids[mask], {name: values[mask] for name, values in columns.items()})
+
+        return np.concatenate(arrivals)
+
+
+    def sync_all(self) -> None:
+        """
+        Copy the full state of every worker row into the main fleet (e.g. before a world snapshot).
+        AI decisions and hand-overs still queued for the next step are delivered first, else the workers'
+        older control columns would overwrite them in the main fleet (and be sent back on the next step)
+
+        :return:
+        """
+        for w, conn in enumerate(self.connections):
+            conn.send(('collect', self._flush(w)))
+        for conn in self.connections:
+            ids, columns = conn.recv()
+            self.fleet.import_rows(ids, columns)
+
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        for conn in self.connections:
+            try:
+                conn.send(('stop', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=1.0)
+        self.connections.clear()
+        self.processes.clear()
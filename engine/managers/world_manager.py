@@ -1,25 +1,62 @@
 # engine/managers/world_manager.py
 import random
 from typing import Tuple, List
-import copy
+import threading
+from os.path import abspath, dirname
 
+import numpy as np
+
+from data.config.gameplay_config_settings import (
+    SPATIAL_INDEX_SETTINGS, SHARD_SETTINGS, LOD_SETTINGS, NAVIGATION_SETTINGS, DESTINATION_SETTINGS,
+)
+from engine.logic.spatial_grid import SpatialGrid
+from engine.managers.sector_shards import SectorShards
+from engine.managers.world_snapshot import WorldSnapshot
 from utility.tools.dataloader import Dataloader
 from source.generators.instance_generator import Instance_Generator
 from source.classes.player.player import Player
 from source.classes.ship.ship_class import Ship
+from source.classes.ship.ship_template import ShipTemplate
 from source.classes.AI.AI_controller import AIController
+from source.simulation.fleet_state import FleetState
+from source.simulation.sim_clock import SimulationClock
+from source.simulation.scheduler import WakeupScheduler
+from source.simulation.level_of_detail import LevelOfDetail
+from source.simulation.detection import DetectionSystem, ContactList
+from source.simulation.navigation import NavigationGraph
+from source.simulation.destinations import DestinationSelector
 from utility.tools.dev_logger import DevLogger
 
 
 class WorldManager:
     """Load world, locations, vessels, and player. Ensures NPC ships are AI-controlled."""
-    def __init__(self):
+    def __init__(self, sharded: bool | None = None):
+        """
+        :param sharded: step NPC flight in sector worker processes, defaults to SHARD_SETTINGS['enabled']
+        """
         self.logger = DevLogger(WorldManager)
 
         self.data = None
         self.locations = []
         self.vessels: List = []
         self.player: Player | None = None
+        self.fleet: FleetState | None = None
+        self.ship_templates: dict[str, ShipTemplate] = {}
+        self.clock = SimulationClock()
+        self.scheduler = WakeupScheduler()     # idle / dock wakeups of AI ships
+        self.lod = LevelOfDetail(LOD_SETTINGS)  # distance based update rates of AI ships
+        self.sharded: bool = SHARD_SETTINGS['enabled'] if sharded is None else sharded
+        self.shards: SectorShards | None = None
+        self.detection = DetectionSystem()     # sensor based fog of war
+        self.player_contacts = ContactList.empty()
+        self.navigation: NavigationGraph | None = None     # route network over locations, shared route cache
+        self.destinations: DestinationSelector | None = None   # KD-tree destination picks of AI ships
+        self.navigation_path = f"{dirname(dirname(dirname(abspath(__file__))))}{NAVIGATION_SETTINGS['cache_file']}"
+
+        # spatial indexes for range queries (radar culling, item i = self.locations[i] / self.vessels[i])
+        self.location_index = SpatialGrid(SPATIAL_INDEX_SETTINGS['location_cell_size'])
+        self.vessel_index = SpatialGrid(SPATIAL_INDEX_SETTINGS['vessel_cell_size'])
+        self.vessel_rows = np.empty(0, dtype=np.int64)   # fleet row of each entry in self.vessels
 
         self.SHIP_SPAWN_TABLE = {
             "scout_01": 5,
@@ -30,21 +67,61 @@ class WorldManager:
             'x': [-4000, 4000],
             'y': [-4000, 4000]
         }
+        self.spawn_table_scaled = False     # set by scale_spawn_table()
+
 
+    def load(self, station_count: int | None = None, catalogue: str | None = None) -> Tuple[List, List, Player]:
+        """
+        Build the world from data files
 
-    def load(self) -> Tuple[List, List, Player]:
-        self.data = Dataloader().load_data()
+        :param station_count: optional minimum number of locations, the loaded stations are padded with
+            generated filler stations scattered over SHIP_SPAWN_RANGE (used for stress runs)
+        :param catalogue: optional station catalogue file (e.g. written by Universe_Generator) used instead
+            of station_data_generated, its ship spawn table and range replace the defaults (a table set
+            through scale_spawn_table() keeps its total)
+        :return: locations, vessels, player
+        """
+        loader = Dataloader()
+        self.data = loader.load_data()
+        if catalogue is not None:
+            stations = self.data['stations']['station_data_generated'] = loader.load_file(catalogue)
+            if 'ship_spawn_range' in stations:
+                self.SHIP_SPAWN_RANGE = {axis: list(values) for axis, values in stations['ship_spawn_range'].items()}
+            if 'ship_spawn_table' in stations:
+                total = sum(self.SHIP_SPAWN_TABLE.values()) if self.spawn_table_scaled else None
+                self.SHIP_SPAWN_TABLE = dict(stations['ship_spawn_table'])
+                if total is not None:
+                    self.scale_spawn_table(total)
 
         # --- locations ---
         self.locations = Instance_Generator.generate_all_locations(self.data)
+        if station_count is not None and station_count > len(self.locations) and self.locations:
+            template = next(iter(self.data['stations']['station_data_generated']['game'].values()))
+            self.locations.extend(Instance_Generator.generate_filler_locations(
+                template, station_count - len(self.locations), self.SHIP_SPAWN_RANGE
+            ))
+
+        self._load_navigation()
+        self._build_destinations()
+
+        # --- fleet state shared by every vessel (player included) ---
+        self.fleet = FleetState(capacity=sum(self.SHIP_SPAWN_TABLE.values()) + 1, clock=self.clock)
 
         # --- vessels from "game" data ---
+        # one frozen template per ship type, shared by every ship spawned from it
+        self.ship_templates = {
+            ship_name: ShipTemplate(self.data['ships']['ship_data']['game'][ship_name], ship_name)
+            for ship_name in self.SHIP_SPAWN_TABLE
+        }
         vessels: List = []
         # spawn what type
         for ship_name in self.SHIP_SPAWN_TABLE:
             # spawn how many?
             for _ in range(self.SHIP_SPAWN_TABLE[ship_name]):
-                spawn_vessel = AIController(copy.deepcopy(self.data['ships']['ship_data']['game'][ship_name]), self.locations)
+                spawn_vessel = AIController(
+                    self.ship_templates[ship_name], self.locations, fleet=self.fleet, scheduler=self.scheduler,
+                    navigation=self.navigation, destinations=self.destinations,
+                )
 
 
                 # generate random spawn position
@@ -64,7 +141,7 @@ class WorldManager:
         player_data = self.data['ships']['ship_data']['debug'].get('debug_ship_01')
         if not player_data:
             if self.vessels:
-                fallback = copy.deepcopy(self.vessels[0].raw_data) if hasattr(self.vessels[0], "raw_data") else None
+                fallback = self.vessels[0].template.to_dict() if hasattr(self.vessels[0], "template") else None
                 if fallback:
                     fallback["info"]["tag"] = "player_ship"
                     fallback["info"]["name"] = "Player Ship"
@@ -72,7 +149,203 @@ class WorldManager:
             if not player_data:
                 raise RuntimeError("No suitable ship data found for player.")
 
-        self.player = Player(copy.deepcopy(player_data))
+        self.player = Player(ShipTemplate(player_data), fleet=self.fleet)
+
+        # --- spatial indexes ---
+        self.location_index.build(np.array([loc.coordinates for loc in self.locations], dtype=np.float64))
+        self.vessel_rows = np.array([v.row for v in self.vessels], dtype=np.int64)
+        self.vessel_index.build(self.fleet.positions[self.vessel_rows])
+
+        # --- sector workers take over NPC flight ---
+        if self.sharded:
+            self.shards = SectorShards(
+                self.fleet, self.vessel_rows, self.SHIP_SPAWN_RANGE, SHARD_SETTINGS, LOD_SETTINGS,
+                AIController.ARRIVAL_RADIUS,
+            )
 
         # --- return all world objects ---
         return self.locations, self.vessels, self.player
+
+
+    def save_snapshot(self, path: str, background: bool = True) -> threading.Thread | None:
+        """
+        Save the running world to a binary snapshot (see WorldSnapshot). The world is copied and encoded on
+        the calling thread, the file is written in the background so the frame loop does not stall on disk io
+
+        :param path: snapshot file path
+        :param background: write on a background thread
+        :return: writer thread (join() to wait) or None when written synchronously
+        """
+        snapshot = WorldSnapshot.capture(self)
+        if background:
+            return snapshot.write_in_background(path)
+        snapshot.write(path)
+        return None
+
+
+    def load_snapshot(self, path: str, mmap: bool = True) -> Tuple[List, List, Player]:
+        """
+        Restore a world saved with save_snapshot() instead of building it with load()
+
+        :param path: snapshot file path
+        :param mmap: memory map the snapshot arrays while restoring
+        :return: locations, vessels, player
+        """
+        self.locations, self.vessels, self.player = WorldSnapshot.read(path, mmap=mmap).restore(self)
+        self.fleet = self.player.fleet
+
+        self._load_navigation()
+        self._build_destinations()
+        for vessel in self.vessels:
+            if isinstance(vessel, AIController):
+                vessel.navigation = self.navigation
+                vessel.destinations = self.destinations
+
+        # --- spatial indexes ---
+        self.location_index.build(np.array([loc.coordinates for loc in self.locations], dtype=np.float64))
+        self.vessel_rows = np.array([v.row for v in self.vessels], dtype=np.int64)
+        self.vessel_index.build(self.fleet.positions[self.vessel_rows])
+
+        # --- sector workers take over NPC flight ---
+        if self.sharded:
+            self.shards = SectorShards(
+                self.fleet, self.vessel_rows, self.SHIP_SPAWN_RANGE, SHARD_SETTINGS, LOD_SETTINGS,
+                AIController.ARRIVAL_RADIUS,
+            )
+
+        return self.locations, self.vessels, self.player
+
+
+    def _load_navigation(self) -> None:
+        """
+        Navigation graph over self.locations: reuse the saved graph (and its route cache) when it was built
+        for the same locations, else build it
+
+        :return:
+        """
+        self.navigation = None
+        if not NAVIGATION_SETTINGS['enabled'] or not self.locations:
+            return
+        self.navigation = NavigationGraph.load(self.navigation_path, self.locations)
+        if self.navigation is None:
+            self.navigation = NavigationGraph(self.locations)
+            self.logger.info(f"built navigation graph over {len(self.locations)} locations")
+
+
+    def _build_destinations(self) -> None:
+        """
+        Spatial index AI ships pick their next destination from (see DestinationSelector)
+
+        :return:
+        """
+        self.destinations = None
+        if DESTINATION_SETTINGS['enabled'] and self.locations:
+            self.destinations = DestinationSelector(self.locations)
+
+
+    def plan_route(self, start_coordinates: tuple, destination) -> list:
+        """
+        Autopilot route from a world position to a location: enter the network at the closest location and
+        follow the graph from there, a straight flight if there is no graph or no connection
+
+        :param start_coordinates: (x, y) where the route starts (e.g. the player's position)
+        :param destination: Location to reach
+        :return: list of Location hops ending at destination
+        """
+        if self.navigation is None:
+            return [destination]
+        if self.destinations is not None:
+            entry = self.destinations.nearest(start_coordinates, 1)[0][0]
+        else:
+            entry = self.navigation.locations[self.navigation.nearest_node(start_coordinates)]
+        route = self.navigation.route(entry, destination)
+        return route if route else [destination]
+
+
+    def scale_spawn_table(self, ship_count: int) -> None:
+        """
+        Rescale SHIP_SPAWN_TABLE to spawn ship_count ships in total, keeping the ratio between ship types
+
+        :param ship_count: total number of NPC ships to spawn on load()
+        :return:
+        """
+        total = sum(self.SHIP_SPAWN_TABLE.values())
+        names = list(self.SHIP_SPAWN_TABLE)
+        scaled = {name: (self.SHIP_SPAWN_TABLE[name] * ship_count) // total for name in names}
+        # hand the rounding remainder to the first ship types
+        for i in range(ship_count - sum(scaled.values())):
+            scaled[names[i % len(names)]] += 1
+        self.SHIP_SPAWN_TABLE = scaled
+        self.spawn_table_scaled = True
+
+
+    def update(self, dt: float) -> None:
+        """
+        Step the world: advance the simulation clock, advance every vessel's flight in one batched
+        pass (far vessels at a reduced rate, see LevelOfDetail, or inside the sector workers when
+        sharded), dock ships that arrived, wake ships whose idle/dock timer fired, refresh the
+        vessel spatial index and the player's sensor contacts. Idle and docked ships cost nothing
+        until the scheduler hands them back.
+
+        :param dt: timestep in seconds (scaled by clock.time_scale)
+        :return:
+        """
+        dt = self.clock.advance(dt)
+
+        if self.shards is not None:
+            # NPC flight runs in the sector workers, only the player is flown here
+            self.fleet.update_flight(dt, np.array([self.player.row]))
+            # the detection broad-phase reads vessel positions out to the player's sensor reach
+            radius = self.detection.query_radius(self.player) if self.detection.enabled else None
+            arrived_rows = self.shards.step(dt, self.clock.now, self.clock.ticks, self.player.coordinates, radius)
+            arrived = [self.fleet.owners[row] for row in arrived_rows.tolist()]
+        else:
+            if self.lod.enabled:
+                self.lod.assign_tiers(self.fleet, self.vessel_rows, self.player.coordinates, self.clock.now)
+                rows, row_dt = self.lod.due_rows(self.fleet, dt, self.clock.ticks)
+                self.fleet.update_flight(row_dt, rows)
+            else:
+                self.fleet.update_flight(dt)
+
+            # traveling ships (the only active vessel rows) that reached their destination
+            rows = self.vessel_rows
+            offset = self.fleet.destinations[rows] - self.fleet.positions[rows]
+            arrived_mask = self.fleet.active[rows] & (
+                np.einsum('ij,ij->i', offset, offset) < AIController.ARRIVAL_RADIUS ** 2
+            )
+            arrived = [self.vessels[i] for i in np.flatnonzero(arrived_mask).tolist()]
+
+        for vessel in arrived:
+            vessel.update_state()
+
+        # idle and docked ships whose timer fired
+        woken = self.scheduler.pop_due(self.clock.now)
+        for vessel in woken:
+            vessel.wake()
+
+        # hand the AI decisions back to the workers owning those ships
+        if self.shards is not None:
+            self.shards.push_controls([vessel.row for vessel in arrived + woken])
+
+        # vessels moved, rebuild their index in one vectorized pass
+        self.vessel_index.build(self.fleet.positions[self.vessel_rows])
+
+        # player autopilot: fly on to the next route hop once the current one is reached
+        self.player.advance_route()
+
+        # what the player's sensors pick up (fog of war), also sets the player's target flags
+        self.detection.update(self)
+
+
+    def close(self) -> None:
+        """
+        Release world resources (stops sector worker processes) and save the navigation graph with its
+        route cache for the next run
+
+        :return:
+        """
+        if self.navigation is not None:
+            self.navigation.save(self.navigation_path)
+        if self.shards is not None:
+            self.shards.close()
+            self.shards = None
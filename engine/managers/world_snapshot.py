@@ -0,0 +1,393 @@
+# engine/managers/world_snapshot.py
+"""
+Binary world snapshots.
+
+File layout (little endian):
+    8 bytes   magic b'SRPGSNAP'
+    8 bytes   header length (uint64)
+    n bytes   JSON header: format version, scalar world state, string tables and the
+              dtype/shape/offset of every array
+    ...       array blobs, each aligned to 64 bytes so they can be memory mapped in place
+
+Numeric state (fleet columns incl. trails, location positions, AI timers, references between objects,
+child locations, docked sets, scheduled wakeups, RNG state) is stored as columnar arrays. Object fields
+that are not numeric are dictionary encoded: one table of unique JSON values per field plus an int32
+index array.
+
+Saving is split in two: capture() takes a consistent copy of the world on the calling thread (array
+copies, object fields already encoded, containers in the metadata copied), so nothing it holds is shared
+with the running world; write() only lays out and writes the blobs and can run on a background thread.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import pickle
+import random
+import threading
+
+import numpy as np
+
+from source.classes.AI.AI_controller import AIController, AIState
+from source.classes.location._location import Location
+from source.classes.location.station_class import Station
+from source.classes.player.player import Player
+from source.classes.ship._vessel import Vessel
+from source.classes.ship.ship_class import Ship
+from source.classes.ship.ship_template import ShipTemplate
+from source.simulation.fleet_state import FleetState
+
+SNAPSHOT_MAGIC = b'SRPGSNAP'
+SNAPSHOT_VERSION = 2
+_ALIGN = 64
+
+CLASSES = {cls.__name__: cls for cls in (Location, Station, Vessel, Ship, Player, AIController)}
+
+# slots stored through dedicated arrays / references instead of generic field columns
+_LOCATION_SPECIAL = {'coordinates', 'child_locations', '_docked_vessels'}
+_VESSEL_SPECIAL = {
+    'fleet', 'row', '_owns_fleet', '_destination', 'target', 'state', 'world_locations', 'scheduler', 'config',
+    'template', 'navigation', 'last_location', 'itinerary', 'route', 'destinations',
+}
+
+# reference slots: (array name, attribute, class carrying the attribute)
+_VESSEL_REFS = (('destination', '_destination', Vessel), ('target', 'target', Ship),
+                ('last_location', 'last_location', AIController))
+
+# reference kinds for destinations and targets
+REF_NONE, REF_LOCATION, REF_VESSEL, REF_COORDINATES = 0, 1, 2, 3
+
+_MISSING = object()
+
+
+def _slot_names(cls) -> list[str]:
+    names = []
+    for klass in reversed(cls.__mro__):
+        for name in getattr(klass, '__slots__', ()):
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def _capture_fields(objects: list, skip: set) -> tuple[list[str], dict[str, list]]:
+    """Collect raw field values of objects, per slot name (references, encode them before the world moves on)."""
+    classes = [type(o).__name__ for o in objects]
+    names = []
+    for class_name in dict.fromkeys(classes):
+        names.extend(n for n in _slot_names(CLASSES[class_name]) if n not in skip and n not in names)
+    return classes, {name: [getattr(o, name, _MISSING) for o in objects] for name in names}
+
+
+def _encode_fields(fields: dict[str, list], prefix: str, arrays: dict, header: dict) -> None:
+    """Store each field column as a numeric array or as a dictionary encoded JSON table."""
+    for name, values in fields.items():
+        present = [v for v in values if v is not _MISSING]
+        key = f'{prefix}/{name}'
+        if len(present) == len(values) and present and all(type(v) is bool for v in present):
+            arrays[key] = np.array(values, dtype=np.bool_)
+            header[name] = 'bool'
+        elif len(present) == len(values) and present and all(type(v) in (int, float) for v in present):
+            arrays[key] = np.array(values, dtype=np.float64)
+            header[name] = 'int' if all(type(v) is int for v in present) else 'float'
+        else:
+            table: dict[str, int] = {}
+            indices = np.empty(len(values), dtype=np.int32)
+            for i, v in enumerate(values):
+                indices[i] = -1 if v is _MISSING else table.setdefault(json.dumps(v), len(table))
+            arrays[key] = indices
+            header[name] = list(table)
+
+
+def _decode_fields(objects: list, prefix: str, arrays: dict, header: dict) -> None:
+    """Inverse of _encode_fields: assign every stored field back onto objects."""
+    for name, encoding in header.items():
+        column = arrays[f'{prefix}/{name}']
+        if encoding == 'bool':
+            values = [bool(v) for v in column]
+        elif encoding == 'int':
+            values = [int(v) for v in column]
+        elif encoding == 'float':
+            values = column.tolist()
+        else:
+            table = [json.loads(t) for t in encoding]
+            # every object gets its own copy of a container value (no shared mutable dict/list),
+            # unpickling a pre-pickled value is several times faster than json.loads per object
+            blobs = [pickle.dumps(v, pickle.HIGHEST_PROTOCOL) if isinstance(v, (dict, list)) else None for v in table]
+            for obj, index in zip(objects, column.tolist()):
+                if index >= 0:
+                    blob = blobs[index]
+                    setattr(obj, name, table[index] if blob is None else pickle.loads(blob))
+            continue
+        for obj, value in zip(objects, values):
+            setattr(obj, name, value)
+
+
+class WorldSnapshot:
+    """A captured world: raw arrays plus JSON-able metadata, neither shares state with the live world."""
+
+    def __init__(self, arrays: dict[str, np.ndarray], meta: dict):
+        self.arrays = arrays
+        self.meta = meta
+
+
+    # -------------------------
+    # capture / restore
+    # -------------------------
+    @classmethod
+    def capture(cls, world) -> "WorldSnapshot":
+        """
+        Take a consistent copy of the world on the calling thread. Arrays are copied and object fields are
+        encoded here, container fields (module changes, configs, spawn tables) would otherwise keep changing
+        under a background write()
+
+        :param world: loaded WorldManager
+        :return: WorldSnapshot ready for write()
+        """
+        if world.shards is not None:
+            world.shards.sync_all()
+
+        fleet: FleetState = world.fleet
+        rows = np.arange(fleet.count)
+        arrays = {f'fleet/{name}': values for name, values in fleet.export_rows(rows).items()}
+
+        locations = world.locations
+        owners = fleet.owners
+        location_index = {id(loc): i for i, loc in enumerate(locations)}
+
+        def ref(obj) -> tuple[int, int, float, float]:
+            if obj is None:
+                return REF_NONE, -1, 0.0, 0.0
+            if isinstance(obj, tuple):
+                return REF_COORDINATES, -1, float(obj[0]), float(obj[1])
+            if isinstance(obj, Vessel):
+                return REF_VESSEL, obj.row, 0.0, 0.0
+            return REF_LOCATION, location_index[id(obj)], 0.0, 0.0
+
+        arrays['locations/positions'] = np.array([loc.coordinates for loc in locations], dtype=np.float64).reshape(-1, 2)
+        location_classes, location_fields = _capture_fields(locations, _LOCATION_SPECIAL)
+        vessel_classes, vessel_fields = _capture_fields(owners, _VESSEL_SPECIAL)
+
+        for name, attr, _ in _VESSEL_REFS:
+            refs = np.array([ref(getattr(v, attr, None)) for v in owners], dtype=np.float64).reshape(-1, 4)
+            arrays[f'vessels/{name}_kind'] = refs[:, 0].astype(np.uint8)
+            arrays[f'vessels/{name}_index'] = refs[:, 1].astype(np.int64)
+            arrays[f'vessels/{name}_coordinates'] = refs[:, 2:]
+
+        # ship templates are stored once, ships reference them by index
+        templates: dict[int, int] = {}
+        template_list = []
+        for v in owners:
+            if isinstance(v, Ship) and id(v.template) not in templates:
+                templates[id(v.template)] = len(template_list)
+                template_list.append(v.template)
+        arrays['vessels/template'] = np.array(
+            [templates[id(v.template)] if isinstance(v, Ship) else -1 for v in owners], dtype=np.int32
+        )
+
+        arrays['vessels/state'] = np.array(
+            [v.state.value if isinstance(v, AIController) else 0 for v in owners], dtype=np.uint8
+        )
+        # remaining route hops (AI itineraries, player autopilot route) as flattened location indices
+        hops = [getattr(v, 'itinerary', None) or getattr(v, 'route', None) or () for v in owners]
+        arrays['vessels/hop_offsets'] = np.cumsum([0] + [len(h) for h in hops], dtype=np.int64)
+        arrays['vessels/hops'] = np.array([location_index[id(loc)] for h in hops for loc in h], dtype=np.int64)
+        configs = [copy.deepcopy(v.config) if isinstance(v, AIController) and v.config is not AIController.DEFAULT_CONFIG
+                   else None for v in owners]
+
+        children = [(i, location_index[id(child)]) for i, loc in enumerate(locations) for child in loc.child_locations]
+        arrays['locations/children'] = np.array(children, dtype=np.int64).reshape(-1, 2)
+        docked = [(location_index[id(loc)], v.row) for loc in locations if loc._docked_vessels for v in loc._docked_vessels]
+        arrays['docked/pairs'] = np.array(docked, dtype=np.int64).reshape(-1, 2)
+
+        wakeups = world.scheduler.pending()
+        arrays['scheduler/when'] = np.array([when for when, _ in wakeups], dtype=np.float64)
+        arrays['scheduler/rows'] = np.array([obj.row for _, obj in wakeups], dtype=np.int64)
+
+        rng_version, rng_state, rng_gauss = random.getstate()
+        arrays['rng/state'] = np.array(rng_state, dtype=np.uint32)
+
+        meta = {
+            'version': SNAPSHOT_VERSION,
+            'clock': {'now': world.clock.now, 'ticks': world.clock.ticks, 'time_scale': world.clock.time_scale},
+            'rng': {'version': rng_version, 'gauss': rng_gauss},
+            'fleet': {'count': fleet.count, 'trail_capacity': fleet.trail_capacity},
+            'vessel_rows': world.vessel_rows.tolist(),
+            'player_row': world.player.row,
+            'spawn_table': dict(world.SHIP_SPAWN_TABLE),
+            'spawn_range': {axis: list(values) for axis, values in world.SHIP_SPAWN_RANGE.items()},
+            'location_classes': location_classes,
+            'vessel_classes': vessel_classes,
+            'vessel_configs': configs,
+            'templates': [{'name': t.name, 'data': t.to_dict()} for t in template_list],
+            'fields': {'locations': {}, 'vessels': {}},
+        }
+        _encode_fields(location_fields, 'locations', arrays, meta['fields']['locations'])
+        _encode_fields(vessel_fields, 'vessels', arrays, meta['fields']['vessels'])
+        return cls(arrays, meta)
+
+
+    def restore(self, world) -> tuple[list, list, Player]:
+        """
+        Rebuild the world state from this snapshot into a fresh WorldManager
+
+        :param world: WorldManager that has not been loaded yet
+        :return: locations, vessels, player
+        """
+        meta, arrays = self.meta, self.arrays
+
+        world.clock.now = meta['clock']['now']
+        world.clock.ticks = meta['clock']['ticks']
+        world.clock.time_scale = meta['clock']['time_scale']
+        world.SHIP_SPAWN_TABLE = meta['spawn_table']
+        world.SHIP_SPAWN_RANGE = meta['spawn_range']
+
+        # --- locations ---
+        locations = [CLASSES[name].__new__(CLASSES[name]) for name in meta['location_classes']]
+        for loc, coordinates in zip(locations, arrays['locations/positions'].tolist()):
+            loc.coordinates = tuple(coordinates)
+            loc.child_locations = []
+            loc._docked_vessels = None
+        _decode_fields(locations, 'locations', arrays, meta['fields']['locations'])
+
+        # --- fleet and vessels (in fleet row order) ---
+        fleet = FleetState(capacity=meta['fleet']['count'], clock=world.clock,
+                           trail_capacity=meta['fleet']['trail_capacity'])
+        owners = [CLASSES[name].__new__(CLASSES[name]) for name in meta['vessel_classes']]
+        for vessel in owners:
+            vessel.fleet = fleet
+            vessel._owns_fleet = False
+            vessel.row = fleet.add(vessel, (0.0, 0.0))
+        fleet.import_rows(np.arange(fleet.count), {
+            name[len('fleet/'):]: values for name, values in arrays.items() if name.startswith('fleet/')
+        })
+        _decode_fields(owners, 'vessels', arrays, meta['fields']['vessels'])
+
+        def deref(kind: int, index: int, coordinates: list):
+            if kind == REF_LOCATION:
+                return locations[index]
+            if kind == REF_VESSEL:
+                return owners[index]
+            if kind == REF_COORDINATES:
+                return tuple(coordinates)
+            return None
+
+        for name, attr, owner_class in _VESSEL_REFS:
+            refs = zip(arrays[f'vessels/{name}_kind'].tolist(), arrays[f'vessels/{name}_index'].tolist(),
+                       arrays[f'vessels/{name}_coordinates'].tolist())
+            for vessel, (kind, index, coordinates) in zip(owners, refs):
+                if isinstance(vessel, owner_class):
+                    setattr(vessel, attr, deref(kind, index, coordinates))
+
+        offsets, hops = arrays['vessels/hop_offsets'].tolist(), arrays['vessels/hops'].tolist()
+        for i, vessel in enumerate(owners):
+            vessel_hops = [locations[h] for h in hops[offsets[i]:offsets[i + 1]]]
+            if isinstance(vessel, AIController):
+                vessel.itinerary = vessel_hops
+            elif isinstance(vessel, Player):
+                vessel.route = vessel_hops
+
+        templates = [ShipTemplate(t['data'], t['name']) for t in meta['templates']]
+        for vessel, template in zip(owners, arrays['vessels/template'].tolist()):
+            if template >= 0:
+                vessel.template = templates[template]
+
+        for vessel, state, config in zip(owners, arrays['vessels/state'].tolist(), meta['vessel_configs']):
+            if isinstance(vessel, AIController):
+                vessel.state = AIState(state)
+                vessel.world_locations = locations
+                vessel.scheduler = world.scheduler
+                vessel.navigation = None        # set by the world once its navigation graph is ready
+                vessel.destinations = None      # set by the world once its destination selector is ready
+                vessel.config = config if config is not None else AIController.DEFAULT_CONFIG
+
+        for parent, child in arrays['locations/children'].tolist():
+            locations[parent].child_locations.append(locations[child])
+        for location, row in arrays['docked/pairs'].tolist():
+            locations[location].docked_vessels.add(owners[row])
+
+        for when, row in zip(arrays['scheduler/when'].tolist(), arrays['scheduler/rows'].tolist()):
+            world.scheduler.schedule(owners[row], when)
+
+        random.setstate((meta['rng']['version'], tuple(arrays['rng/state'].tolist()), meta['rng']['gauss']))
+
+        vessel_rows = meta['vessel_rows']
+        return locations, [owners[row] for row in vessel_rows], owners[meta['player_row']]
+
+
+    # -------------------------
+    # file io
+    # -------------------------
+    def write(self, path: str) -> None:
+        """
+        Write the snapshot file (safe to call off the main thread)
+
+        :param path: output file path
+        :return:
+        """
+        arrays = dict(self.arrays)
+        meta = dict(self.meta)
+
+        # lay out array blobs after the header, every blob aligned to _ALIGN bytes
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            arrays[name] = array
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += -(-array.nbytes // _ALIGN) * _ALIGN
+
+        meta['arrays'] = layout
+        header = json.dumps(meta).encode('utf-8')
+        data_start = -(-(16 + len(header)) // _ALIGN) * _ALIGN
+
+        with open(path, 'wb') as file:
+            file.write(SNAPSHOT_MAGIC)
+            file.write(np.uint64(len(header)).tobytes())
+            file.write(header)
+            file.write(b'\0' * (data_start - 16 - len(header)))
+            for name, array in arrays.items():
+                file.write(array.tobytes())
+                file.write(b'\0' * (-array.nbytes % _ALIGN))
+
+
+    def write_in_background(self, path: str) -> threading.Thread:
+        """
+        Write the snapshot on a background thread
+
+        :param path: output file path
+        :return: the started thread (join() it to wait for completion)
+        """
+        thread = threading.Thread(target=self.write, args=(path,), name='world-snapshot-writer', daemon=True)
+        thread.start()
+        return thread
+
+
+    @classmethod
+    def read(cls, path: str, mmap: bool = True) -> "WorldSnapshot":
+        """
+        Open a snapshot file
+
+        :param path: snapshot file path
+        :param mmap: memory map the arrays instead of reading them into memory
+        :return: WorldSnapshot
+        """
+        with open(path, 'rb') as file:
+            if file.read(8) != SNAPSHOT_MAGIC:
+                raise ValueError(f"'{path}' is not a world snapshot")
+            header_length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+            meta = json.loads(file.read(header_length).decode('utf-8'))
+            if meta['version'] != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version {meta['version']}")
+
+            data_start = -(-(16 + header_length) // _ALIGN) * _ALIGN
+            arrays = {}
+            for name, spec in meta['arrays'].items():
+                dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+                if mmap and int(np.prod(shape)) > 0:
+                    arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=data_start + spec['offset'], shape=shape)
+                else:
+                    file.seek(data_start + spec['offset'])
+                    count = int(np.prod(shape))
+                    arrays[name] = np.frombuffer(file.read(count * dtype.itemsize), dtype=dtype).reshape(shape)
+        return cls(arrays, meta)
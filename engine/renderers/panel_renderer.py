@@ -2,6 +2,8 @@
 import pygame
 from typing import Callable
 
+from data.config.config_settings import TEXT_CACHE_SETTINGS
+from engine.renderers.text_cache import TEXT_CACHE, distance_label
 from source.classes.AI.AI_controller import AIController
 
 BG = (10, 10, 10)
@@ -22,6 +24,10 @@ class PanelRenderer:
       - locked-target info (left panel)
       - pending destination preview + Confirm/Cancel buttons
       - debug data for ships and locations
+
+    Every frame the panel content is laid out as a tuple of draw ops (text lines, buttons). The panel is
+    only rendered again when that tuple changed, it is kept on a cached surface and draw() reports the
+    screen rects it touched so the game loop can use pygame.display.update(rects).
     """
 
     def __init__(self, surface: pygame.Surface, rect: pygame.Rect, side: str = "right"):
@@ -32,15 +38,45 @@ class PanelRenderer:
         self.actions: dict[str, Callable] = {}
         self._buttons: dict[str, tuple[pygame.Rect, bool]] = {}
 
+        self._cache = pygame.Surface(self.rect.size)
+        self._ops: tuple | None = None      # layout the cache was rendered from
+        self.redraws = 0
+
+    def _text(self, text: str, antialias: bool, color: tuple) -> pygame.Surface:
+        """font.render through the shared text cache"""
+        return TEXT_CACHE.render(self.font, text, color, antialias)
+
     def register_action(self, label: str, callback: Callable):
         self.actions[label] = callback
 
-    def draw(self, player, selected=None, locked=None, pending_destination=None):
-        pygame.draw.rect(self.surface, BG, self.rect)
-        pygame.draw.rect(self.surface, BORDER, self.rect, 2)
+    def draw(self, player, selected=None, locked=None, pending_destination=None,
+             damaged: pygame.Rect | None = None) -> list[pygame.Rect]:
+        """
+        Lay out the panel, re-render it if the layout changed and put it on screen
+
+        :param damaged: screen area drawn over since the last frame, the panel restores its part of it
+        :return: screen rects changed by the panel (empty when nothing changed)
+        """
+        ops = self._layout(player, selected, locked, pending_destination)
+        if ops != self._ops:
+            self._render(ops)
+            self.surface.blit(self._cache, self.rect)
+            return [self.rect.copy()]
+
+        if damaged is not None:
+            overlap = self.rect.clip(damaged)
+            if overlap.width and overlap.height:
+                self.surface.blit(self._cache, overlap, overlap.move(-self.rect.x, -self.rect.y))
+                return [overlap]
+        return []
+
+    # --- layout: panel content as draw ops, coordinates relative to the panel ---
+    def _layout(self, player, selected, locked, pending_destination) -> tuple:
+        ops = []
+        self._buttons.clear()
 
-        y = self.rect.top + 10
-        left = self.rect.left + 10
+        y = 10
+        left = 10
 
         # player header
         lines = [
@@ -50,65 +86,50 @@ class PanelRenderer:
             f"- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -"
         ]
         for l in lines:
-            self.surface.blit(self.font.render(l, True, TEXT), (left, y))
+            ops.append(('text', l, TEXT, left, y))
             y += 22
 
         # pending destination info + Confirm/Cancel buttons
         if pending_destination and pending_destination.get("active") and self.side == "right":
-            y = self._draw_pending_destination(pending_destination, left, y)
+            y = self._layout_pending_destination(ops, pending_destination, left, y)
 
         # selected target info (right panel)
         if selected and self.side == "right":
             y += 6
-            y = self._draw_target_info(selected, player, left, y)
+            y = self._layout_target_info(ops, selected, player, left, y)
 
         # locked target info (left panel)
         if locked and self.side == "left":
             y += 6
-            y = self._draw_target_info(locked, player, left, y)
+            y = self._layout_target_info(ops, locked, player, left, y)
+
+        return tuple(ops)
 
-    def _draw_pending_destination(self, pending, left, y):
+    def _layout_button(self, ops, label, left, y, enabled=True, style="normal"):
+        """button op, also registered (in screen coordinates) for click handling"""
+        rect = (left, y, self.rect.width - 20, 32)
+        ops.append(('button', label, rect, style))
+        self._buttons[label] = (pygame.Rect(rect).move(self.rect.topleft), enabled)
+
+    def _layout_pending_destination(self, ops, pending, left, y):
         coords = pending.get("coords")
-        self.surface.blit(
-            self.font.render(f"Pending dest: {tuple(round(c,1) for c in coords)}", True, TEXT),
-            (left, y),
-        )
+        ops.append(('text', f"Pending dest: {tuple(round(c,1) for c in coords)}", TEXT, left, y))
         y += 30
 
-        self._buttons.clear()
-        confirm_rect = pygame.Rect(left, y, self.rect.width - 20, 32)
-        pygame.draw.rect(self.surface, BTN_BG, confirm_rect)
-        pygame.draw.rect(self.surface, BTN_BORDER, confirm_rect, 2)
-        self.surface.blit(
-            self.font.render("Confirm Move", True, TEXT), (confirm_rect.x + 8, confirm_rect.y + 6)
-        )
-        self._buttons["Confirm Move"] = (confirm_rect, True)
+        self._layout_button(ops, "Confirm Move", left, y)
         y += 40
 
-        cancel_rect = pygame.Rect(left, y, self.rect.width - 20, 32)
-        pygame.draw.rect(self.surface, BTN_DISABLED_BG, cancel_rect)
-        pygame.draw.rect(self.surface, BTN_DISABLED_BORDER, cancel_rect, 2)
-        self.surface.blit(
-            self.font.render("Cancel Move", True, RED), (cancel_rect.x + 8, cancel_rect.y + 6)
-        )
-        self._buttons["Cancel Move"] = (cancel_rect, True)
+        self._layout_button(ops, "Cancel Move", left, y, style="disabled")
         y += 44
         return y
 
-    def _draw_target_info(self, target, player, left_x, start_y):
+    def _layout_target_info(self, ops, target, player, left_x, start_y):
         y = start_y
         name = getattr(target, "name", getattr(target, "tag", "Unknown"))
         ttype = getattr(target, "vessel_type", getattr(target, "location_type", "Unknown"))
 
-
-        unit_prefix = "Mm"
-        dist_label = 0.0
         dist_mm = player.get_distance_to_location_Mm(target)
-        if dist_mm < 1:
-            unit_prefix = "km"
-            dist_label = round(player.get_distance_to_location_Mm(target)*1000, 1)
-        else:
-            dist_label = round(dist_mm, 1)
+        dist = distance_label(dist_mm, TEXT_CACHE_SETTINGS['panel_km_step'], TEXT_CACHE_SETTINGS['panel_Mm_step'])
 
         # lines = [f"Target: {name}", f"Type: {ttype}", f"Distance: {dist_mm} Mm"]
         # for line in lines:
@@ -118,55 +139,57 @@ class PanelRenderer:
         # --- Debug info for vessels ---
         if type(target) == AIController:
             target: AIController = target
-            lines = [f"Target: {target.name} ({target.tag})", f"Type: {target.ship_type}", f"Distance: {dist_label} {unit_prefix}", f"AI State: {target.state.name}", f"Destination: {target.destination}"]
+            lines = [f"Target: {target.name} ({target.tag})", f"Type: {target.ship_type}", f"Distance: {dist}", f"AI State: {target.state.name}", f"Destination: {target.destination}"]
             for line in lines:
-                self.surface.blit(self.font.render(line, True, TEXT), (left_x, y))
+                ops.append(('text', line, TEXT, left_x, y))
                 y += 22
 
         # --- Debug info for locations ---
         if hasattr(target, "docked_vessels"):
             info = target.debug_info()
-            self.surface.blit(
-                self.font.render(f"Docked ships: {len(info['docked'])}", True, TEXT),
-                (left_x, y),
-            )
+            ops.append(('text', f"Docked ships: {len(info['docked'])}", TEXT, left_x, y))
             y += 20
             for vname in info["docked"]:
-                self.surface.blit(self.font.render(f" - {vname}", True, TEXT), (left_x + 10, y))
+                ops.append(('text', f" - {vname}", TEXT, left_x + 10, y))
                 y += 18
 
         # Example: Dock button for stations
         if getattr(target, "__class__", None).__name__ == "Station":
             can_dock = dist_mm <= 0.5
-            label = "Dock"
-            rect = pygame.Rect(left_x, y, self.rect.width - 20, 32)
-            bg = BTN_BG if can_dock else BTN_DISABLED_BG
-            border = BTN_BORDER if can_dock else BTN_DISABLED_BORDER
-            pygame.draw.rect(self.surface, bg, rect)
-            pygame.draw.rect(self.surface, border, rect, 2)
-            txtcol = TEXT if can_dock else RED
-            self.surface.blit(self.font.render(label, True, txtcol), (rect.x + 8, rect.y + 6))
-            self._buttons[label] = (rect, can_dock)
+            self._layout_button(ops, "Dock", left_x, y, enabled=can_dock, style="normal" if can_dock else "disabled")
             y += 40
 
         # vessel lock and travel buttons
         if hasattr(target, "vessel_type"):
-            rect = pygame.Rect(left_x, y, self.rect.width - 20, 32)
-            pygame.draw.rect(self.surface, BTN_BG, rect)
-            pygame.draw.rect(self.surface, BTN_BORDER, rect, 2)
-            self.surface.blit(self.font.render("Lock", True, TEXT), (rect.x + 8, rect.y + 6))
-            self._buttons["Lock"] = (rect, True)
+            self._layout_button(ops, "Lock", left_x, y)
             y += 40
 
-            rect = pygame.Rect(left_x, y, self.rect.width - 20, 32)
-            pygame.draw.rect(self.surface, BTN_BG, rect)
-            pygame.draw.rect(self.surface, BTN_BORDER, rect, 2)
-            self.surface.blit(self.font.render("Travel", True, TEXT), (rect.x + 8, rect.y + 6))
-            self._buttons["Travel"] = (rect, True)
+            self._layout_button(ops, "Travel", left_x, y)
             y += 40
 
         return y
 
+    # --- render: draw ops onto the cached panel surface ---
+    def _render(self, ops: tuple):
+        surface = self._cache
+        surface.fill(BG)
+        pygame.draw.rect(surface, BORDER, surface.get_rect(), 2)
+
+        for op in ops:
+            if op[0] == 'text':
+                _, text, color, x, y = op
+                surface.blit(self._text(text, True, color), (x, y))
+            else:
+                _, label, rect, style = op
+                rect = pygame.Rect(rect)
+                normal = style == "normal"
+                pygame.draw.rect(surface, BTN_BG if normal else BTN_DISABLED_BG, rect)
+                pygame.draw.rect(surface, BTN_BORDER if normal else BTN_DISABLED_BORDER, rect, 2)
+                surface.blit(self._text(label, True, TEXT if normal else RED), (rect.x + 8, rect.y + 6))
+
+        self._ops = ops
+        self.redraws += 1
+
     def handle_event(self, event) -> bool:
         if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1:
             return False
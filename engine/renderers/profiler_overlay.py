@@ -0,0 +1,102 @@
+# engine/renderers/profiler_overlay.py
+import pygame
+
+from data.config.config_settings import PROFILER_SETTINGS
+from utility.tools.frame_profiler import FrameProfiler
+
+BG = (10, 10, 10)
+BORDER = (0, 100, 0)
+TEXT = (0, 255, 0)
+WARN = (230, 200, 40)
+SLOW = (200, 40, 40)
+
+ROW_HEIGHT = 18
+COLUMNS = (10, 110, 170, 230, 290)      # phase, then one column per percentile (x in the overlay)
+
+
+class ProfilerOverlay:
+    """
+    Table of the profiler's rolling percentiles per phase (ms), toggled in game.
+
+    The table is rendered onto a cached surface every `overlay_refresh` frames only, in between the cached
+    surface is put back where the radar drew over it. Its text does not go through the shared TEXT_CACHE:
+    the readouts change on every refresh and would only push the radar and panel labels out of it. Like PanelRenderer.draw(), draw() returns the screen
+    rects it changed for pygame.display.update(rects).
+    """
+
+    def __init__(self, surface: pygame.Surface, topleft: tuple[int, int], profiler: FrameProfiler,
+                 settings: dict = PROFILER_SETTINGS):
+        self.surface = surface
+        self.profiler = profiler
+        self.visible: bool = settings['overlay']
+        self.refresh: int = max(1, settings['overlay_refresh'])
+        self.font = pygame.font.SysFont(None, 20)
+
+        height = (len(profiler.phases) + 2) * ROW_HEIGHT + 16
+        self.rect = pygame.Rect(topleft, (COLUMNS[-1] + 50, height))
+        self._cache = pygame.Surface(self.rect.size)
+        self._frames = 0
+
+        # headers and phase names never change, rendered once
+        headers = ['phase'] + [f"p{q:g}" for q in profiler.percentiles] + ['max']
+        self._headers = [self.font.render(label, True, TEXT) for label in headers]
+        self._phase_labels = {phase: self.font.render(phase, True, TEXT) for phase in profiler.phases}
+
+    def toggle(self) -> bool:
+        """
+        Show/hide the overlay, the next draw() renders it fresh
+
+        :return: visible after the toggle
+        """
+        self.visible = not self.visible
+        self._frames = 0
+        return self.visible
+
+    def draw(self, damaged: pygame.Rect | None = None) -> list[pygame.Rect]:
+        """
+        :param damaged: screen area drawn over since the last frame, the overlay restores its part of it
+        :return: screen rects changed by the overlay
+        """
+        if not self.visible:
+            return []
+
+        if self._frames % self.refresh == 0:
+            self._render()
+            self._frames += 1
+            self.surface.blit(self._cache, self.rect)
+            return [self.rect.copy()]
+        self._frames += 1
+
+        if damaged is not None:
+            overlap = self.rect.clip(damaged)
+            if overlap.width and overlap.height:
+                self.surface.blit(self._cache, overlap, overlap.move(-self.rect.x, -self.rect.y))
+                return [overlap]
+        return []
+
+    def _render(self):
+        surface = self._cache
+        surface.fill(BG)
+        pygame.draw.rect(surface, BORDER, surface.get_rect(), 2)
+
+        profiler = self.profiler
+        budget_ms = 1000.0 / 60
+        stats = profiler.rolling()
+        frames = min(profiler.frames, profiler.window)
+
+        y = 8
+        surface.blit(self.font.render(f"Frame profile, last {frames} frames (ms)", True, TEXT), (COLUMNS[0], y))
+        y += ROW_HEIGHT
+        for x, label in zip(COLUMNS, self._headers):
+            surface.blit(label, (x, y))
+
+        for phase in profiler.phases:
+            y += ROW_HEIGHT
+            surface.blit(self._phase_labels[phase], (COLUMNS[0], y))
+            if phase not in stats:
+                continue
+            values = [stats[phase][f"p{q:g}"] for q in profiler.percentiles] + [stats[phase]['max']]
+            for x, value in zip(COLUMNS[1:], values):
+                # against the 60 fps frame budget: over a quarter is worth a look, over the whole budget is slow
+                color = SLOW if value > budget_ms else (WARN if value > budget_ms / 4 else TEXT)
+                surface.blit(self.font.render(f"{value:.2f}", True, color), (x, y))
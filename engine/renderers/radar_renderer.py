@@ -1,11 +1,14 @@
-import time
+from typing import Callable, Hashable
 
+import numpy as np
 import pygame
 
-from source.classes.location._location import Location
+from data.config.config_settings import TEXT_CACHE_SETTINGS, RADAR_LABEL_SETTINGS
+from engine.logic.blip_buffer import BlipBuffer, KIND_LOCATION, KIND_VESSEL
+from engine.logic.label_grid import LabelGrid
+from engine.renderers.text_cache import TEXT_CACHE, distance_label
 from source.classes.player.player import Player
 from source.classes.ship._vessel import Vessel
-from source.classes.ship.ship_class import Ship
 
 # --- Colors ---
 BLIP_COLOR = (0, 255, 0)
@@ -15,12 +18,50 @@ SELECTED_COLOR = (0, 255, 0)
 LOCKED_TRIANGLE_COLOR = (255, 200, 0)
 DEST_RING_COLOR = (200, 200, 0)
 PLAYER_BLIP_COLOR = (0, 200, 255)
+BACKGROUND_COLOR = (20, 20, 20)     # screen fill, static layers use it as their transparent colorkey
+
+LAYER_MARGIN = 80   # pixels a static layer reaches past the radar circle (ring labels)
+STAMP_COLORKEY = (255, 0, 255)      # transparent colour of blip sprite stamps
+STAMP_EXTENT = 20   # pixels a blip sprite reaches from its anchor (selection diamond / lock triangle)
+LABEL_OFFSET = (25, -25)    # top left of a vessel's id label relative to its blip, distance label 20 px below
+
+
+class RadarLayer:
+    """
+    Static radar decoration cached on an offscreen surface. draw(surface, cx, cy) renders it around the
+    layer's own center and only runs again once key() changes, every other frame is a single blit.
+
+    The surface is filled with BACKGROUND_COLOR (antialiased edges blend exactly as they would on the
+    screen) and colorkeyed on it with RLE acceleration, so a blit only touches the decoration's pixels.
+    """
+
+    def __init__(self, draw: Callable[[pygame.Surface, int, int], None], key: Callable[[], Hashable]):
+        self.draw = draw
+        self.key = key
+        self.surface: pygame.Surface | None = None
+        self.redraws = 0
+        self._key = None
+
+    def invalidate(self) -> None:
+        """Force a redraw on the next blit."""
+        self.surface = None
+
+    def blit(self, target: pygame.Surface, center: tuple[int, int], half_size: int) -> None:
+        key = self.key()
+        if self.surface is None or key != self._key:
+            self.surface = pygame.Surface((half_size * 2, half_size * 2))
+            self.surface.fill(BACKGROUND_COLOR)
+            self.draw(self.surface, half_size, half_size)
+            self.surface.set_colorkey(BACKGROUND_COLOR, pygame.RLEACCEL)
+            self._key = key
+            self.redraws += 1
+        target.blit(self.surface, (int(center[0]) - half_size, int(center[1]) - half_size))
 
 
 class RadarRenderer:
     """
     Draws radar with:
-      - outline and range rings
+      - outline and range rings (cached static layer, redrawn on zoom)
       - blips (locations as dots, vessels as triangles)
       - selected diamond
       - locked inverted triangle for vessels
@@ -35,9 +76,63 @@ class RadarRenderer:
         self.size = radar_size                 # visual pixel radius
         self.label_scale = radar_scale         # alias for compatibility
         self.font = pygame.font.SysFont(None, 20)
+        self.show_labels = True                # id / distance labels next to vessel blips
+        # label decluttering: labels are placed by priority on a screen-space occupancy grid
+        self.label_grid = LabelGrid(surface.get_size(), RADAR_LABEL_SETTINGS['cell_size'])
+        self.label_budget: int = RADAR_LABEL_SETTINGS['budget']
+        self.labels_placed = 0
+
+        # blip sprites, pre-rendered once with the shape helpers and stamped in one Surface.blits batch
+        self.stamps: dict[str, pygame.Surface] = {
+            'vessel': self._make_stamp(self._draw_vessel_shape),
+            'location': self._make_stamp(self._draw_location_blip),
+            'selected': self._make_stamp(self._draw_diamond),
+            'locked': self._make_stamp(self._draw_locked_triangle),
+        }
+        self._kind_stamps = {KIND_VESSEL: self.stamps['vessel'], KIND_LOCATION: self.stamps['location']}
+
+        # static decorations, drawn in order below everything else
+        self.layers: list[RadarLayer] = []
+        self.add_layer(self._draw_outline_and_rings)
+
+
+    def add_layer(self, draw: Callable[[pygame.Surface, int, int], None],
+                  key: Callable[[], Hashable] | None = None) -> RadarLayer:
+        """
+        Register a static radar decoration (see RadarLayer)
+
+        :param draw: draw(surface, cx, cy) renders the decoration around (cx, cy) of the layer surface
+        :param key: returns what the decoration depends on, defaults to radar scale and size
+        :return: RadarLayer (invalidate() forces a redraw)
+        """
+        layer = RadarLayer(draw, key or (lambda: (self.scale, self.size)))
+        self.layers.append(layer)
+        return layer
+
+
+    @staticmethod
+    def _make_stamp(draw: Callable[[pygame.Surface, int, int], None]) -> pygame.Surface:
+        """
+        Pre-render a blip shape: draw(surface, x, y) around the anchor (STAMP_EXTENT, STAMP_EXTENT)
+
+        :return: colorkeyed sprite, blit at (x - STAMP_EXTENT, y - STAMP_EXTENT) to place its anchor at (x, y)
+        """
+        size = STAMP_EXTENT * 2 + 1
+        stamp = pygame.Surface((size, size))
+        stamp.fill(STAMP_COLORKEY)
+        draw(stamp, STAMP_EXTENT, STAMP_EXTENT)
+        stamp.set_colorkey(STAMP_COLORKEY, pygame.RLEACCEL)
+        return stamp
 
 
     # --- Utility Methods ---
+    @property
+    def bounds(self) -> pygame.Rect:
+        """Screen area the radar draws into (circle, static layers and blip labels), clipped to the surface"""
+        half_size = self.size + LAYER_MARGIN
+        rect = pygame.Rect(int(self.center[0]) - half_size, int(self.center[1]) - half_size, half_size * 2, half_size * 2)
+        return rect.clip(self.surface.get_rect())
+
     def is_inside(self, pos: tuple[int, int]) -> bool:
         """Check if a position is within the radar circle."""
         mx, my = pos
@@ -58,11 +153,11 @@ class RadarRenderer:
 
 
     # --- Drawing Methods ---
-    def draw(self, blips: list, player, selected=None, locked=None, destination_marker=None):
+    def draw(self, blips: BlipBuffer, player, selected=None, locked=None, destination_marker=None):
         """
         Draw radar, blips, selection indicators, locked indicators, and optional destination.
 
-        :param blips: list of objects with coordinates or radar_dx/radar_dy
+        :param blips: BlipBuffer from Radar_System.get_blips
         :param player: player object for reference coordinates
         :param selected: currently selected object (diamond)
         :param locked: currently locked object (inverted triangle)
@@ -72,19 +167,24 @@ class RadarRenderer:
 
         cx, cy = self.center
 
-        self._draw_outline_and_rings(cx, cy, self.font, player)
+        self._draw_background()
         self._draw_destination_marker(cx, cy, destination_marker, player)
         self._draw_blips(cx, cy, blips, player, selected, locked)
 
 
     # --- Internal drawing helpers ---
-    def _draw_outline_and_rings(self, cx, cy, font, player):
-        pygame.draw.circle(self.surface, OUTLINE_COLOR, (int(cx), int(cy)), self.size, 2)
+    def _draw_background(self):
+        half_size = self.size + LAYER_MARGIN
+        for layer in self.layers:
+            layer.blit(self.surface, self.center, half_size)
+
+    def _draw_outline_and_rings(self, surface, cx, cy):
+        pygame.draw.circle(surface, OUTLINE_COLOR, (int(cx), int(cy)), self.size, 2)
 
         rings = 4
         for i in range(1, rings + 1):
             r_px = int(self.size * (i / (rings + 1)))
-            pygame.draw.circle(self.surface, RING_COLOR, (int(cx), int(cy)), r_px, 1)
+            pygame.draw.circle(surface, RING_COLOR, (int(cx), int(cy)), r_px, 1)
             # Draw world distance in Mm
             world_dist_mm = (r_px / self.scale / 1000, 1)
 
@@ -96,8 +196,8 @@ class RadarRenderer:
             else:
                 dist_label = round(world_dist_mm[0])
 
-            label = font.render(f"{dist_label} {unit_prefix}", True, BLIP_COLOR)
-            self.surface.blit(label, (cx + r_px + 6, cy - 10))
+            label = self.font.render(f"{dist_label} {unit_prefix}", True, BLIP_COLOR)
+            surface.blit(label, (cx + r_px + 6, cy - 10))
 
 
     def _draw_destination_marker(self, cx, cy, destination_marker, player):
@@ -109,87 +209,127 @@ class RadarRenderer:
             pygame.draw.circle(self.surface, DEST_RING_COLOR, (dx_px, dy_px), inner, 0)
 
 
-    def _draw_blips(self, cx, cy, blips, player, selected, locked):
-        for obj in blips:
-            # dont draw vessel if vessel is invisible
-            if isinstance(obj, Vessel) and not getattr(obj, "visible_on_radar", True):
-                continue
-
-            rdx = getattr(obj, "radar_dx", None)
-            rdy = getattr(obj, "radar_dy", None)
-            if rdx is None or rdy is None:
-                rdx, rdy = self.world_to_radar(obj.coordinates, player)
-
-            x_px, y_px = int(cx + rdx), int(cy + rdy)
-
-            # Draw vessel/location
-            if issubclass(type(obj), Vessel):
-                self._draw_vessel_blip(x_px, y_px, obj, player)
-                self._draw_trail(obj, player)
-            elif issubclass(type(obj), Location):
-                self._draw_location_blip(x_px, y_px)
-
-            # Draw selected diamond
-            if selected is obj:
-                self._draw_diamond(x_px, y_px)
+    def _draw_blips(self, cx, cy, blips: BlipBuffer, player, selected, locked):
+        """
+        Stamp every blip (and the selection / lock markers) in one Surface.blits batch, then the vessel
+        labels in a second one
+        """
+        # invisible vessels are already filtered out of the buffer by Radar_System
+        pixels = (blips.offsets + (cx, cy)).astype(int)
+        corners = (pixels - STAMP_EXTENT).tolist()
+        kinds = blips.kinds.tolist()
+        objects = blips.objects()
+
+        batch = list(zip([self._kind_stamps[kind] for kind in kinds], corners))
+        for marker, stamp in ((selected, self.stamps['selected']), (locked, self.stamps['locked'])):
+            if marker is not None:
+                batch.extend((stamp, corners[i]) for i, obj in enumerate(objects) if obj is marker)
+        self.surface.blits(batch, doreturn=False)
+
+        vessels = [i for i, kind in enumerate(kinds) if kind == KIND_VESSEL]
+        rows = np.array([objects[i].row for i in vessels], dtype=np.int64)
+        self.labels_placed = 0
+        if self.show_labels and vessels:
+            self.surface.blits(self._place_labels(pixels, vessels, rows, objects, blips, player, selected, locked),
+                               doreturn=False)
+
+        # trails of every vessel on radar plus the player, then the player itself
+        self._draw_trails(np.concatenate(([player.row], rows)), player)
+        self._draw_player_blip()
 
-            # Draw locked inverted triangle
-            if locked is obj:
-                self._draw_locked_triangle(x_px, y_px)
 
+    def _place_labels(self, pixels: np.ndarray, vessels: list, rows: np.ndarray, objects: list,
+                      blips: BlipBuffer, player, selected, locked) -> list:
+        """
+        Choose which vessel labels to draw: selected and locked contacts always, then the nearest ones while
+        their label block lands on free occupancy grid cells, up to the label budget
 
-        # draw player
-        self._draw_player_blip()
-        self._draw_trail(player, player)
+        :return: (surface, position) pairs for Surface.blits
+        """
+        grid = self.label_grid
+        grid.clear()
+        if RADAR_LABEL_SETTINGS['avoid_blips']:
+            grid.occupy_points(pixels, RADAR_LABEL_SETTINGS['blip_radius'])
+
+        # distances straight from the fleet position column, one pass for all vessels on radar
+        delta = player.fleet.positions[rows] - player.fleet.positions[player.row]
+        distances = np.sqrt(np.einsum('ij,ij->i', delta, delta)) / 1000
+        forced = [k for k, i in enumerate(vessels) if objects[i] is selected or objects[i] is locked]
+
+        # drop every vessel whose estimated label block already covers a blip, in one vectorized test
+        estimate_w, estimate_h = RADAR_LABEL_SETTINGS['box_estimate']
+        corners = pixels[vessels] + LABEL_OFFSET
+        boxes = np.column_stack((corners, np.full((len(vessels), 2), (estimate_w, estimate_h))))
+        candidates = np.flatnonzero(grid.free_mask(boxes))
+        candidates = candidates[np.argsort(distances[candidates], kind='stable')].tolist()
+        order = forced + [k for k in candidates if k not in forced]
+
+        identified = blips.identified.tolist()
+        pixels = pixels.tolist()
+        distances = distances.tolist()
+        labels = []
+        for n, k in enumerate(order):
+            is_forced = n < len(forced)
+            if not is_forced and self.labels_placed >= self.label_budget:
+                break
+            i = vessels[k]
+            x, y = pixels[i][0] + LABEL_OFFSET[0], pixels[i][1] + LABEL_OFFSET[1]
+            # cheap test with the estimated block before rendering any text
+            if not is_forced and not grid.is_free(x, y, estimate_w, estimate_h):
+                continue
+            pair = self._vessel_labels(*pixels[i], objects[i], distances[k], identified[i])
+            w = max(surface.get_width() for surface, _ in pair)
+            h = pair[-1][1][1] + pair[-1][0].get_height() - y
+            if not is_forced and not grid.is_free(x, y, w, h):
+                continue
+            grid.occupy(x, y, w, h)
+            labels.extend(pair)
+            self.labels_placed += 1
+        return labels
 
 
-    def _draw_trail(self, vessel: Vessel | Player, player: Player):
-        if not hasattr(vessel, "trail") or not vessel.trail:
+    def _draw_trails(self, rows: np.ndarray, player: Player):
+        """
+        Draw the trails of the given fleet rows. Expiry, fade and the world → radar transform are
+        computed for all trail dots at once, only the circle draws remain per dot.
+        """
+        points, fades = player.fleet.get_trail_points(rows)
+        if not len(points):
             return
 
+        # world → radar transform relative to PLAYER (not vessel itself)
         cx, cy = self.center
-        now = time.time()
+        sx, sy = player.coordinates
+        rx = (cx + (points[:, 1] - sy) * self.scale).astype(int)
+        ry = (cy - (points[:, 0] - sx) * self.scale).astype(int)
+        greens = (255 * fades).astype(int)
 
-        for x, y, t in vessel.trail:
-            age = now - t
-            fade = max(0, 1.0 - age / vessel.trail_lifetime)
-            if fade <= 0:
-                continue
-
-            # world → radar transform relative to PLAYER (not vessel itself)
-            rdx, rdy = self.world_to_radar((x, y), player)
-            rx, ry = int(cx + rdx), int(cy + rdy)
-
-            color = (0, int(255 * fade), 0)
-            pygame.draw.circle(self.surface, color, (rx, ry), 2)
+        for x, y, g in zip(rx.tolist(), ry.tolist(), greens.tolist()):
+            pygame.draw.circle(self.surface, (0, g, 0), (x, y), 2)
 
 
     # --- Small shape render helpers ---
-    def _draw_vessel_blip(self, x_px, y_px, vessel: Vessel, player: Player):
+    def _draw_vessel_shape(self, surface, x_px, y_px):
         size = 4
         points = [(x_px, y_px - size), (x_px - size, y_px + size), (x_px + size, y_px + size)]
 
-        pygame.draw.polygon(self.surface, BLIP_COLOR, points)
-
+        pygame.draw.polygon(surface, BLIP_COLOR, points)
 
-        dist = player.get_distance_to_location_Mm(vessel)
-        unit_prefix = "Mm"
-        dist_label = 0.0
-        if dist < 1:
-            unit_prefix = "km"
-            dist_label = round(dist * 1000)
-        else:
-            dist_label = round(dist, 1)
+    def _vessel_labels(self, x_px, y_px, vessel: Vessel, distance_Mm: float, identified: bool = True) -> list:
+        """id and distance label of a vessel blip as (surface, position) pairs"""
+        # quantised distance, so labels of moving contacts keep hitting the text cache
+        dist = distance_label(distance_Mm, TEXT_CACHE_SETTINGS['radar_km_step'], TEXT_CACHE_SETTINGS['radar_Mm_step'])
 
-        id_label = self.font.render(f"id: {vessel.tag}", True, BLIP_COLOR)
-        state_label = self.font.render(f"{dist_label} {unit_prefix}", True, BLIP_COLOR)
+        # unidentified sensor contacts do not reveal who they are
+        id_label = TEXT_CACHE.render(self.font, f"id: {vessel.tag if identified else 'unknown'}", BLIP_COLOR)
+        state_label = TEXT_CACHE.render(self.font, dist, BLIP_COLOR)
 
-        self.surface.blit(id_label, (x_px+25, y_px-25))
-        self.surface.blit(state_label, (x_px + 25, y_px - 5))
+        x, y = x_px + LABEL_OFFSET[0], y_px + LABEL_OFFSET[1]
+        return [(id_label, (x, y)), (state_label, (x, y + 20))]
 
-    def _draw_location_blip(self, x_px, y_px):
+    def _draw_location_blip(self, surface, x_px, y_px):
         size = 6
-        pygame.draw.circle(self.surface, BLIP_COLOR, (x_px, y_px), size)
+        pygame.draw.circle(surface, BLIP_COLOR, (x_px, y_px), size)
 
     def _draw_player_blip(self):
         x_px, y_px = int(self.center[0]), int(self.center[1])
@@ -197,15 +337,15 @@ class RadarRenderer:
         points = [(x_px, y_px - size), (x_px - size, y_px + size), (x_px + size, y_px + size)]
         pygame.draw.polygon(self.surface, PLAYER_BLIP_COLOR, points)
 
-    def _draw_diamond(self, x, y):
+    def _draw_diamond(self, surface, x, y):
         s = 14
         x_offset = 0
         y_offset = 1
         diamond = [(x + x_offset, y - s - y_offset), (x + s + x_offset, y - y_offset), (x + x_offset, y + s - y_offset), (x - s + x_offset, y - y_offset)]
-        pygame.draw.polygon(self.surface, SELECTED_COLOR, diamond, 3)
+        pygame.draw.polygon(surface, SELECTED_COLOR, diamond, 3)
 
-    def _draw_locked_triangle(self, x, y):
+    def _draw_locked_triangle(self, surface, x, y):
         size = 14
         y_offset = 2
         points = [(x - size, y - size + y_offset), (x + size, y - size + y_offset), (x, y + size + y_offset)]
-        pygame.draw.polygon(self.surface, LOCKED_TRIANGLE_COLOR, points, 3)
+        pygame.draw.polygon(surface, LOCKED_TRIANGLE_COLOR, points, 3)
@@ -0,0 +1,100 @@
+# engine/renderers/text_cache.py
+"""
+Shared text surface cache
+
+font.render rasterises the string on every call, even when the same label was drawn the frame before.
+TextCache keeps rendered surfaces keyed by (font, text, colour, antialias, background) in a bounded LRU,
+every renderer draws its text through the one shared TEXT_CACHE so identical labels are rendered once.
+
+Labels built from changing numbers (distances) only hit the cache when the number is quantised, see
+quantize() and distance_label().
+"""
+from collections import OrderedDict
+from decimal import Decimal
+from functools import lru_cache
+
+import pygame
+
+from data.config.config_settings import TEXT_CACHE_SETTINGS
+
+
+def quantize(value: float, step: float) -> float | int:
+    """
+    Round value to a multiple of step
+
+    :param value: number to round
+    :param step: grid size, an integer step gives an int
+    :return: quantised value (no float noise, 0.1 steps give 1 decimal)
+    """
+    quantised = round(value / step) * step
+    decimals = _decimals(step)
+    return int(quantised) if decimals == 0 else round(quantised, decimals)
+
+
+@lru_cache(maxsize=None)
+def _decimals(step: float) -> int:
+    """decimal places of step as written (0.25 -> 2, 1e-05 -> 5, 5 and 1e3 -> 0)"""
+    return max(0, -Decimal(str(step)).normalize().as_tuple().exponent)
+
+
+def distance_label(distance_Mm: float, km_step: float, Mm_step: float) -> str:
+    """
+    Distance text in km below 1 Mm and in Mm above, quantised so nearby values share a label
+
+    :param distance_Mm: distance in Mm
+    :param km_step: km resolution below 1 Mm
+    :param Mm_step: Mm resolution from 1 Mm
+    :return: e.g. '350 km', '4.2 Mm'
+    """
+    if distance_Mm < 1:
+        return f"{quantize(distance_Mm * 1000, km_step)} km"
+    return f"{quantize(distance_Mm, Mm_step)} Mm"
+
+
+class TextCache:
+    def __init__(self, capacity: int = TEXT_CACHE_SETTINGS['capacity']):
+        """
+        :param capacity: max rendered surfaces kept (least recently used are dropped first)
+        """
+        self.capacity = capacity
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple, antialias: bool = True,
+               background: tuple | None = None) -> pygame.Surface:
+        """
+        font.render through the cache. The returned surface is shared, blit it but do not draw on it
+
+        :param font: pygame font
+        :param text: string to render
+        :param color: text colour
+        :param antialias: antialiased rendering
+        :param background: optional background colour
+        :return: rendered text surface
+        """
+        key = (font, text, color, antialias, background)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.stats['hits'] += 1
+            return surface
+
+        self.stats['misses'] += 1
+        surface = font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+
+# shared by every renderer
+TEXT_CACHE = TextCache()
@@ -0,0 +1,15 @@
+import argparse
+import time
+
+from source.generators.universe_generator import Universe_Generator
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a seeded station catalogue for large benchmark worlds.")
+    parser.add_argument("output", type=str, help="catalogue json file to write")
+    parser.add_argument("--stations", type=int, default=10000, help="number of stations")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = Universe_Generator(args.seed, args.stations).write(args.output)
+    print(f"wrote {args.output} in {time.perf_counter() - start:.2f} s: {summary}")
@@ -0,0 +1,30 @@
+import argparse
+
+from engine.core.headless_runner import HeadlessRunner
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the simulation without a display and report throughput.")
+    parser.add_argument("--ticks", type=int, default=1000, help="number of ticks to simulate")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="tick length in seconds")
+    parser.add_argument("--ships", type=int, default=None, help="total NPC ships (default: WorldManager spawn table)")
+    parser.add_argument("--stations", type=int, default=None, help="minimum number of stations (pads with filler stations)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="simulation time multiplier")
+    parser.add_argument("--no-memory", action="store_true", help="disable tracemalloc peak memory tracking")
+    parser.add_argument("--sharded", action="store_true", help="step NPC flight in sector worker processes")
+    parser.add_argument("--catalogue", type=str, default=None, help="station catalogue file (see generate_universe.py)")
+    parser.add_argument("--verbose", action="store_true", help="keep world spawn logging enabled")
+    args = parser.parse_args()
+
+    runner = HeadlessRunner(
+        ticks=args.ticks,
+        dt=args.dt,
+        ship_count=args.ships,
+        station_count=args.stations,
+        time_scale=args.time_scale,
+        trace_memory=not args.no_memory,
+        verbose=args.verbose,
+        sharded=args.sharded,
+        catalogue=args.catalogue,
+    )
+    runner.run()
+    print(runner.report())
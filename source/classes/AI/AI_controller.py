@@ -1,8 +1,11 @@
 import random
-import time
 from enum import Enum, auto
 
 from source.classes.ship.ship_class import Ship
+from source.simulation.fleet_state import FleetState
+from source.simulation.navigation import NavigationGraph
+from source.simulation.destinations import DestinationSelector
+from source.simulation.scheduler import WakeupScheduler
 
 
 class AIState(Enum):
@@ -12,27 +15,66 @@ class AIState(Enum):
 
 
 class AIController(Ship):
-    def __init__(self, data, world_locations, config=None):
-        super().__init__(data)
+
+    __slots__ = (
+        'state', 'world_locations', 'dock_until', 'config', '_last_state_change', 'scheduler',
+        'navigation', 'itinerary', 'last_location', 'destinations',
+    )
+
+    ARRIVAL_RADIUS = 25     # docks once closer than this to its destination
+
+    # config = tweakable knobs, shared by every controller without overrides
+    DEFAULT_CONFIG = {
+        "min_dwell_time": 5.0,
+        "max_dwell_time": 15.0,
+        "idle_time": 2.0,
+        "destination_faction": None,    # only pick stations of this faction (needs a destination selector)
+        "destination_service": None,    # only pick stations offering this service
+    }
+
+    def __init__(self, data, world_locations, config=None, fleet: FleetState | None = None,
+                 scheduler: WakeupScheduler | None = None, navigation: NavigationGraph | None = None,
+                 destinations: DestinationSelector | None = None):
+        super().__init__(data, fleet)
 
         self.state = AIState.IDLE
+        self.flight_active = False     # only traveling ships are advanced by the fleet
         self.world_locations = world_locations  # all location objects in world
         self.dock_until = 0
 
-        # config = tweakable knobs
-        self.config = {
-            "min_dwell_time": 5.0,
-            "max_dwell_time": 15.0,
-            "idle_time": 2.0,
-        }
+        # with a navigation graph, trips from a location follow its routes hop by hop (shared route cache)
+        self.navigation = navigation
+        self.itinerary: list = []       # remaining route hops after the current destination, last hop first
+        self.last_location = None       # location the ship last docked at or passed through
+        # with a destination selector, ships pick nearby destinations (local traffic), else any location
+        self.destinations = destinations
+
+        # config = tweakable knobs, only copied when this controller overrides them
+        self.config = self.DEFAULT_CONFIG
         if config:
-            self.config.update(config)
+            self.config = {**self.DEFAULT_CONFIG, **config}
+
+        self._last_state_change = self.clock.now
 
-        self._last_state_change = time.time()
+        # with a scheduler, idle and docked ships are only touched when their timer fires (see wake()),
+        # without one update_state() polls the timers every frame
+        self.scheduler = scheduler
+        self._schedule_wakeup(self._last_state_change + self.config["idle_time"])
 
 
     def update(self, dt):
-        now = time.time()
+        """Standalone update: fly this ship, then run its state machine."""
+        if self.state == AIState.TRAVELING:
+            self.update_flight(dt)
+        self.update_state()
+
+    def update_state(self):
+        """
+        Run the AI state machine. Flight is advanced separately (batched by FleetState.update_flight)
+
+        :return:
+        """
+        now = self.clock.now
 
 
         if self.state == AIState.IDLE:
@@ -40,27 +82,68 @@ class AIController(Ship):
                 self._choose_new_destination()
 
         elif self.state == AIState.TRAVELING:
-            self.update_flight(dt)
-
             # destination arrives at destination
-            if self.get_destination_distance() < 25:
-                self._enter_location(self.destination)
+            if self.get_destination_distance() < self.ARRIVAL_RADIUS:
+                if self.itinerary:
+                    # waypoint of a multi-hop route: fly on to the next hop
+                    self.last_location = self._destination
+                    self.set_destination(self.itinerary.pop())
+                else:
+                    self._enter_location(self._destination)
 
         elif self.state == AIState.DOCKED:
             if now > self.dock_until:
                 self._leave_location()
 
+    def wake(self):
+        """
+        Scheduler callback: the idle or dock timer registered by this ship has fired
+
+        :return:
+        """
+        if self.state == AIState.IDLE:
+            self._choose_new_destination()
+        elif self.state == AIState.DOCKED:
+            self._leave_location()
+
+    def _schedule_wakeup(self, when: float):
+        if self.scheduler is not None:
+            self.scheduler.schedule(self, when)
+
     def _choose_new_destination(self):
         # check if controller has destination
         if not self.destination is None:
             return
 
-        # choose random location to go to
-        self.destination = random.choice(self.world_locations)
-
-        self.set_destination(self.destination)
+        # choose a nearby location (distance weighted), or any location in the world without a selector
+        final_destination = None
+        if self.destinations is not None:
+            final_destination = self.destinations.sample(
+                self.coordinates, self.config["destination_faction"], self.config["destination_service"],
+                exclude=self.last_location,
+            )
+            if final_destination is None and (self.config["destination_faction"] is not None
+                                               or self.config["destination_service"] is not None):
+                # nothing matches the filter right now: stay idle and look again after the idle time
+                self._last_state_change = self.clock.now
+                self._schedule_wakeup(self._last_state_change + self.config["idle_time"])
+                return
+        if final_destination is None:
+            final_destination = random.choice(self.world_locations)
+
+        # route over the navigation graph when starting from a known location, else fly straight there
+        route = None
+        if self.navigation is not None and self.last_location is not None:
+            route = self.navigation.route(self.last_location, final_destination)
+        if route and len(route) > 2:
+            self.itinerary = route[:1:-1]
+            self.set_destination(route[1])
+        else:
+            self.itinerary = []
+            self.set_destination(final_destination)
         self.state = AIState.TRAVELING
-        self._last_state_change = time.time()
+        self.flight_active = True
+        self._last_state_change = self.clock.now
 
     def _enter_location(self, location):
         self.visible_on_radar = False
@@ -68,19 +151,23 @@ class AIController(Ship):
             self.config["min_dwell_time"],
             self.config["max_dwell_time"],
         )
-        self.dock_until = time.time() + dwell
+        self.dock_until = self.clock.now + dwell
         location.docked_vessels.add(self)
+        self.last_location = location
         self.state = AIState.DOCKED
-        self._last_state_change = time.time()
+        self.flight_active = False
+        self._last_state_change = self.clock.now
+        self._schedule_wakeup(self.dock_until)
 
     def _leave_location(self):
-        if self.destination:
-            self.destination.docked_vessels.discard(self)
+        if self._destination is not None:
+            self._destination.docked_vessels.discard(self)
 
         self.visible_on_radar = True
         self.destination = None
         self.state = AIState.IDLE
-        self._last_state_change = time.time()
+        self._last_state_change = self.clock.now
+        self._schedule_wakeup(self._last_state_change + self.config["idle_time"])
 
     # --- debug helpers ---
     def debug_info(self):
@@ -2,6 +2,8 @@ from source.classes.location._location import Location
 
 class Station(Location):
 
+    __slots__ = ('station_type', 'station_services', 'faction', 'level_requirement')
+
     def __init__(self, data: dict) -> None:
         super().__init__(data)  # initialize params from Module class
 
@@ -1,9 +1,38 @@
 from source.classes.ship.ship_class import Ship
+from source.simulation.fleet_state import FleetState
 
 
 class Player(Ship):
-    def __init__(self, data):
-        super().__init__(data)
+
+    __slots__ = ('target_is_unknown', 'target_is_threat', 'route')
+
+    def __init__(self, data, fleet: FleetState | None = None):
+        super().__init__(data, fleet)
 
         self.target_is_unknown = False
-        self.target_is_threat = False
\ No newline at end of file
+        self.target_is_threat = False
+        self.route: list = []       # remaining autopilot hops after the current destination, last hop first
+
+    def follow_route(self, route: list) -> None:
+        """
+        Autopilot along a route: fly to its first hop, the world moves on to the next hop on arrival
+
+        :param route: list of Location hops (e.g. WorldManager.plan_route()), the player's position is not part of it
+        :return:
+        """
+        if not route:
+            self.route = []
+            return
+        self.route = route[:0:-1]
+        self.set_destination(route[0])
+
+    def advance_route(self) -> bool:
+        """
+        Fly on to the next route hop once the current destination is reached
+
+        :return: True if a new hop was set
+        """
+        if not self.route or self.fleet.has_destination[self.row]:
+            return False
+        self.set_destination(self.route.pop())
+        return True
@@ -6,23 +6,36 @@ import numpy as np
 
 from source.classes.location._location import Location
 from source.classes.ship._vessel import Vessel
+from source.classes.ship.ship_template import ShipTemplate, ModuleState
+from source.simulation.fleet_state import FleetState
 from utility.tools.dev_logger import DevLogger
 
 
 class Ship(Vessel):
-    def __init__(self, data):
-        super().__init__(data)
-        self.log = DevLogger(Ship).log
+    """
+    Ship with modules. Module definitions live in a shared, frozen ShipTemplate; a ship only stores the
+    module values it changed (durability, fuel, ...), copy-on-write through ModuleState views.
+    """
+
+    __slots__ = (
+        'ship_type', 'template', '_module_changes',
+        'target', 'target_range', 'target_distance', 'has_target', 'is_player',
+    )
+
+    def __init__(self, data, fleet: FleetState | None = None):
+        """
+        :param data: ShipTemplate (shared between ships of one type) or a raw ship definition dict
+        :param fleet: FleetState holding the flight state, a standalone ship gets its own
+        """
+        if not isinstance(data, ShipTemplate):
+            data = ShipTemplate(data)
+        super().__init__(data, fleet)
 
         self.ship_type: str = data['info']['ship_type']             # type of ship (frigate, cargo, bomber, capital, etc.)
 
         # modules
-        self.engine: dict = data['engine']
-        self.fuel_cell: dict = data['fuel']
-        self.hull: dict = data['hull']
-        self.weapons: dict = data['weapons']
-        self.sensors: dict = data['sensors']
-        self.signature: dict = data['signature']
+        self.template: ShipTemplate = data
+        self._module_changes: dict | None = None                    # module -> {key: value} written by this ship
 
 
         # combat info
@@ -37,6 +50,32 @@ class Ship(Vessel):
         self.is_player: bool = True
 
 
+    # --- modules (copy-on-write views over the template) ---
+    @property
+    def engine(self) -> ModuleState:
+        return ModuleState(self, 'engine')
+
+    @property
+    def fuel_cell(self) -> ModuleState:
+        return ModuleState(self, 'fuel')
+
+    @property
+    def hull(self) -> ModuleState:
+        return ModuleState(self, 'hull')
+
+    @property
+    def weapons(self) -> ModuleState:
+        return ModuleState(self, 'weapons')
+
+    @property
+    def sensors(self) -> ModuleState:
+        return ModuleState(self, 'sensors')
+
+    @property
+    def signature(self) -> ModuleState:
+        return ModuleState(self, 'signature')
+
+
     def give_target(self, target_object):
         self.target = target_object
         self.has_target = self.check_has_target()
@@ -70,4 +109,8 @@ class Ship(Vessel):
 
     def get_distance_to_location_Mm(self, location: Location):
         distance = self.get_distance_to_location_km(location)
-        return distance/1000
\ No newline at end of file
+        return distance/1000
+
+
+# one logger shared by all ships instead of one per instance
+Ship.log = DevLogger(Ship).log
@@ -0,0 +1,155 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Inverse of _freeze, returns plain (JSON-able) dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class ShipTemplate:
+    """
+    Frozen ship definition shared by every ship spawned from it. Parsed once per ship type, ships only
+    keep a reference to it plus the module values they changed (see ModuleState).
+    Indexing works like the raw data dict: template['info']['tag'], template['hull']['durability'].
+    """
+
+    def __init__(self, data: Mapping, name: str | None = None):
+        """
+        :param data: ship definition (same schema as the ship data files), copied, never kept
+        :param name: template key in the data file, defaults to the ship tag
+        """
+        self.data: Mapping = _freeze(data)
+        self.name: str = name if name is not None else self.data['info']['tag']
+
+
+    def __repr__(self):
+        return f"ShipTemplate('{self.name}')"
+
+
+    def __getitem__(self, section: str):
+        return self.data[section]
+
+
+    def get(self, section: str, default=None):
+        return self.data.get(section, default)
+
+
+    def to_dict(self) -> dict:
+        """
+        Plain mutable copy of the definition
+
+        :return: dict
+        """
+        return _thaw(self.data)
+
+
+class ModuleState(Mapping):
+    """
+    Copy-on-write view of one ship module: reads fall through to the shared template, writes are kept
+    per ship. Top-level module keys are stored individually (only the changed keys), a nested entry (one
+    weapon, one sensor) is copied as a whole into the ship's changes on its first write, so
+    ship.weapons['pdc']['storage'] -= 1 changes this ship's ammo and nothing else.
+    """
+
+    __slots__ = ('_ship', '_module', '_path')
+
+    def __init__(self, ship, module: str, path: tuple = ()):
+        """
+        :param ship: Ship owning the changes
+        :param module: template section name ('engine', 'fuel', 'hull', ...)
+        :param path: keys of the nested entry inside the module this view shows, () for the module itself
+        """
+        self._ship = ship
+        self._module = module
+        self._path = path
+
+
+    def _changes(self) -> dict | None:
+        """
+        This ship's values at the view's path: the changed keys of the module, or the ship's own copy of
+        a nested entry (None while it was never written)
+        """
+        changes = self._ship._module_changes
+        changes = changes.get(self._module) if changes else None
+        for key in self._path:
+            if changes is None or key not in changes:
+                return None
+            changes = changes[key]
+        return changes
+
+
+    def _template(self):
+        value = self._ship.template[self._module]
+        for key in self._path:
+            value = value[key]
+        return value
+
+
+    def __getitem__(self, key):
+        changes = self._changes()
+        if changes is not None and (self._path or key in changes):
+            value = changes[key]
+        else:
+            value = self._template()[key]
+        if isinstance(value, Mapping):
+            return ModuleState(self._ship, self._module, self._path + (key,))
+        return value
+
+
+    def __setitem__(self, key, value) -> None:
+        if self._ship._module_changes is None:
+            self._ship._module_changes = {}
+        changes = self._ship._module_changes.setdefault(self._module, {})
+        if self._path:
+            # first write below a module key: copy that whole entry, later reads and writes use the copy
+            entry = self._path[0]
+            if entry not in changes:
+                changes[entry] = _thaw(self._ship.template[self._module][entry])
+            changes = changes[entry]
+            for step in self._path[1:]:
+                changes = changes[step]
+        changes[key] = value
+
+
+    def __iter__(self):
+        changes = self._changes()
+        if self._path and changes is not None:
+            yield from changes
+            return
+        base = self._template()
+        yield from base
+        if changes:
+            yield from (key for key in changes if key not in base)
+
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+    def __repr__(self):
+        return f"ModuleState('{'.'.join((self._module,) + self._path)}', {dict(self)})"
+
+
+    def reset(self) -> None:
+        """Drop this ship's changes to the module (or to the nested entry shown), falling back to the template."""
+        changes = self._ship._module_changes
+        if not changes or self._module not in changes:
+            return
+        if self._path:
+            changes[self._module].pop(self._path[0], None)
+        else:
+            changes.pop(self._module)
@@ -1,6 +1,7 @@
 # engine/generators/instance_generator.py
 # updated to produce Location (stations) and Vessel/Ship objects from loaded data.
 
+import random
 from typing import List, Dict
 from source.classes.location._location import Location
 from source.classes.location.station_class import Station
@@ -30,6 +31,53 @@ class Instance_Generator:
                 locations.append(Station(loc_data))
             else:
                 locations.append(Location(loc_data))
+
+        Instance_Generator.link_location_hierarchy(locations)
+        return locations
+
+    @staticmethod
+    def link_location_hierarchy(locations: List[Location]) -> None:
+        """
+        Add every location to the child_locations of the location its location_parent_tag names
+        (parents outside the given list are ignored)
+
+        :param locations: list of Location objects
+        :return:
+        """
+        by_tag = {location.tag: location for location in locations}
+        for location in locations:
+            parent = by_tag.get(location.location_parent_tag)
+            if parent is not None:
+                Location.add_child_location(parent, location)
+
+    @staticmethod
+    def generate_filler_locations(template_data: dict, count: int, spawn_range: dict, rng: random.Random | None = None) -> List[Location]:
+        """
+        Create count synthetic stations from one station definition, scattered uniformly over spawn_range.
+        Used to scale worlds up for stress and performance runs.
+
+        :param template_data: station definition (same schema as the station data files)
+        :param count: how many locations to create
+        :param spawn_range: {'x': [min, max], 'y': [min, max]}
+        :param rng: random generator, defaults to the random module itself so random.seed() (also what
+                    seeds the ship spawns in WorldManager) makes the layout reproducible
+        :return: list of Location objects
+        """
+        rng = rng if rng is not None else random
+        base_tag = template_data["info"]["tag"]
+
+        locations = []
+        for i in range(count):
+            loc_data = dict(template_data)
+            loc_data["info"] = dict(template_data["info"], tag=f"{base_tag}_filler_{i}")
+            loc_data["location"] = dict(
+                template_data["location"],
+                coordinates=[rng.uniform(*spawn_range['x']), rng.uniform(*spawn_range['y'])],
+            )
+            if loc_data["info"].get("location_type") == "station":
+                locations.append(Station(loc_data))
+            else:
+                locations.append(Location(loc_data))
         return locations
 
     @staticmethod
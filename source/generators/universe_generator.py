@@ -0,0 +1,204 @@
+# source/generators/universe_generator.py
+"""
+Seeded universe generator.
+
+Writes station catalogues in the station data schema (info, location, functions, flags) for benchmark and
+stress worlds of 1k to 1M+ locations:
+- stations are clustered around lognormally sized cluster centers (dense core systems, sparse fringes),
+  a fraction is scattered uniformly as background
+- every cluster has planets, its stations reference one of them through location_parent_tag
+- a ship spawn table (and spawn range) sized to the station count is written next to the 'game' section
+
+Entries are generated and written in chunks, memory use does not depend on the catalogue size. The same
+seed and settings always produce the same file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Iterator
+
+import numpy as np
+
+from data.config.gameplay_config_settings import UNIVERSE_GENERATOR_SETTINGS
+
+
+class Universe_Generator:
+    def __init__(self, seed: int, station_count: int, settings: dict = UNIVERSE_GENERATOR_SETTINGS):
+        """
+        :param seed: random seed, identical seeds and settings give identical catalogues
+        :param station_count: number of stations to generate (planets come on top)
+        :param settings: UNIVERSE_GENERATOR_SETTINGS
+        """
+        self.seed = seed
+        self.station_count = station_count
+        self.settings = settings
+        self.bounds = settings['bounds']
+
+        rng = np.random.default_rng(seed)
+        clustered = station_count - int(station_count * settings['background_fraction'])
+        self.cluster_count = max(1, round(clustered / settings['stations_per_cluster']))
+
+        # --- clusters: centers and relative sizes ---
+        self.cluster_centers = np.column_stack((
+            rng.uniform(*self.bounds['x'], self.cluster_count),
+            rng.uniform(*self.bounds['y'], self.cluster_count),
+        ))
+        sizes = rng.lognormal(0.0, settings['cluster_size_sigma'], self.cluster_count)
+        self.cluster_weights = sizes / sizes.sum()
+
+        self.planet_count = self.cluster_count * settings['planets_per_cluster']
+        self._rng = rng
+
+
+    def _clip(self, positions: np.ndarray) -> np.ndarray:
+        positions[:, 0] = np.clip(positions[:, 0], *self.bounds['x'])
+        positions[:, 1] = np.clip(positions[:, 1], *self.bounds['y'])
+        return np.round(positions, 1)
+
+
+    def planet_tag(self, index: int) -> str:
+        return f"planet_{index:06d}"
+
+
+    def iter_planets(self) -> Iterator[tuple[str, dict]]:
+        """
+        Planet entries, planets_per_cluster around every cluster center
+
+        :return: iterator of (tag, entry)
+        """
+        per_cluster = self.settings['planets_per_cluster']
+        offsets = self._rng.normal(0.0, self.settings['cluster_spread'] * 0.5, (self.planet_count, 2))
+        positions = self._clip(np.repeat(self.cluster_centers, per_cluster, axis=0) + offsets)
+
+        for i, (x, y) in enumerate(positions.tolist()):
+            tag = self.planet_tag(i)
+            yield tag, {
+                "info": {
+                    "tag": tag,
+                    "name": f"Planet {i // per_cluster}-{i % per_cluster + 1}",
+                    "location_type": "planet",
+                    "description": f"Planet of cluster {i // per_cluster}.",
+                },
+                "location": {"coordinates": [x, y], "location_parent_tag": None},
+                "functions": {"services": [], "security_level": "low"},
+                "flags": {"is_hidden": False},
+            }
+
+
+    def iter_stations(self) -> Iterator[tuple[str, dict]]:
+        """
+        Station entries, generated chunk_size at a time
+
+        :return: iterator of (tag, entry)
+        """
+        s = self.settings
+        rng = self._rng
+        station_types, factions = s['station_types'], s['factions']
+        services, security_levels = np.array(s['services']), s['security_levels']
+        prefixes, suffixes = s['name_prefixes'], s['name_suffixes']
+        digits = len(str(self.station_count))
+
+        for start in range(0, self.station_count, s['chunk_size']):
+            n = min(s['chunk_size'], self.station_count - start)
+
+            # cluster membership (-1 = background) and positions
+            clusters = rng.choice(self.cluster_count, n, p=self.cluster_weights)
+            clusters[rng.random(n) < s['background_fraction']] = -1
+            background = clusters < 0
+            positions = self.cluster_centers[clusters] + rng.normal(0.0, s['cluster_spread'], (n, 2))
+            positions[background, 0] = rng.uniform(*self.bounds['x'], background.sum())
+            positions[background, 1] = rng.uniform(*self.bounds['y'], background.sum())
+            positions = self._clip(positions).tolist()
+            planets = clusters * s['planets_per_cluster'] + rng.integers(0, s['planets_per_cluster'], n)
+
+            types = rng.integers(0, len(station_types), n).tolist()
+            station_factions = rng.integers(0, len(factions), n).tolist()
+            levels = rng.integers(1, 11, n).tolist()
+            security = rng.integers(0, len(security_levels), n).tolist()
+            hidden = (rng.random(n) < 0.02).tolist()
+            name_parts = rng.integers(0, (len(prefixes), len(suffixes)), (n, 2)).tolist()
+            offered = rng.random((n, len(services))) < 0.4
+            offered[:, 0] = True        # every station offers the first service (docking)
+
+            for i in range(n):
+                index = start + i
+                tag = f"station_{index + 1:0{digits}d}"
+                prefix, suffix = name_parts[i]
+                station_type = station_types[types[i]]
+                yield tag, {
+                    "info": {
+                        "tag": tag,
+                        "name": f"{prefixes[prefix]} {suffixes[suffix]} {index + 1}",
+                        "location_type": "station",
+                        "station_type": station_type,
+                        "description": f"Generated {station_type} station.",
+                        "faction": factions[station_factions[i]],
+                        "level_requirement": levels[i],
+                    },
+                    "location": {
+                        "coordinates": positions[i],
+                        "location_parent_tag": None if background[i] else self.planet_tag(int(planets[i])),
+                    },
+                    "functions": {
+                        "services": services[offered[i]].tolist(),
+                        "security_level": security_levels[security[i]],
+                    },
+                    "flags": {"is_hidden": hidden[i]},
+                }
+
+
+    def spawn_table(self) -> dict:
+        """
+        Ship spawn table sized to the station count, split by ship_weights (rounding remainder goes to
+        the first ship types)
+
+        :return: {ship_name: count}
+        """
+        weights = self.settings['ship_weights']
+        total_weight = sum(weights.values())
+        ship_count = round(self.station_count * self.settings['ships_per_station'])
+        names = list(weights)
+        table = {name: (weights[name] * ship_count) // total_weight for name in names}
+        for i in range(ship_count - sum(table.values())):
+            table[names[i % len(names)]] += 1
+        return table
+
+
+    def write(self, path: str) -> dict:
+        """
+        Stream the catalogue to path (one entry per line), replacing the file only once it is complete
+
+        :param path: output json file
+        :return: summary {'stations', 'planets', 'clusters', 'ships', 'bytes'}
+        """
+        temp_path = f"{path}.tmp"
+        chunk_size = self.settings['chunk_size']
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write('{\n"debug": {},\n"game": {\n')
+            first = True
+            lines = []
+            for iterator in (self.iter_planets(), self.iter_stations()):
+                for tag, entry in iterator:
+                    lines.append(f"{json.dumps(tag)}: {json.dumps(entry, separators=(',', ':'))}")
+                    if len(lines) == chunk_size:
+                        file.write(("" if first else ",\n") + ",\n".join(lines))
+                        first = False
+                        lines.clear()
+            if lines:
+                file.write(("" if first else ",\n") + ",\n".join(lines))
+
+            spawn_table = self.spawn_table()
+            file.write('\n},\n')
+            file.write(f'"ship_spawn_table": {json.dumps(spawn_table)},\n')
+            file.write(f'"ship_spawn_range": {json.dumps(self.bounds)}\n}}\n')
+        os.replace(temp_path, path)
+
+        return {
+            'stations': self.station_count,
+            'planets': self.planet_count,
+            'clusters': self.cluster_count,
+            'ships': sum(spawn_table.values()),
+            'bytes': os.path.getsize(path),
+        }
@@ -4,50 +4,69 @@ Combat calculations developed with the following tools:
 - desmos.com:
     - weapons range: https://www.desmos.com/calculator/ekuw0p42lk
 
+Per sensor s with range R_s (Mm) and accuracy a_s against a target at distance d (Mm) with signature
+sig_s the perfect firing solution range is (R_s / d) ** a_s * sig_s. Sensors combine multiplicatively,
+a sensor the shooter does not carry is left out of the product.
+
+The batch API (get_firing_solution_matrix) scores every shooter against every target in one
+vectorized evaluation, the scalar methods score one ship against its current target.
 """
+import numpy as np
+
 from source.classes.ship.ship_class import Ship
 
 
 class Combat_Calculations:
+    # sensor type -> signature the sensor picks up on the target
+    SENSOR_SIGNATURES = {
+        'ir': 'heat',
+        'lidar': 'reflect',
+        'radar': 'radar',
+    }
+
     def __init__(self):
-        pass
+        self._template_rows: dict[tuple[int, str], tuple] = {}     # (template id, module) -> (template, values)
 
 
-    def get_ship_perfect_solution_range(self, ship_object: Ship) -> float:
+    def get_ship_perfect_solution_range(self, ship_object: Ship, target_range: float | None = None) -> float:
         """
         Calculates range at which the ship has a perfect firing solution
 
         :param ship_object: player Ship object
-        :param target_range: float indicating how far the target is in Mm
+        :param target_range: float indicating how far the target is in Mm, defaults to ship_object.target_range
         :return: float indicating perfect firing solution range in Mm
         """
+        sensors = [s for s in self.SENSOR_SIGNATURES if f'{s}_sensor' in ship_object.sensors]
+        if not sensors:
+            return 0.0
 
-        # sensor firing solution range individual
-        solution_range_ir = self.get_sensor_perfect_solution_range(ship_object, 'ir')
-        solution_range_lidar = self.get_sensor_perfect_solution_range(ship_object, 'lidar')
-        solution_range_radar = self.get_sensor_perfect_solution_range(ship_object, 'radar')
-
-        # 100% firing solution range
-        perfect_solution_range = solution_range_ir * solution_range_lidar * solution_range_radar
+        # 100% firing solution range: product of the individual sensor firing solution ranges
+        perfect_solution_range = 1.0
+        for signature_type in sensors:
+            perfect_solution_range *= self.get_sensor_perfect_solution_range(ship_object, signature_type, target_range)
 
         return perfect_solution_range
 
 
-    def get_sensor_perfect_solution_range(self, ship_object: Ship, signature_type: str) -> float:
+    def get_sensor_perfect_solution_range(self, ship_object: Ship, signature_type: str,
+                                          target_range: float | None = None) -> float:
         """
         Calculates range at which the ship has a perfect firing solution using only one type of sensor
 
         :param ship_object: player Ship object
         :param signature_type: what sensor is being used to get firing solution range? ('ir', 'lidar', 'radar')
-        :param target_range: float indicating how far the target is in Mm
+        :param target_range: float indicating how far the target is in Mm, defaults to ship_object.target_range
         :return: float indicating perfect firing solution range in Mm
         """
+        target_range = ship_object.target_range if target_range is None else target_range
+
         # setting up vars
         sensor_range: float = ship_object.sensors[f'{signature_type}_sensor']['range_Mm']
         sensor_acc: float = ship_object.sensors[f'{signature_type}_sensor']['accuracy']
+        target_signature: float = ship_object.target.signature[self.SENSOR_SIGNATURES[signature_type]]
 
         # 100% firing solution range for given sensor
-        perfect_solution_range: float = ((sensor_range/ship_object.target_range) ** sensor_acc) * ship_object.target.signature[{signature_type}]
+        perfect_solution_range: float = ((sensor_range/target_range) ** sensor_acc) * target_signature
 
         return perfect_solution_range
 
@@ -58,7 +77,6 @@ class Combat_Calculations:
 
         :param ship_object: player Ship object
         :param signature_type: what sensor is being used to get firing solution range? ('ir', 'lidar', 'radar')
-        :param target_range: float indicating how far the target is in Mm
         :return: float indicating how strong the firing solution is in percentage
         """
         perfect_solution_range = self.get_sensor_perfect_solution_range(ship_object, signature_type, ship_object.target_range)
@@ -81,3 +99,114 @@ class Combat_Calculations:
 
         return solution_percentage
 
+
+    # --- batch ---
+    def _module_row(self, ship: Ship, module: str, read) -> tuple:
+        """
+        Values read(ship) of one module, cached per ship template while the ship has not changed that
+        module (ships of one type share a template, so a fleet costs one read per ship type)
+        """
+        changes = ship._module_changes
+        if changes and module in changes:
+            return read(ship)
+        key = (id(ship.template), module)
+        row = self._template_rows.get(key)
+        if row is None or row[0] is not ship.template:
+            row = self._template_rows[key] = (ship.template, read(ship))
+        return row[1]
+
+
+    def _read_sensors(self, ship: Ship) -> tuple:
+        values = []
+        for signature_type in self.SENSOR_SIGNATURES:
+            sensor = ship.sensors.get(f'{signature_type}_sensor')
+            values.append((sensor['range_Mm'], sensor['accuracy']) if sensor is not None else (0.0, 0.0))
+        return tuple(values)
+
+
+    def _read_signature(self, ship: Ship) -> tuple:
+        return tuple(ship.signature.get(key, 0.0) for key in self.SENSOR_SIGNATURES.values())
+
+
+    def get_sensor_arrays(self, ships: list[Ship]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sensor ranges and accuracies of ships as (n, sensor types) arrays, in SENSOR_SIGNATURES order.
+        Sensors a ship does not carry get range 0 and accuracy 0
+
+        :param ships: shooters
+        :return: ranges (Mm), accuracies
+        """
+        sensors = np.array([self._module_row(ship, 'sensors', self._read_sensors) for ship in ships],
+                           dtype=np.float64).reshape(len(ships), len(self.SENSOR_SIGNATURES), 2)
+        return sensors[:, :, 0], sensors[:, :, 1]
+
+
+    def get_signature_array(self, ships: list[Ship]) -> np.ndarray:
+        """
+        Signatures of ships as seen by each sensor type, (n, sensor types) in SENSOR_SIGNATURES order
+
+        :param ships: targets
+        :return: signature array
+        """
+        return np.array([self._module_row(ship, 'signature', self._read_signature) for ship in ships],
+                        dtype=np.float64).reshape(len(ships), len(self.SENSOR_SIGNATURES))
+
+
+    @staticmethod
+    def get_distance_matrix_Mm(shooters: list[Ship], targets: list[Ship]) -> np.ndarray:
+        """
+        Distance of every shooter to every target
+
+        :param shooters:
+        :param targets:
+        :return: (shooters, targets) distances in Mm
+        """
+        # ships sharing one fleet are gathered straight from its position column
+        fleet = shooters[0].fleet if shooters else None
+        if fleet is not None and all(s.fleet is fleet for s in shooters) and all(t.fleet is fleet for t in targets):
+            a = fleet.positions[[s.row for s in shooters]]
+            b = fleet.positions[[t.row for t in targets]]
+        else:
+            a = np.array([s.coordinates for s in shooters], dtype=np.float64).reshape(-1, 2)
+            b = np.array([t.coordinates for t in targets], dtype=np.float64).reshape(-1, 2)
+        delta = a[:, None, :] - b[None, :, :]
+        return np.sqrt(np.einsum('ijk,ijk->ij', delta, delta)) / 1000
+
+
+    def get_firing_solution_matrix(self, shooters: list[Ship], targets: list[Ship],
+                                   target_ranges: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Score every shooter against every target with all sensor types at once
+
+        :param shooters: ships looking for a firing solution
+        :param targets: candidate targets
+        :param target_ranges: optional (shooters, targets) distances in Mm, computed from positions if omitted
+        :return: perfect solution ranges (Mm) and solution percentages, both (shooters, targets); a shooter
+            without sensors, a target at distance 0 or a target with a zero (or missing) signature for one of
+            the shooter's sensors scores 0
+        """
+        ranges, accuracies = self.get_sensor_arrays(shooters)
+        signatures = self.get_signature_array(targets)
+        if target_ranges is None:
+            target_ranges = self.get_distance_matrix_Mm(shooters, targets)
+
+        carried = ranges > 0                                            # (n, s)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # log of prod_s (R_s / d) ** a_s * sig_s over the carried sensors, split into a shooter term,
+            # a shooter x target signature term (one matmul) and the distance term
+            log_ranges = np.where(carried, np.log(np.where(carried, ranges, 1.0)), 0.0)
+            shooter_term = (accuracies * log_ranges).sum(axis=1)                    # (n,)
+            exponents = np.where(carried, accuracies, 0.0).sum(axis=1)              # (n,)
+            # a zero (or missing) signature only matters to shooters carrying that sensor, where it zeroes the
+            # product: kept out of the log (0 * -inf is nan) and applied as a mask instead
+            carried_f = carried.astype(np.float64)
+            signature_term = carried_f @ np.log(np.where(signatures > 0, signatures, 1.0)).T      # (n, m)
+            unseen = (carried_f @ (signatures <= 0).T) > 0                                      # (n, m)
+            log_perfect = shooter_term[:, None] + signature_term - exponents[:, None] * np.log(target_ranges)
+            perfect_ranges = np.exp(log_perfect)
+            percentages = perfect_ranges / target_ranges
+
+        valid = carried.any(axis=1)[:, None] & (target_ranges > 0) & ~unseen
+        perfect_ranges = np.where(valid, perfect_ranges, 0.0)
+        percentages = np.where(valid, percentages, 0.0)
+        return perfect_ranges, percentages
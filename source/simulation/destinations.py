@@ -0,0 +1,109 @@
+"""
+Destination selection
+
+Picks where AI ships fly next from the locations around them instead of uniformly from the whole world, so
+traffic stays local. Locations are indexed in KD-trees: one over all locations and, built on first use, one
+per (faction, service) filter over just the matching stations. A filtered query therefore costs the same
+O(log n) as an unfiltered one, no matter how rare the matching stations are.
+
+A pick takes the nearest candidates (optionally only those within a radius) and samples one weighted by
+1 / (distance + offset) ** falloff. Sampling draws from the global random module, so snapshots that store
+its state replay the same picks.
+"""
+import random
+
+import numpy as np
+
+from data.config.gameplay_config_settings import DESTINATION_SETTINGS
+from engine.logic.kd_tree import KDTree
+from source.classes.location.station_class import Station
+
+
+class DestinationSelector:
+    def __init__(self, locations: list, settings: dict = DESTINATION_SETTINGS):
+        """
+        :param locations: Location objects to pick from
+        :param settings: DESTINATION_SETTINGS
+        """
+        self.locations = locations
+        self.leaf_size: int = settings['leaf_size']
+        self.candidates: int = settings['candidates']
+        self.radius: float | None = settings['radius']
+        self.distance_offset: float = settings['distance_offset']
+        self.distance_falloff: float = settings['distance_falloff']
+
+        self.positions = np.array([loc.coordinates for loc in locations], dtype=np.float64).reshape(-1, 2)
+        # (faction, service) -> (tree, location index of each tree item), (None, None) = all locations
+        self._trees: dict[tuple, tuple[KDTree, np.ndarray]] = {}
+        self._tree(None, None)
+
+
+    def _tree(self, faction: str | None, service: str | None) -> tuple[KDTree, np.ndarray]:
+        key = (faction, service)
+        entry = self._trees.get(key)
+        if entry is None:
+            if key == (None, None):
+                members = np.arange(len(self.locations), dtype=np.int64)
+            else:
+                members = np.array([
+                    i for i, loc in enumerate(self.locations)
+                    if isinstance(loc, Station)
+                    and (faction is None or loc.faction == faction)
+                    and (service is None or service in loc.station_services)
+                ], dtype=np.int64)
+            entry = self._trees[key] = (KDTree(self.positions[members], self.leaf_size), members)
+        return entry
+
+
+    def nearest(self, coordinates: tuple, k: int, faction: str | None = None,
+                service: str | None = None) -> tuple[list, np.ndarray]:
+        """
+        k locations closest to coordinates
+
+        :param coordinates: (x, y)
+        :param k: number of locations
+        :param faction: only stations of this faction
+        :param service: only stations offering this service
+        :return: locations nearest first, their distances
+        """
+        tree, members = self._tree(faction, service)
+        items, distances = tree.query_nearest(coordinates, k)
+        return [self.locations[i] for i in members[items].tolist()], distances
+
+
+    def within(self, coordinates: tuple, radius: float, faction: str | None = None,
+               service: str | None = None) -> list:
+        """
+        Locations within radius of coordinates
+
+        :param coordinates: (x, y)
+        :param radius: world units
+        :param faction: only stations of this faction
+        :param service: only stations offering this service
+        :return: locations in catalogue order
+        """
+        tree, members = self._tree(faction, service)
+        return [self.locations[i] for i in np.sort(members[tree.query_radius(coordinates, radius)]).tolist()]
+
+
+    def sample(self, coordinates: tuple, faction: str | None = None, service: str | None = None,
+               exclude=None):
+        """
+        Distance weighted pick among the nearest candidates
+
+        :param coordinates: (x, y) the ship is at
+        :param faction: only stations of this faction
+        :param service: only stations offering this service
+        :param exclude: location not to pick (e.g. the one the ship just left)
+        :return: Location or None if nothing matches
+        """
+        candidates, distances = self.nearest(coordinates, self.candidates + 1, faction, service)
+        keep = [i for i, loc in enumerate(candidates) if loc is not exclude][:self.candidates]
+        if self.radius is not None:
+            # closest candidate stays pickable when none is within the radius
+            keep = [i for i in keep if distances[i] <= self.radius] or keep[:1]
+        if not keep:
+            return None
+
+        weights = (distances[keep] + self.distance_offset) ** -self.distance_falloff
+        return candidates[random.choices(keep, weights.tolist())[0]]
@@ -0,0 +1,204 @@
+"""
+Sensor detection
+
+Decides which contacts an observer's sensors pick up. Per sensor s with range R_s (Mm) and accuracy a_s,
+a contact with signature sig_s (as seen by that sensor, see Combat_Calculations.SENSOR_SIGNATURES) is
+
+    detected    while distance <= R_s * sig_s / reference_signature
+    identified  while distance <= a_s * R_s * sig_s / reference_signature
+
+for at least one carried sensor. Identified armed contacts are threats.
+
+Candidates come from the world's vessel spatial index (broad-phase, a circle sized by the observer's
+best sensor against the strongest possible signature), so a pass costs O(nearby contacts) and not
+O(world size). The player's contacts form the fog-of-war contact list the radar draws from.
+"""
+import numpy as np
+
+from data.config.gameplay_config_settings import DETECTION_SETTINGS
+from source.classes.ship.ship_class import Ship
+from source.simulation.combat_calculations import Combat_Calculations
+
+
+class ContactList:
+    """Contacts of one observer, parallel arrays sorted by index."""
+
+    def __init__(self, indices: np.ndarray, rows: np.ndarray, distances: np.ndarray, identified: np.ndarray,
+                 threat: np.ndarray):
+        """
+        :param indices: index of each contact into the world's vessel list
+        :param rows: fleet row of each contact
+        :param distances: distance to the observer in Mm
+        :param identified: contact is identified (not just a blip)
+        :param threat: contact is identified and armed
+        """
+        self.indices = indices
+        self.rows = rows
+        self.distances = distances
+        self.identified = identified
+        self.threat = threat
+
+
+    @classmethod
+    def empty(cls) -> "ContactList":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0),
+                   np.empty(0, dtype=bool), np.empty(0, dtype=bool))
+
+
+    def __len__(self):
+        return len(self.indices)
+
+
+    def find(self, row: int) -> int | None:
+        """
+        Position of the contact with the given fleet row
+
+        :param row: fleet row of a vessel
+        :return: contact position or None if the vessel is not a contact
+        """
+        hits = np.flatnonzero(self.rows == row)
+        return int(hits[0]) if hits.size else None
+
+
+class DetectionSystem:
+    def __init__(self, settings: dict = DETECTION_SETTINGS):
+        self.enabled: bool = settings['enabled']
+        self.interval: float = settings['interval']
+        self.reference_signature: float = settings['reference_signature']
+        self.max_signature: float = settings['max_signature']
+        self.max_range_Mm: float = settings['max_range_Mm']
+
+        self.combat = Combat_Calculations()     # sensor / signature arrays, cached per ship template
+        self._armed: dict[int, tuple] = {}     # template id -> (template, armed)
+        self._next_pass: float = -np.inf
+
+
+    def _is_armed(self, ship: Ship) -> bool:
+        """ship carries at least one weapon usable for attack"""
+        changes = ship._module_changes
+        if not changes or 'weapons' not in changes:
+            cached = self._armed.get(id(ship.template))
+            if cached is not None and cached[0] is ship.template:
+                return cached[1]
+        armed = any('attack' in weapon.get('type', ()) for weapon in ship.weapons.values())
+        if not changes or 'weapons' not in changes:
+            self._armed[id(ship.template)] = (ship.template, armed)
+        return armed
+
+
+    def query_radius(self, observer: Ship) -> float:
+        """
+        Broad-phase reach of an observer: its best sensor against the strongest possible signature
+
+        :param observer: ship whose sensors are used
+        :return: radius in world units, 0 without sensors
+        """
+        ranges, _ = self.combat.get_sensor_arrays([observer])
+        return min(ranges.max(initial=0.0) * self.max_signature / self.reference_signature, self.max_range_Mm) * 1000
+
+
+    def detect(self, observer: Ship, vessel_index, vessels: list, vessel_rows: np.ndarray,
+               visible: np.ndarray) -> ContactList:
+        """
+        Contacts of one observer
+
+        :param observer: ship whose sensors are used
+        :param vessel_index: SpatialGrid over vessels (item i = vessels[i])
+        :param vessels: vessel objects of the index
+        :param vessel_rows: fleet row of each vessel
+        :param visible: fleet visible column (docked vessels are not detectable)
+        :return: ContactList
+        """
+        ranges, accuracies = self.combat.get_sensor_arrays([observer])
+        ranges, accuracies = ranges[0], accuracies[0]
+        carried = ranges > 0
+        if not carried.any():
+            return ContactList.empty()
+
+        # --- broad-phase: best sensor against the strongest possible signature ---
+        scale = 1.0 / self.reference_signature
+        center = observer.coordinates
+        candidates = vessel_index.query_radius(center, self.query_radius(observer))
+        candidates = candidates[(vessel_rows[candidates] != observer.row) & visible[vessel_rows[candidates]]]
+        if not len(candidates):
+            return ContactList.empty()
+
+        # --- narrow-phase: per sensor detection and identification ranges ---
+        delta = vessel_index.positions[candidates] - center
+        distances = np.sqrt(np.einsum('ij,ij->i', delta, delta)) / 1000                   # (m,) Mm
+        contacts = [vessels[i] for i in candidates.tolist()]
+        detection_ranges = ranges * scale * self.combat.get_signature_array(contacts)      # (m, s)
+        in_range = carried & (distances[:, None] <= detection_ranges)
+        detected = in_range.any(axis=1)
+        identified = (in_range & (distances[:, None] <= detection_ranges * accuracies)).any(axis=1)
+
+        keep = np.flatnonzero(detected)
+        identified = identified[keep]
+        threat = np.array([identified[k] and self._is_armed(contacts[i]) for k, i in enumerate(keep.tolist())],
+                          dtype=bool)
+        return ContactList(candidates[keep], vessel_rows[candidates[keep]], distances[keep], identified, threat)
+
+
+    def update(self, world) -> bool:
+        """
+        Refresh the player's contact list (at most every interval) and the player's target flags. While
+        detection is disabled the flags follow radar visibility instead (see update_visible_target_flags)
+
+        :param world: WorldManager, reads player, vessels, vessel_index, vessel_rows and fleet, writes
+            world.player_contacts
+        :return: True if a detection pass ran
+        """
+        if not self.enabled:
+            self.update_visible_target_flags(world.player)
+            return False
+        if world.clock.now < self._next_pass:
+            return False
+        self._next_pass = world.clock.now + self.interval
+
+        world.player_contacts = self.detect(world.player, world.vessel_index, world.vessels, world.vessel_rows,
+                                            world.fleet.visible)
+        self.update_target_flags(world.player, world.player_contacts)
+        return True
+
+
+    @staticmethod
+    def update_target_flags(player, contacts: ContactList) -> None:
+        """
+        Set player.target_is_unknown / target_is_threat from the contact list. A vessel target that is not
+        an identified contact is unknown, locations are unknown while hidden and never threats
+
+        :param player: Player
+        :param contacts: player contact list
+        :return:
+        """
+        target = player.target
+        if target is None:
+            player.target_is_unknown = False
+            player.target_is_threat = False
+        elif isinstance(target, Ship):
+            i = contacts.find(target.row)
+            player.target_is_unknown = i is None or not contacts.identified[i]
+            player.target_is_threat = i is not None and bool(contacts.threat[i])
+        else:
+            player.target_is_unknown = bool(getattr(target, 'is_hidden', False))
+            player.target_is_threat = False
+
+
+    def update_visible_target_flags(self, player) -> None:
+        """
+        Set player.target_is_unknown / target_is_threat without sensors: every vessel shown on the radar
+        counts as identified (docked ones are unknown), locations are unknown while hidden and never threats
+
+        :param player: Player
+        :return:
+        """
+        target = player.target
+        if target is None:
+            player.target_is_unknown = False
+            player.target_is_threat = False
+        elif isinstance(target, Ship):
+            player.target_is_unknown = not target.visible_on_radar
+            player.target_is_threat = target.visible_on_radar and self._is_armed(target)
+        else:
+            player.target_is_unknown = bool(getattr(target, 'is_hidden', False))
+            player.target_is_threat = False
@@ -0,0 +1,294 @@
+"""
+Fleet state container
+
+Struct-of-arrays storage for the flight state of every vessel in the world. Each vessel owns one
+row; Vessel (and its subclasses) read and write coordinates, velocity, speed and destination
+through that row instead of keeping their own tuples and arrays.
+
+update_flight() advances every active row in a single vectorized pass, so the per-frame cost of
+moving ships no longer grows with Python overhead per vessel.
+"""
+import numpy as np
+
+from source.simulation.sim_clock import SimulationClock
+
+
+class FleetState:
+    """
+    Contiguous NumPy columns holding the flight state of a fleet of vessels.
+
+    Columns (row = vessel):
+        positions       (n, 2) world position (x, y)
+        velocities      (n, 2) velocity vector
+        speeds          (n,)   current speed (km/s)
+        destinations    (n, 2) destination coordinates, only valid where has_destination is set
+        has_destination (n,)   row is flying towards a destination
+        accelerations   (n,)   km/s^2
+        decelerations   (n,)   km/s^2
+        max_speeds      (n,)   km/s
+        orientations    (n,)   heading in radians
+        active          (n,)   row is advanced by update_flight()
+        visible         (n,)   row shows up on radar
+        lod_intervals   (n,)   level of detail: row is advanced every lod_intervals ticks (see LevelOfDetail)
+        lod_phases      (n,)   tick offset spreading coarse rows over the interval
+        lod_elapsed     (n,)   simulation time accumulated since the row was last advanced
+
+    Trails are stored per row in a fixed-capacity ring buffer:
+        trail_points    (n, k, 2) float32 trail dot positions
+        trail_times     (n, k)    simulation time each dot was dropped, -inf for empty slots
+        trail_heads     (n,)      next slot to write (oldest dot once the ring is full)
+    New dots overwrite the oldest slot and expiry is a timestamp comparison, nothing is ever popped.
+    """
+
+    ARRIVAL_THRESHOLD = 1.0     # snap to destination below this distance
+
+    # column name -> (trailing shape, dtype)
+    COLUMNS = {
+        'positions': ((2,), np.float64),
+        'velocities': ((2,), np.float64),
+        'speeds': ((), np.float64),
+        'destinations': ((2,), np.float64),
+        'has_destination': ((), np.bool_),
+        'accelerations': ((), np.float64),
+        'decelerations': ((), np.float64),
+        'max_speeds': ((), np.float64),
+        'orientations': ((), np.float64),
+        'active': ((), np.bool_),
+        'visible': ((), np.bool_),
+        'lod_intervals': ((), np.int32),
+        'lod_phases': ((), np.int32),
+        'lod_elapsed': ((), np.float64),
+        'last_trail_positions': ((2,), np.float64),
+        'has_last_trail': ((), np.bool_),
+    }
+
+    def __init__(self, capacity: int = 64, clock: SimulationClock | None = None, trail_capacity: int = 50):
+        self.clock: SimulationClock = clock if clock is not None else SimulationClock()
+        self.count: int = 0
+        self.capacity: int = max(1, int(capacity))
+        self.owners: list = []      # row -> vessel object
+
+        # trail settings (shared by the whole fleet)
+        self.trail_capacity: int = trail_capacity   # max dots per vessel (ring size)
+        self.trail_spacing: float = 100.0           # min distance between trail dots
+        self.trail_lifetime: float = 3.0            # seconds
+        self.trail_speed_threshold: float = 1.0     # don't emit below this speed
+
+        for name, (shape, dtype) in self._columns().items():
+            setattr(self, name, np.zeros((self.capacity, *shape), dtype=dtype))
+        self.trail_times.fill(-np.inf)
+
+
+    def __len__(self):
+        return self.count
+
+
+    def _columns(self) -> dict:
+        """Column layout including the per-row trail ring buffers."""
+        return {
+            **self.COLUMNS,
+            'trail_points': ((self.trail_capacity, 2), np.float32),
+            'trail_times': ((self.trail_capacity,), np.float64),
+            'trail_heads': ((), np.int32),
+        }
+
+
+    def add(self, owner, coordinates, active: bool = True) -> int:
+        """
+        Allocate a row for a vessel
+
+        :param owner: vessel object owning the row
+        :param coordinates: starting world position (x, y)
+        :param active: whether update_flight() should advance the row
+        :return: row index
+        """
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+
+        row = self.count
+        self.count += 1
+        self.owners.append(owner)
+
+        self.positions[row] = coordinates
+        self.active[row] = active
+        self.visible[row] = True
+        self.lod_intervals[row] = 1
+        return row
+
+
+    def remove(self, row: int):
+        """
+        Free a row by moving the last row into it (swap-remove), keeps rows contiguous
+
+        :param row: row to free
+        :return: owner that now lives in row, or None when the removed row was the last one
+        """
+        last = self.count - 1
+        moved = None
+        if row != last:
+            for name in self._columns():
+                column = getattr(self, name)
+                column[row] = column[last]
+            moved = self.owners[last]
+            self.owners[row] = moved
+
+        self.owners.pop()
+        self.trail_times[last] = -np.inf
+        self.trail_heads[last] = 0
+        self.count = last
+        return moved
+
+
+    def export_rows(self, rows: np.ndarray, names: tuple | None = None) -> dict:
+        """
+        Copy the given rows out of the fleet
+
+        :param rows: index array of rows
+        :param names: column names to export, defaults to every column
+        :return: column name -> array of the rows' values
+        """
+        names = names if names is not None else tuple(self._columns())
+        return {name: getattr(self, name)[rows] for name in names}
+
+
+    def import_rows(self, rows: np.ndarray, columns: dict) -> None:
+        """
+        Overwrite the given rows with exported column values
+
+        :param rows: index array of rows, same order as the exported data
+        :param columns: column name -> values, as returned by export_rows()
+        :return:
+        """
+        for name, values in columns.items():
+            getattr(self, name)[rows] = values
+
+
+    def _grow(self, new_capacity: int) -> None:
+        """
+        Reallocate every column with a larger capacity, keeping existing rows
+
+        :param new_capacity:
+        :return:
+        """
+        for name, (shape, dtype) in self._columns().items():
+            old = getattr(self, name)
+            new = np.zeros((new_capacity, *shape), dtype=dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.trail_times[self.count:] = -np.inf
+        self.capacity = new_capacity
+
+
+    def update_flight(self, dt: float | np.ndarray, rows: np.ndarray | None = None) -> None:
+        """
+        Advance flight state of all active rows (or the given rows) by dt seconds
+
+        Rows with a destination accelerate towards it until their stopping distance is reached and
+        then decelerate; rows without a destination coast to a stop along their last heading.
+        A step never carries a row past its destination, so coarse (large dt) steps stay stable.
+
+        :param dt: timestep in seconds, either one value for all rows or one value per row in rows
+        :param rows: optional index array of rows to advance, defaults to every active row
+        :return:
+        """
+        if rows is None:
+            rows = np.flatnonzero(self.active[:self.count])
+        if rows.size == 0:
+            return
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), rows.shape)
+
+        has_dest = self.has_destination[rows]
+
+        # --- coasting: decelerate to stop along current vector ---
+        coast_mask = ~has_dest & (self.speeds[rows] > 0)
+        if coast_mask.any():
+            coast, coast_dt = rows[coast_mask], dt[coast_mask]
+            speed = np.maximum(self.speeds[coast] - self.decelerations[coast] * coast_dt, 0.0)
+            self.speeds[coast] = speed
+            heading = self.velocities[coast]
+            heading = heading / (np.linalg.norm(heading, axis=1) + 1e-6)[:, None]
+            self.positions[coast] += heading * (speed * coast_dt)[:, None]
+
+        steer, dt = rows[has_dest], dt[has_dest]
+        if steer.size == 0:
+            return
+
+        offset = self.destinations[steer] - self.positions[steer]
+        distance = np.linalg.norm(offset, axis=1)
+
+        # --- arrival: snap to destination and stop ---
+        arrived_mask = distance < self.ARRIVAL_THRESHOLD
+        if arrived_mask.any():
+            arrived = steer[arrived_mask]
+            self.positions[arrived] = self.destinations[arrived]
+            self.has_destination[arrived] = False
+            self.speeds[arrived] = 0.0
+            self.velocities[arrived] = 0.0
+
+            keep = ~arrived_mask
+            steer, dt, offset, distance = steer[keep], dt[keep], offset[keep], distance[keep]
+            if steer.size == 0:
+                return
+
+        direction = offset / distance[:, None]
+
+        # --- accelerate or decelerate depending on stopping distance ---
+        speed = self.speeds[steer]
+        deceleration = self.decelerations[steer]
+        stopping_distance = speed ** 2 / (2 * deceleration)
+        speed = np.where(
+            distance > stopping_distance,
+            np.minimum(speed + self.accelerations[steer] * dt, self.max_speeds[steer]),
+            np.maximum(speed - deceleration * dt, 0.0),
+        )
+        self.speeds[steer] = speed
+
+        velocity = direction * speed[:, None]
+        self.velocities[steer] = velocity
+        self.positions[steer] += direction * np.minimum(speed * dt, distance)[:, None]
+        self.orientations[steer] = np.arctan2(direction[:, 1], direction[:, 0])
+
+        self._emit_trails(steer, speed)
+
+
+    def _emit_trails(self, rows: np.ndarray, speed: np.ndarray) -> None:
+        """
+        Drop trail points for moving rows that travelled at least trail_spacing since their last point
+
+        :param rows: rows that moved towards a destination this step
+        :param speed: their speed after the step
+        :return:
+        """
+        rows = rows[speed > self.trail_speed_threshold]
+        if rows.size == 0:
+            return
+
+        first = rows[~self.has_last_trail[rows]]
+        self.last_trail_positions[first] = self.positions[first]
+        self.has_last_trail[first] = True
+
+        delta = self.positions[rows] - self.last_trail_positions[rows]
+        due = rows[np.einsum('ij,ij->i', delta, delta) >= self.trail_spacing * self.trail_spacing]
+        if due.size == 0:
+            return
+
+        self.last_trail_positions[due] = self.positions[due]
+
+        # write into each ring at its head, overwriting the oldest dot once full
+        slots = self.trail_heads[due]
+        self.trail_points[due, slots] = self.positions[due]
+        self.trail_times[due, slots] = self.clock.now
+        self.trail_heads[due] = (slots + 1) % self.trail_capacity
+
+
+    def get_trail_points(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the live (not yet expired) trail dots of the given rows in one pass
+
+        :param rows: index array of fleet rows
+        :return: (m, 2) float32 dot positions and (m,) fade factors in (0, 1], 1 = just dropped
+        """
+        ages = self.clock.now - self.trail_times[rows]
+        fades = 1.0 - ages / self.trail_lifetime
+        live = fades > 0        # empty slots have age inf and never pass
+        return self.trail_points[rows][live], fades[live]
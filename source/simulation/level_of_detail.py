@@ -0,0 +1,75 @@
+"""
+Level of detail for vessel simulation
+
+Vessels are sorted into distance tiers around the player. Near vessels are advanced every tick, vessels
+further out only every n-th tick with the accumulated dt, which keeps the visible neighbourhood accurate
+while a much larger universe is simulated coarsely. Tier state lives in the FleetState lod_* columns.
+"""
+import numpy as np
+
+from data.config.gameplay_config_settings import LOD_SETTINGS
+from source.simulation.fleet_state import FleetState
+
+
+class LevelOfDetail:
+    def __init__(self, settings: dict = LOD_SETTINGS):
+        self.enabled: bool = settings['enabled']
+        self.reassign_interval: float = settings['reassign_interval']
+
+        tiers = settings['tiers']
+        self.max_distances = np.array(
+            [np.inf if t['max_distance'] is None else t['max_distance'] for t in tiers], dtype=np.float64
+        )
+        self.update_intervals = np.array([t['update_interval'] for t in tiers], dtype=np.int32)
+
+        self._next_reassign: float = -np.inf
+        self.tier_counts = np.zeros(len(tiers), dtype=np.int64)     # vessels per tier after last pass
+
+
+    def assign_tiers(self, fleet: FleetState, rows: np.ndarray, center: tuple, now: float) -> None:
+        """
+        Promote/demote rows between tiers by their distance to center. Runs at most every reassign_interval
+
+        :param fleet: fleet holding the rows
+        :param rows: rows subject to level of detail (NPC vessels, never the player)
+        :param center: player world position
+        :param now: current simulation time
+        :return:
+        """
+        if now < self._next_reassign:
+            return
+        self._next_reassign = now + self.reassign_interval
+
+        distance = np.linalg.norm(fleet.positions[rows] - center, axis=1)
+        tiers = np.minimum(np.searchsorted(self.max_distances, distance, side='left'), len(self.max_distances) - 1)
+        intervals = self.update_intervals[tiers]
+
+        # re-phase only rows whose tier changed, spreading them over their new interval
+        changed = intervals != fleet.lod_intervals[rows]
+        moved = rows[changed]
+        fleet.lod_intervals[moved] = intervals[changed]
+        fleet.lod_phases[moved] = moved % intervals[changed]
+
+        self.tier_counts = np.bincount(tiers, minlength=len(self.max_distances))
+
+
+    def due_rows(self, fleet: FleetState, dt: float, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Accumulate dt on every active row and pick the rows due this tick
+
+        :param fleet: fleet to advance
+        :param dt: simulation tick length
+        :param tick: tick counter
+        :return: rows due this tick and the accumulated dt of each
+        """
+        count = fleet.count
+        active = fleet.active[:count]
+        elapsed = fleet.lod_elapsed[:count]
+        elapsed[active] += dt
+        elapsed[~active] = 0.0      # a row starting to move must not inherit time from an earlier trip
+
+        rows = np.flatnonzero(active)
+        rows = rows[(tick + fleet.lod_phases[rows]) % fleet.lod_intervals[rows] == 0]
+        row_dt = elapsed[rows].copy()
+        elapsed[rows] = 0.0
+        return rows, row_dt
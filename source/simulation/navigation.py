@@ -0,0 +1,287 @@
+"""
+Navigation graph
+
+Route network over the world's locations: every location is linked to its k nearest neighbours
+(optionally only within max_edge_range), edges are symmetric and weighted by distance. The graph is
+stored as CSR arrays (indptr / neighbors / weights).
+
+Shortest paths are found with A* (straight line distance is an exact lower bound) and kept in one
+LRU path cache shared by everything that plans routes (AI itineraries, player autopilot). Paths are
+cached undirected, a cached A->B path also answers B->A. The cache is only cleared when the graph
+itself changes (add_edge / remove_edge / rebuild).
+
+The graph and its path cache can be saved next to the compiled data files and are reloaded as long as
+the location positions and graph settings are unchanged.
+"""
+import hashlib
+import heapq
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from data.config.gameplay_config_settings import NAVIGATION_SETTINGS
+from engine.logic.spatial_grid import SpatialGrid
+
+
+class NavigationGraph:
+    def __init__(self, locations: list, settings: dict = NAVIGATION_SETTINGS, build: bool = True):
+        """
+        :param locations: Location objects, node i = locations[i]
+        :param settings: NAVIGATION_SETTINGS
+        :param build: build the edges right away (False when they are loaded from a file)
+        """
+        self.locations = locations
+        self.settings = settings
+        self.neighbor_count: int = settings['neighbors']
+        self.max_edge_range: float | None = settings['max_edge_range']
+        self.cache_size: int = settings['path_cache_size']
+
+        self.positions = np.array([loc.coordinates for loc in locations], dtype=np.float64).reshape(-1, 2)
+        self.node_of: dict[int, int] = {id(loc): i for i, loc in enumerate(locations)}
+
+        self.indptr = np.zeros(len(locations) + 1, dtype=np.int64)
+        self.neighbors = np.empty(0, dtype=np.int64)
+        self.weights = np.empty(0, dtype=np.float64)
+
+        self.version: int = 0               # bumped on every graph change
+        self._paths: OrderedDict[tuple[int, int], tuple | None] = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+        if build:
+            self.rebuild()
+
+
+    def __len__(self):
+        return len(self.positions)
+
+
+    @property
+    def key(self) -> str:
+        """Hash of node positions and graph settings, a saved graph is only reused for the same key."""
+        digest = hashlib.sha1(np.ascontiguousarray(self.positions).tobytes())
+        digest.update(repr((self.neighbor_count, self.max_edge_range)).encode())
+        return digest.hexdigest()
+
+
+    # -------------------------
+    # graph construction / changes
+    # -------------------------
+    def rebuild(self) -> None:
+        """
+        Link every node to its k nearest neighbours (within max_edge_range if set), symmetric
+
+        :return:
+        """
+        n = len(self.positions)
+        k = self.neighbor_count
+        sources, targets = [], []
+        if n > 1 and k > 0:
+            # grid cell size ~ the typical neighbour distance, so most queries touch a handful of cells
+            span = np.ptp(self.positions, axis=0).max() or 1.0
+            cell = self.max_edge_range or span * math.sqrt((k + 1) / n)
+            grid = SpatialGrid(cell)
+            grid.build(self.positions)
+
+            for i, center in enumerate(self.positions.tolist()):
+                radius = self.max_edge_range or cell
+                # grow the query until k neighbours are found (or the range limit / whole map is reached)
+                while True:
+                    found = grid.query_radius(center, radius)
+                    if len(found) > k or self.max_edge_range or radius > span * 2:
+                        break
+                    radius *= 2
+                found = found[found != i]
+                if len(found) > k:
+                    delta = self.positions[found] - center
+                    found = found[np.argpartition(np.einsum('ij,ij->i', delta, delta), k - 1)[:k]]
+                sources.append(np.full(len(found), i, dtype=np.int64))
+                targets.append(found)
+
+        if sources:
+            a, b = np.concatenate(sources), np.concatenate(targets)
+            edges = np.unique(np.concatenate((np.column_stack((a, b)), np.column_stack((b, a)))), axis=0)
+        else:
+            edges = np.empty((0, 2), dtype=np.int64)
+        self._set_edges(edges)
+
+
+    def _set_edges(self, edges: np.ndarray) -> None:
+        """Store sorted unique (source, target) pairs as CSR arrays and invalidate cached paths."""
+        edges = edges.reshape(-1, 2)
+        self.indptr = np.zeros(len(self.positions) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges[:, 0], minlength=len(self.positions)), out=self.indptr[1:])
+        self.neighbors = edges[:, 1].copy()
+        self.weights = np.linalg.norm(self.positions[edges[:, 1]] - self.positions[edges[:, 0]], axis=1)
+        self._invalidate()
+
+
+    def _edges(self) -> np.ndarray:
+        sources = np.repeat(np.arange(len(self.positions)), np.diff(self.indptr))
+        return np.column_stack((sources, self.neighbors))
+
+
+    def add_edge(self, a: int, b: int) -> None:
+        """
+        Link two nodes in both directions
+
+        :param a: node index
+        :param b: node index
+        :return:
+        """
+        edges = np.concatenate((self._edges(), [[a, b], [b, a]]))
+        self._set_edges(np.unique(edges, axis=0))
+
+
+    def remove_edge(self, a: int, b: int) -> None:
+        """
+        Unlink two nodes in both directions
+
+        :param a: node index
+        :param b: node index
+        :return:
+        """
+        edges = self._edges()
+        keep = ~(((edges[:, 0] == a) & (edges[:, 1] == b)) | ((edges[:, 0] == b) & (edges[:, 1] == a)))
+        self._set_edges(edges[keep])
+
+
+    def _invalidate(self) -> None:
+        self.version += 1
+        self._paths.clear()
+
+
+    # -------------------------
+    # queries
+    # -------------------------
+    def shortest_path(self, start: int, goal: int) -> tuple | None:
+        """
+        Shortest node path from start to goal (both included), served from the shared path cache
+
+        :param start: node index
+        :param goal: node index
+        :return: tuple of node indices or None if goal cannot be reached
+        """
+        key = (start, goal) if start <= goal else (goal, start)
+        if key in self._paths:
+            self._paths.move_to_end(key)
+            self.stats['hits'] += 1
+            path = self._paths[key]
+        else:
+            self.stats['misses'] += 1
+            path = self._a_star(*key)
+            self._paths[key] = path
+            if len(self._paths) > self.cache_size:
+                self._paths.popitem(last=False)
+
+        if path is None or path[0] == start:
+            return path
+        return path[::-1]
+
+
+    def _a_star(self, start: int, goal: int) -> tuple | None:
+        if start == goal:
+            return (start,)
+        indptr, neighbors, weights = self.indptr, self.neighbors, self.weights
+        gx, gy = self.positions[goal].tolist()
+        xs, ys = self.positions[:, 0], self.positions[:, 1]
+
+        best = {start: 0.0}
+        came_from = {}
+        heap = [(math.hypot(xs[start] - gx, ys[start] - gy), 0.0, start)]
+        closed = set()
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            if node == goal:
+                path = [goal]
+                while path[-1] != start:
+                    path.append(came_from[path[-1]])
+                return tuple(path[::-1])
+            if node in closed:
+                continue
+            closed.add(node)
+            lo, hi = indptr[node], indptr[node + 1]
+            for nxt, w in zip(neighbors[lo:hi].tolist(), weights[lo:hi].tolist()):
+                new_cost = cost + w
+                if new_cost < best.get(nxt, math.inf):
+                    best[nxt] = new_cost
+                    came_from[nxt] = node
+                    heapq.heappush(heap, (new_cost + math.hypot(xs[nxt] - gx, ys[nxt] - gy), new_cost, nxt))
+        return None
+
+
+    def route(self, start, goal) -> list | None:
+        """
+        Route between two locations of this graph
+
+        :param start: Location the route starts at
+        :param goal: Location the route ends at
+        :return: list of Location hops from start to goal (both included), None if unreachable
+        """
+        path = self.shortest_path(self.node_of[id(start)], self.node_of[id(goal)])
+        return None if path is None else [self.locations[i] for i in path]
+
+
+    def nearest_node(self, coordinates: tuple) -> int:
+        """
+        Node closest to a world position
+
+        :param coordinates: (x, y)
+        :return: node index
+        """
+        delta = self.positions - coordinates
+        return int(np.argmin(np.einsum('ij,ij->i', delta, delta)))
+
+
+    # -------------------------
+    # persistence
+    # -------------------------
+    def save(self, path: str) -> None:
+        """
+        Write graph and path cache to a .npz file
+
+        :param path: output file
+        :return:
+        """
+        pairs = np.array(list(self._paths), dtype=np.int64).reshape(-1, 2)
+        paths = [p if p is not None else () for p in self._paths.values()]
+        offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in paths], out=offsets[1:])
+        nodes = np.fromiter((n for p in paths for n in p), dtype=np.int64, count=int(offsets[-1]))
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(temp_path, key=np.array(self.key), indptr=self.indptr, neighbors=self.neighbors,
+                 path_pairs=pairs, path_offsets=offsets, path_nodes=nodes)
+        os.replace(temp_path, path)
+
+
+    @classmethod
+    def load(cls, path: str, locations: list, settings: dict = NAVIGATION_SETTINGS) -> "NavigationGraph | None":
+        """
+        Load a graph saved by save() if it was built for the same locations and settings
+
+        :param path: .npz file
+        :param locations: Location objects of the world
+        :param settings: NAVIGATION_SETTINGS
+        :return: NavigationGraph or None if the file is missing or stale
+        """
+        if not os.path.exists(path):
+            return None
+        graph = cls(locations, settings, build=False)
+        try:
+            with np.load(path) as data:
+                if str(data['key']) != graph.key:
+                    return None
+                edges = np.column_stack((
+                    np.repeat(np.arange(len(locations)), np.diff(data['indptr'])), data['neighbors'],
+                ))
+                graph._set_edges(edges)
+                offsets, nodes = data['path_offsets'].tolist(), data['path_nodes']
+                for i, (a, b) in enumerate(data['path_pairs'].tolist()):
+                    path_nodes = tuple(nodes[offsets[i]:offsets[i + 1]].tolist())
+                    graph._paths[(a, b)] = path_nodes or None
+        except (OSError, KeyError, ValueError):
+            return None
+        return graph
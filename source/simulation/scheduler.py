@@ -0,0 +1,92 @@
+"""
+Wakeup scheduler
+
+World-level min-heap of (wakeup time, object) entries. Objects that only wait for a timer (idle or
+docked AI ships) register their next wakeup here and are touched again only when it fires, instead of
+being polled every frame.
+
+Rescheduling or cancelling an object does not search the heap: every object keeps one live entry
+sequence number and stale heap entries are skipped when they surface.
+"""
+import heapq
+import itertools
+
+
+class WakeupScheduler:
+    def __init__(self):
+        self._heap: list[tuple[float, int, object]] = []
+        self._live: dict[object, int] = {}      # object -> sequence number of its live entry
+        self._sequence = itertools.count()
+
+
+    def __len__(self):
+        """number of objects with a pending wakeup"""
+        return len(self._live)
+
+
+    def schedule(self, obj, when: float) -> None:
+        """
+        Register (or move) the wakeup of obj, replacing any earlier registration
+
+        :param obj: object to wake, must be hashable
+        :param when: simulation time of the wakeup
+        :return:
+        """
+        seq = next(self._sequence)
+        self._live[obj] = seq
+        heapq.heappush(self._heap, (when, seq, obj))
+
+
+    def cancel(self, obj) -> None:
+        """
+        Drop the pending wakeup of obj, if any
+
+        :param obj:
+        :return:
+        """
+        self._live.pop(obj, None)
+
+
+    def next_wakeup(self) -> float | None:
+        """
+        Time of the earliest live wakeup
+
+        :return: simulation time or None if nothing is scheduled
+        """
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+
+    def pending(self) -> list[tuple[float, object]]:
+        """
+        Live wakeups in time order (used by world snapshots)
+
+        :return: list of (when, obj)
+        """
+        return sorted(
+            ((when, obj) for when, seq, obj in self._heap if self._live.get(obj) == seq),
+            key=lambda entry: entry[0],
+        )
+
+
+    def pop_due(self, now: float) -> list:
+        """
+        Remove and return every object whose wakeup time is <= now, earliest first
+
+        :param now: current simulation time
+        :return: list of objects
+        """
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, seq, obj = heapq.heappop(heap)
+            if self._live.get(obj) == seq:
+                del self._live[obj]
+                due.append(obj)
+        return due
+
+
+    def _discard_stale(self) -> None:
+        heap = self._heap
+        while heap and self._live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
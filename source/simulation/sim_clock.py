@@ -0,0 +1,36 @@
+"""
+Simulation clock
+
+World-owned time source for everything that used to read time.time() directly (AI idle/dock timers,
+trail timestamps and trail fading). Simulation time only advances when the world ticks, so a world
+can be stepped faster than real time in headless or batch runs.
+"""
+
+
+class SimulationClock:
+    """
+    Simulation time in seconds, advanced by the tick dt instead of the wall clock.
+
+    Attributes:
+        now (float): current simulation time in seconds.
+        time_scale (float): multiplier applied to every tick dt (2.0 = twice real time).
+        ticks (int): number of ticks advanced so far.
+    """
+
+    def __init__(self, start: float = 0.0, time_scale: float = 1.0):
+        self.now: float = start
+        self.time_scale: float = time_scale
+        self.ticks: int = 0
+
+
+    def advance(self, dt: float) -> float:
+        """
+        Advance simulation time by one tick
+
+        :param dt: real (or requested) tick length in seconds
+        :return: simulated tick length in seconds (dt * time_scale)
+        """
+        sim_dt = dt * self.time_scale
+        self.now += sim_dt
+        self.ticks += 1
+        return sim_dt
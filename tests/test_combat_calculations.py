@@ -0,0 +1,86 @@
+"""
+Batched firing-solution matrix against the scalar per ship / per target methods
+"""
+import numpy as np
+import pytest
+
+from source.classes.ship.ship_class import Ship
+from source.classes.ship.ship_template import ShipTemplate
+from source.simulation.combat_calculations import Combat_Calculations
+from source.simulation.fleet_state import FleetState
+
+
+def _template(tag: str, sensors: dict, signature: dict) -> ShipTemplate:
+    return ShipTemplate({
+        'info': {'tag': tag, 'name': tag, 'vessel_type': 'ship', 'ship_type': 'test', 'description': ''},
+        'location': {'coordinates': [0.0, 0.0]},
+        'weapons': {}, 'sensors': sensors, 'signature': signature,
+    })
+
+
+@pytest.fixture
+def ships():
+    rng = np.random.default_rng(0)
+    templates = [
+        _template('radar_only', {'radar_sensor': {'range_Mm': 1.0, 'accuracy': 0.9}}, {'heat': 0.1, 'reflect': 0.2, 'radar': 0.05}),
+        _template('all_sensors', {'ir_sensor': {'range_Mm': 2.0, 'accuracy': 0.5},
+                                  'lidar_sensor': {'range_Mm': 0.7, 'accuracy': 0.8},
+                                  'radar_sensor': {'range_Mm': 1.4, 'accuracy': 0.6}}, {'heat': 0.5, 'reflect': 0.6, 'radar': 0.12}),
+        _template('blind', {}, {'heat': 0.3, 'reflect': 0.3, 'radar': 0.3}),
+    ]
+    fleet = FleetState(capacity=32)
+    ships = [Ship(templates[i % 3], fleet) for i in range(24)]
+    for ship in ships:
+        ship.coordinates = tuple(rng.uniform(-5000, 5000, 2))
+    ships[4].sensors['radar_sensor']['range_Mm'] = 3.0      # per ship module change on top of the template
+    return ships
+
+
+def test_matrix_matches_scalar_methods(ships):
+    combat = Combat_Calculations()
+    perfect, percentages = combat.get_firing_solution_matrix(ships, ships)
+    distances = combat.get_distance_matrix_Mm(ships, ships)
+
+    for i, shooter in enumerate(ships):
+        for j, target in enumerate(ships):
+            if i == j:
+                assert perfect[i, j] == 0.0 and percentages[i, j] == 0.0     # distance 0 scores 0
+                continue
+            shooter.give_target(target)
+            expected = combat.get_ship_perfect_solution_range(shooter, float(distances[i, j]))
+            assert perfect[i, j] == pytest.approx(expected, rel=1e-9)
+            assert percentages[i, j] == pytest.approx(expected / distances[i, j], rel=1e-9)
+
+
+def test_distance_matrix_with_and_without_shared_fleet(ships):
+    combat = Combat_Calculations()
+    loose = [Ship(ships[0].template) for _ in range(3)]        # every ship in a fleet of its own
+    for ship, source in zip(loose, ships):
+        ship.coordinates = source.coordinates
+    np.testing.assert_allclose(combat.get_distance_matrix_Mm(loose, loose), combat.get_distance_matrix_Mm(ships[:3], ships[:3]))
+
+
+def test_zero_and_missing_signatures(ships):
+    combat = Combat_Calculations()
+    cold = Ship(_template('cold', {}, {'heat': 0.0, 'reflect': 0.2, 'radar': 0.05}), ships[0].fleet)
+    stealthy = Ship(_template('stealthy', {}, {'heat': 0.2, 'reflect': 0.2}), ships[0].fleet)     # no radar key
+    cold.coordinates, stealthy.coordinates = (100.0, 0.0), (0.0, 250.0)
+    targets = [cold, stealthy]
+    perfect, percentages = combat.get_firing_solution_matrix(ships, targets)
+    assert np.isfinite(perfect).all() and np.isfinite(percentages).all()
+
+    distances = combat.get_distance_matrix_Mm(ships, targets)
+    for i, shooter in enumerate(ships):
+        carries = {s for s in combat.SENSOR_SIGNATURES if f'{s}_sensor' in shooter.sensors}
+        # the cold target has no heat: zero for ir carriers, the other sensors still see it
+        shooter.give_target(cold)
+        expected = 0.0 if 'ir' in carries else combat.get_ship_perfect_solution_range(shooter, float(distances[i, 0]))
+        assert perfect[i, 0] == pytest.approx(expected, rel=1e-9)
+        # a missing signature reads as 0, only radar carriers are affected
+        if 'radar' in carries:
+            assert perfect[i, 1] == 0.0 and percentages[i, 1] == 0.0
+        else:
+            shooter.give_target(stealthy)
+            expected = combat.get_ship_perfect_solution_range(shooter, float(distances[i, 1]))
+            assert perfect[i, 1] == pytest.approx(expected, rel=1e-9)
+    assert (perfect[:, 0] > 0).any() and (perfect[:, 1] == 0).any()
@@ -0,0 +1,67 @@
+"""
+Game._confirm_move: a pending destination on the selected location is routed, a clicked point is flown to directly
+"""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from engine.core.game_core import Game
+from engine.input.input_manager import InputManager
+from engine.managers.world_manager import WorldManager
+
+
+@pytest.fixture(scope='module')
+def world():
+    random.seed(0)
+    world = WorldManager(sharded=False)
+    world.logger.logger_enabled = False
+    world.scale_spawn_table(20)
+    world.load()
+    return world
+
+
+@pytest.fixture
+def game(world):
+    input_manager = InputManager(SimpleNamespace(center=(500, 500), size=400, label_scale=0.1),
+                                 SimpleNamespace(scale=0.1), world.player)
+    game = SimpleNamespace(input_manager=input_manager, player=world.player, world_manager=world)
+    yield game
+    world.player.follow_route([])
+    world.player.stop()
+
+
+def _far_location(world):
+    """A location reached over more than one hop, so a routed move differs from a direct one"""
+    for location in sorted(world.locations, key=lambda loc: -sum(c * c for c in loc.coordinates)):
+        route = world.plan_route(world.player.coordinates, location)
+        if len(route) > 1:
+            return location, route
+    pytest.skip("no multi hop route in this world")
+
+
+def test_selected_location_is_routed(game):
+    location, route = _far_location(game.world_manager)
+    game.input_manager.selected = location
+    game.input_manager.pending_destination.update(active=True, coords=tuple(location.coordinates))
+
+    assert Game._confirm_move(game)
+    assert game.player.destination is route[0]
+    assert game.player.route == route[:0:-1]
+
+
+def test_clicked_point_is_flown_to_while_a_location_stays_selected(game):
+    location, _ = _far_location(game.world_manager)
+    game.input_manager.selected = location      # a click on empty space keeps the old selection
+    point = (location.coordinates[0] + 1234.0, location.coordinates[1] - 56.0)
+    game.input_manager.pending_destination.update(active=True, coords=point)
+
+    assert Game._confirm_move(game)
+    assert game.player.destination == point
+    assert game.player.route == []
+
+
+def test_nothing_pending(game):
+    game.input_manager.selected = game.world_manager.locations[0]
+    assert not Game._confirm_move(game)
+    assert game.player.destination is None
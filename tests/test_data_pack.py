@@ -0,0 +1,85 @@
+"""
+DataPack: the index reproduces json.load, and single entry reads only decode what they touch
+(walking a whole section decodes everything, see the data_pack module docstring)
+"""
+import json
+
+import pytest
+
+from utility.tools.data_pack import DataPack
+from utility.tools.dataloader import Dataloader
+
+ENTRIES = 500
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    document = {
+        'version': 3,
+        'name': 'Sektor Ω',
+        'game': {
+            f'station_{i:04}': {
+                'info': {'name': f'Station {i} – ß{i}', 'tag': f'st_{i}', 'services': ['fuel', 'repair'][:i % 3]},
+                'location': {'coordinates': [i * 10.5, -i], 'location_parent_tag': None},
+                'flags': {'is_hidden': i % 7 == 0},
+            } for i in range(ENTRIES)
+        },
+        'debug': {},
+        'empty': [],
+    }
+    path = tmp_path / 'catalogue.json'
+    # indented, non ascii and compact in one file: offsets have to be byte offsets
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding='utf-8')
+    return str(path), document
+
+
+def _pack(path: str, cache_entries: int = 16) -> DataPack:
+    with open(path, 'rb') as file:
+        return DataPack(path, DataPack.build_index(file.read()), cache_entries)
+
+
+def test_index_reproduces_the_document(catalogue):
+    path, document = catalogue
+    view = _pack(path, cache_entries=ENTRIES).as_dict()
+    assert set(view) == set(document)
+    assert view['version'] == 3 and view['name'] == 'Sektor Ω' and view['empty'] == []
+    assert len(view['debug']) == 0
+    assert {key: view['game'][key] for key in view['game']} == document['game']
+
+
+def test_single_entry_reads_decode_only_what_they_touch(catalogue):
+    path, document = catalogue
+    pack = _pack(path, cache_entries=16)
+    game = pack.section('game')
+    touched = ['station_0003', 'station_0250', 'station_0499']
+
+    for _ in range(20):
+        for key in touched:
+            assert game[key] == document['game'][key]
+    assert pack.stats == {'misses': len(touched), 'hits': 20 * len(touched) - len(touched)}
+    assert len(game) == ENTRIES and 'station_0100' in game and 'missing' not in game
+    with pytest.raises(KeyError):
+        game['missing']
+
+
+def test_lru_stays_bounded(catalogue):
+    path, _ = catalogue
+    pack = _pack(path, cache_entries=16)
+    game = pack.section('game')
+    for key in list(game)[:100]:
+        game[key]
+    assert len(pack._cache) == 16
+
+    # a full walk decodes every entry once and keeps only the last ones, no benefit for the next walk
+    for key in game:
+        game[key]
+    assert pack.stats['misses'] == 100 + ENTRIES and len(pack._cache) == 16
+    pack.close()
+
+
+def test_dataloader_pack_mode_matches_plain_load(catalogue):
+    path, document = catalogue
+    loader = Dataloader(use_cache=False, pack_mode=True)
+    view = loader.load_file(path)
+    assert dict(view['game'].items()) == document['game']
+    assert loader.get_cache_stats()['entry_misses'] == ENTRIES
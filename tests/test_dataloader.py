@@ -0,0 +1,93 @@
+"""
+Dataloader compiled cache: hits, misses, the size/mtime fast check, hash revalidation and rebuilds
+"""
+import json
+import os
+
+import pytest
+
+from utility.tools.dataloader import Dataloader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    loader = Dataloader(use_cache=True, pack_mode=False)
+    loader.logger.logger_enabled = False
+    loader.cache_dir = str(tmp_path / 'cache')
+    return loader
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'outside' / 'catalogue.json'       # outside the repo, where relpath based names broke
+    path.parent.mkdir()
+    path.write_text(json.dumps({'game': {'a': 1, 'b': [1, 2]}}), encoding='utf-8')
+    return str(path)
+
+
+def _stats(loader):
+    return loader.stats['hits'], loader.stats['misses']
+
+
+def test_cache_path_is_keyed_by_absolute_path(loader, tmp_path):
+    first = loader._cache_path(str(tmp_path / 'x' / 'data.json'), 'data')
+    second = loader._cache_path(str(tmp_path / 'y' / 'data.json'), 'data')
+    assert first != second
+    assert os.path.dirname(first) == loader.cache_dir
+    assert os.path.basename(first).startswith('data.json.') and not os.path.basename(first).startswith('.')
+    assert loader._cache_path(str(tmp_path / 'x' / 'data.json'), 'index') != first
+
+    relative = os.path.relpath(str(tmp_path / 'x' / 'data.json'))
+    assert loader._cache_path(relative, 'data') == first
+
+
+def test_miss_then_hit(loader, source):
+    assert loader.load_file(source) == {'game': {'a': 1, 'b': [1, 2]}}
+    assert _stats(loader) == (0, 1)
+    assert os.path.exists(loader._cache_path(source, 'data'))
+
+    again = Dataloader(use_cache=True, pack_mode=False)
+    again.logger.logger_enabled = False
+    again.cache_dir = loader.cache_dir
+    assert again.load_file(source) == {'game': {'a': 1, 'b': [1, 2]}}
+    assert _stats(again) == (1, 0)
+
+
+def test_size_and_mtime_match_skips_reading_the_file(loader, source):
+    loader.load_file(source)
+    stat = os.stat(source)
+    # same size and mtime: the entry is trusted without hashing, even though the content differs
+    with open(source, 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'game': {'a': 2, 'b': [1, 2]}}))
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert loader.load_file(source) == {'game': {'a': 1, 'b': [1, 2]}}
+    assert _stats(loader) == (1, 1)
+
+
+def test_touched_file_with_same_content_is_revalidated_by_hash(loader, source):
+    loader.load_file(source)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert loader.load_file(source) == {'game': {'a': 1, 'b': [1, 2]}}
+    assert _stats(loader) == (1, 1)
+
+    # the revalidated entry carries the new mtime, the next load takes the fast path again
+    loader.load_file(source)
+    assert _stats(loader) == (2, 1)
+
+
+def test_changed_file_is_rebuilt(loader, source):
+    loader.load_file(source)
+    with open(source, 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'game': {'a': 1, 'b': [1, 2, 3], 'c': None}}))
+    assert loader.load_file(source) == {'game': {'a': 1, 'b': [1, 2, 3], 'c': None}}
+    assert _stats(loader) == (0, 2)
+    loader.load_file(source)
+    assert _stats(loader) == (1, 2)
+
+
+def test_stale_cache_version_is_rebuilt(loader, source, monkeypatch):
+    loader.load_file(source)
+    monkeypatch.setattr(Dataloader, 'CACHE_VERSION', Dataloader.CACHE_VERSION + 1)
+    loader.load_file(source)
+    assert _stats(loader) == (0, 2)
@@ -0,0 +1,101 @@
+"""
+DestinationSelector: filtered KD-tree picks against brute force over the catalogue
+"""
+import random
+
+import numpy as np
+import pytest
+
+from data.config.gameplay_config_settings import DESTINATION_SETTINGS
+from source.classes.AI.AI_controller import AIController, AIState
+from source.classes.location.station_class import Station
+from source.classes.ship.ship_template import ShipTemplate
+from source.simulation.destinations import DestinationSelector
+from source.simulation.fleet_state import FleetState
+from source.simulation.scheduler import WakeupScheduler
+from utility.tools.dataloader import Dataloader
+
+FACTIONS = ('Iron Confederacy', 'Free Traders', 'Outer Rim')
+SERVICES = ('market', 'repair', 'fuel', 'mining_jobs')
+
+
+@pytest.fixture(scope='module')
+def stations():
+    rng = np.random.default_rng(0)
+    return [
+        Station({
+            'info': {'tag': f'station_{i}', 'name': f'Station {i}', 'location_type': 'station', 'station_type': 'orbital',
+                     'description': '', 'faction': FACTIONS[i % 3], 'level_requirement': 1},
+            'location': {'coordinates': rng.uniform(-50000, 50000, 2).tolist(), 'location_parent_tag': None},
+            'functions': {'services': [s for j, s in enumerate(SERVICES) if (i >> j) & 1]},
+            'flags': {'is_hidden': False},
+        }) for i in range(1500)
+    ]
+
+
+@pytest.fixture(scope='module')
+def template():
+    return ShipTemplate(next(iter(Dataloader().load_data()['ships']['ship_data']['game'].values())))
+
+
+def _brute_force(stations, coordinates, faction=None, service=None):
+    matching = [s for s in stations if (faction is None or s.faction == faction)
+                and (service is None or service in s.station_services)]
+    distances = np.array([np.hypot(*np.subtract(s.coordinates, coordinates)) for s in matching])
+    return [matching[i] for i in np.argsort(distances, kind='stable')], np.sort(distances)
+
+
+@pytest.mark.parametrize('faction, service', [(None, None), ('Free Traders', None), (None, 'fuel'), ('Outer Rim', 'repair')])
+def test_nearest_and_within_match_brute_force(stations, faction, service):
+    selector = DestinationSelector(stations)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        coordinates = tuple(rng.uniform(-60000, 60000, 2))
+        found, distances = selector.nearest(coordinates, 12, faction, service)
+        expected, expected_distances = _brute_force(stations, coordinates, faction, service)
+        assert found == expected[:12]
+        np.testing.assert_allclose(distances, expected_distances[:12])
+
+        # within() keeps catalogue order
+        inside = {id(s) for s, d in zip(expected, expected_distances) if d <= 8000.0}
+        assert selector.within(coordinates, 8000.0, faction, service) == [s for s in stations if id(s) in inside]
+
+
+def test_sample_respects_filter_exclude_and_radius(stations):
+    selector = DestinationSelector(stations, {**DESTINATION_SETTINGS, 'radius': 5000.0})
+    random.seed(2)
+    here = stations[0]
+    for _ in range(300):
+        pick = selector.sample(here.coordinates, 'Free Traders', 'market', exclude=here)
+        assert pick is not here and pick.faction == 'Free Traders' and 'market' in pick.station_services
+        assert np.hypot(*np.subtract(pick.coordinates, here.coordinates)) <= 5000.0
+
+    assert selector.sample((0.0, 0.0), 'No Such Faction') is None
+
+
+def test_nearby_destinations_are_preferred(stations):
+    selector = DestinationSelector(stations)
+    random.seed(3)
+    candidates, distances = selector.nearest((0.0, 0.0), selector.candidates)
+    picks = [selector.sample((0.0, 0.0)) for _ in range(4000)]
+    counts = np.array([sum(p is c for p in picks) for c in candidates])
+    # weights fall with distance: the nearer half of the candidates gets picked more often than the farther half
+    assert counts[:len(counts) // 2].sum() > counts[len(counts) // 2:].sum()
+
+
+@pytest.mark.parametrize('config', [{'destination_faction': 'No Such Faction'}, {'destination_service': 'shipwright'}])
+def test_filtered_controller_without_match_stays_idle(stations, template, config):
+    fleet, scheduler = FleetState(capacity=4), WakeupScheduler()
+    controller = AIController(template, stations, config, fleet=fleet, scheduler=scheduler,
+                              destinations=DestinationSelector(stations))
+    fleet.clock.now = 10.0
+    scheduler.pop_due(fleet.clock.now)
+
+    controller.wake()
+    # no fallback to an unfiltered random station, the ship checks again after its idle time
+    assert controller.state == AIState.IDLE and controller.destination is None
+    assert [(when, obj) for when, obj in scheduler.pending()] == [(10.0 + controller.config['idle_time'], controller)]
+
+    unfiltered = AIController(template, stations, fleet=fleet, destinations=DestinationSelector(stations))
+    unfiltered.wake()
+    assert unfiltered.state == AIState.TRAVELING and unfiltered.destination is not None
@@ -0,0 +1,144 @@
+"""
+DetectionSystem contacts against a brute force pass over every vessel, and the disabled default
+"""
+import random
+
+import numpy as np
+import pytest
+
+from data.config.gameplay_config_settings import DETECTION_SETTINGS
+from engine.logic.radar_class import Radar_System
+from engine.managers.world_manager import WorldManager
+from source.simulation.combat_calculations import Combat_Calculations
+from source.simulation.detection import DetectionSystem
+
+SETTINGS = {**DETECTION_SETTINGS, 'enabled': True}
+
+
+@pytest.fixture(scope='module')
+def world():
+    random.seed(3)
+    world = WorldManager(sharded=False)
+    world.logger.logger_enabled = False
+    world.scale_spawn_table(400)
+    world.load()
+    for _ in range(240):
+        world.update(1 / 60)
+    return world
+
+
+def _brute_force(world, observer):
+    """(vessel index, identified, threat) of every vessel observer detects, one vessel and sensor at a time"""
+    combat = Combat_Calculations()
+    contacts = []
+    for i, vessel in enumerate(world.vessels):
+        if vessel is observer or not world.fleet.visible[vessel.row]:
+            continue
+        distance = np.linalg.norm(np.subtract(vessel.coordinates, observer.coordinates)) / 1000
+        detected = identified = False
+        for sensor_type, signature_type in combat.SENSOR_SIGNATURES.items():
+            sensor = observer.sensors.get(f'{sensor_type}_sensor')
+            if sensor is None:
+                continue
+            reach = min(sensor['range_Mm'] * vessel.signature.get(signature_type, 0.0) / SETTINGS['reference_signature'],
+                        SETTINGS['max_range_Mm'])
+            detected |= distance <= reach
+            identified |= distance <= reach * sensor['accuracy']
+        if detected:
+            armed = any('attack' in weapon.get('type', ()) for weapon in vessel.weapons.values())
+            contacts.append((i, identified, identified and armed))
+    return contacts
+
+
+def test_contacts_match_brute_force(world):
+    detection = DetectionSystem(SETTINGS)
+    total = identified = 0
+    for observer in [world.player] + world.vessels[:20]:
+        contacts = detection.detect(observer, world.vessel_index, world.vessels, world.vessel_rows, world.fleet.visible)
+        found = list(zip(contacts.indices.tolist(), contacts.identified.tolist(), contacts.threat.tolist()))
+        assert found == _brute_force(world, observer)
+        total += len(found)
+        identified += int(contacts.identified.sum())
+    assert total and identified < total, "no detected or no unidentified contacts, the comparison proves little"
+
+
+def test_disabled_by_default_shows_every_vessel(world):
+    assert not DetectionSystem().enabled and not world.detection.enabled
+    radar = Radar_System(5000, 0.1, 450)
+    blips = radar.get_blips(world.player, world)
+
+    in_range = world.vessel_index.query_radius(world.player.coordinates, radar.size / radar.scale)
+    visible = in_range[world.fleet.visible[world.vessel_rows[in_range]]]
+    assert len(blips) == len(world.location_index.query_radius(world.player.coordinates, radar.size / radar.scale)) + len(visible)
+    assert blips.identified.all()
+
+
+def test_disabled_detection_sets_target_flags_from_visibility(world):
+    detection = DetectionSystem()
+    player = world.player
+    armed = next(v for v in world.vessels if any('attack' in w.get('type', ()) for w in v.weapons.values()))
+    unarmed = next((v for v in world.vessels if not any('attack' in w.get('type', ()) for w in v.weapons.values())), None)
+    hidden = next((loc for loc in world.locations if loc.is_hidden), None)
+    try:
+        player.give_target(armed)
+        detection.update(world)
+        assert not player.target_is_unknown and player.target_is_threat
+
+        armed.visible_on_radar = False      # docked
+        detection.update(world)
+        assert player.target_is_unknown and not player.target_is_threat
+        armed.visible_on_radar = True
+
+        if unarmed is not None:
+            player.give_target(unarmed)
+            detection.update(world)
+            assert not player.target_is_unknown and not player.target_is_threat
+
+        location = world.locations[0]
+        player.give_target(location)
+        detection.update(world)
+        assert player.target_is_unknown == location.is_hidden and not player.target_is_threat
+        if hidden is not None:
+            player.give_target(hidden)
+            detection.update(world)
+            assert player.target_is_unknown
+
+        player.release_target()
+        detection.update(world)
+        assert not player.target_is_unknown and not player.target_is_threat
+    finally:
+        armed.visible_on_radar = True
+        player.release_target()
+
+
+def test_sharded_world_detects_on_fresh_positions():
+    random.seed(5)
+    world = WorldManager(sharded=True)
+    world.logger.logger_enabled = False
+    world.detection = DetectionSystem(SETTINGS)
+    world.scale_spawn_table(400)
+    world.load()
+    try:
+        world.player.coordinates = (world.SHIP_SPAWN_RANGE['x'][1] + 2000.0, 0.0)   # part of the fleet beyond gather_radius
+        reach = world.detection.query_radius(world.player)
+        assert reach > world.shards.gather_radius, "sensor reach inside the gather radius, nothing to prove"
+        for _ in range(180):
+            world.update(1 / 60)
+        world.detection._next_pass = -np.inf       # the last tick runs a detection pass
+        world.update(1 / 60)
+        contacts, mirrored = world.player_contacts, world.fleet.positions[world.vessel_rows].copy()
+
+        world.shards.sync_all()
+        positions = world.fleet.positions[world.vessel_rows]
+        distance = np.linalg.norm(positions - world.player.coordinates, axis=1)
+        reached = distance <= reach
+        assert (reached & (distance > world.shards.gather_radius)).any()
+        np.testing.assert_array_equal(mirrored[reached], positions[reached])
+
+        world.vessel_index.build(positions)
+        expected = world.detection.detect(world.player, world.vessel_index, world.vessels, world.vessel_rows,
+                                          world.fleet.visible)
+        assert len(contacts) and contacts.indices.tolist() == expected.indices.tolist()
+        assert contacts.identified.tolist() == expected.identified.tolist()
+    finally:
+        world.close()
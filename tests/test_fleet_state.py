@@ -0,0 +1,170 @@
+"""
+FleetState flight kernel against the per-vessel update_flight loop it replaced
+"""
+import math
+
+import numpy as np
+import pytest
+
+from source.simulation.fleet_state import FleetState
+from source.simulation.sim_clock import SimulationClock
+
+
+class _ReferenceVessel:
+    """The pre fleet Vessel.update_flight() (scalar, one vessel per call), trails left out."""
+
+    def __init__(self, coordinates, destination, speed, vector, acceleration, deceleration, max_speed):
+        self.coordinates = tuple(coordinates)
+        self.destination = destination
+        self.speed = speed
+        self.vector = np.array(vector, dtype=np.float64)
+        self.acceleration = acceleration
+        self.deceleration = deceleration
+        self.max_speed = max_speed
+        self.orientation = 0.0
+
+    def update_flight(self, dt):
+        if not self.destination:
+            if self.speed > 0:
+                self.speed = max(self.speed - self.deceleration * dt, 0)
+                nx, ny = self.vector / (np.linalg.norm(self.vector) + 1e-6)
+                self.coordinates = (self.coordinates[0] + nx * self.speed * dt,
+                                    self.coordinates[1] + ny * self.speed * dt)
+            return
+
+        dx = self.destination[0] - self.coordinates[0]
+        dy = self.destination[1] - self.coordinates[1]
+        distance = math.hypot(dx, dy)
+        if distance < FleetState.ARRIVAL_THRESHOLD:
+            self.coordinates = self.destination
+            self.destination = None
+            self.speed = 0.0
+            self.vector[:] = (0.0, 0.0)
+            return
+
+        direction = np.array([dx, dy]) / distance
+        stopping_distance = self.speed ** 2 / (2 * self.deceleration)
+        if distance > stopping_distance:
+            self.speed = min(self.speed + self.acceleration * dt, self.max_speed)
+        else:
+            self.speed = max(self.speed - self.deceleration * dt, 0)
+
+        self.vector = direction * self.speed
+        # the kernel never carries a row past its destination (the old loop could overshoot on large dt)
+        step = min(self.speed * dt, distance)
+        self.coordinates = (self.coordinates[0] + direction[0] * step,
+                            self.coordinates[1] + direction[1] * step)
+        self.orientation = math.atan2(direction[1], direction[0])
+
+
+def _random_fleet(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    fleet = FleetState(capacity=4, clock=SimulationClock())
+    references = []
+    for i in range(count):
+        coordinates = tuple(rng.uniform(-4000, 4000, 2))
+        row = fleet.add(i, coordinates)
+        speed = float(rng.uniform(0, 300))
+        vector = rng.normal(size=2) * speed
+        destination = tuple(rng.uniform(-4000, 4000, 2)) if i % 3 else None
+        acceleration, deceleration = float(rng.uniform(10, 100)), float(rng.uniform(10, 100))
+        max_speed = float(rng.uniform(200, 5000))
+
+        fleet.speeds[row] = speed
+        fleet.velocities[row] = vector
+        fleet.accelerations[row] = acceleration
+        fleet.decelerations[row] = deceleration
+        fleet.max_speeds[row] = max_speed
+        if destination is not None:
+            fleet.destinations[row] = destination
+            fleet.has_destination[row] = True
+        references.append(_ReferenceVessel(coordinates, destination, speed, vector, acceleration, deceleration, max_speed))
+    return fleet, references
+
+
+def _assert_matches(fleet: FleetState, references: list) -> None:
+    for row, ref in enumerate(references):
+        np.testing.assert_allclose(fleet.positions[row], ref.coordinates, rtol=1e-9, atol=1e-6)
+        assert fleet.speeds[row] == pytest.approx(ref.speed, rel=1e-9, abs=1e-9)
+        assert bool(fleet.has_destination[row]) == (ref.destination is not None)
+
+
+def test_kernel_matches_per_vessel_loop():
+    fleet, references = _random_fleet(300)
+    steering = fleet.has_destination[:fleet.count].copy()
+    for _ in range(600):
+        fleet.update_flight(0.1)
+        for ref in references:
+            ref.update_flight(0.1)
+    _assert_matches(fleet, references)
+
+    # rows that got there were snapped exactly onto their destination
+    arrived = np.flatnonzero(steering & ~fleet.has_destination[:fleet.count])
+    assert arrived.size
+    np.testing.assert_array_equal(fleet.positions[arrived], fleet.destinations[arrived])
+
+
+def test_kernel_matches_per_vessel_loop_with_per_row_dt():
+    fleet, references = _random_fleet(120, seed=1)
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        rows = np.flatnonzero(rng.random(fleet.count) < 0.5)
+        dt = rng.uniform(0.01, 0.5, rows.size)
+        fleet.update_flight(dt, rows)
+        for row, row_dt in zip(rows.tolist(), dt.tolist()):
+            references[row].update_flight(row_dt)
+    _assert_matches(fleet, references)
+
+
+def test_large_step_never_overshoots_destination():
+    fleet = FleetState(capacity=1)
+    row = fleet.add(None, (0.0, 0.0))
+    fleet.destinations[row] = (100.0, 0.0)
+    fleet.has_destination[row] = True
+    fleet.accelerations[row] = fleet.decelerations[row] = 50.0
+    fleet.max_speeds[row] = 5000.0
+    fleet.speeds[row] = 4000.0
+
+    fleet.update_flight(10.0)
+    assert fleet.positions[row].tolist() == [100.0, 0.0]
+    fleet.update_flight(10.0)
+    assert not fleet.has_destination[row] and fleet.speeds[row] == 0.0
+
+
+def test_inactive_rows_are_not_advanced():
+    fleet, _ = _random_fleet(30, seed=3)
+    fleet.active[::2] = False
+    before = fleet.positions[:fleet.count].copy()
+    fleet.update_flight(1.0)
+    np.testing.assert_array_equal(fleet.positions[:fleet.count:2], before[::2])
+
+
+def test_swap_remove_and_growth_keep_rows():
+    fleet, _ = _random_fleet(20, seed=4)
+    last = fleet.positions[fleet.count - 1].copy()
+    assert fleet.remove(5) == 19
+    assert fleet.count == 19 and fleet.owners[5] == 19
+    np.testing.assert_array_equal(fleet.positions[5], last)
+    assert fleet.remove(fleet.count - 1) is None
+
+
+def test_trail_ring_keeps_the_newest_dots():
+    clock = SimulationClock()
+    fleet = FleetState(capacity=1, clock=clock, trail_capacity=4)
+    row = fleet.add(None, (0.0, 0.0))
+    fleet.trail_spacing = 10.0
+    fleet.destinations[row] = (1e6, 0.0)
+    fleet.has_destination[row] = True
+    fleet.speeds[row] = fleet.max_speeds[row] = 1000.0
+    fleet.accelerations[row] = 0.0
+    fleet.decelerations[row] = 1.0
+
+    for _ in range(10):
+        clock.advance(0.1)
+        fleet.update_flight(0.1)
+
+    points, fades = fleet.get_trail_points(np.array([row]))
+    assert len(points) == 4
+    # 100 km per step, the first position only seeds the spacing: dots at 200 .. 1000, the ring keeps the last 4
+    assert sorted(points[:, 0].tolist()) == pytest.approx([700.0, 800.0, 900.0, 1000.0])
+    assert fades.max() == pytest.approx(1.0)
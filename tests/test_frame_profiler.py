@@ -0,0 +1,141 @@
+"""
+FrameProfiler on synthetic timings: rolling and whole run percentiles, the histogram and the written reports,
+plus the overlay leaving the shared text cache alone
+"""
+import csv
+import json
+
+import numpy as np
+import pygame
+import pytest
+
+from data.config.config_settings import PROFILER_SETTINGS
+from engine.renderers.profiler_overlay import ProfilerOverlay
+from engine.renderers.text_cache import TEXT_CACHE
+from utility.tools import frame_profiler
+from utility.tools.frame_profiler import FRAME, FrameProfiler
+
+PHASES = ['update', 'render']
+SETTINGS = {**PROFILER_SETTINGS, 'enabled': True, 'window': 50}
+BIN_RATIO = (SETTINGS['histogram_range_ms'][1] / SETTINGS['histogram_range_ms'][0]) ** (1 / SETTINGS['histogram_bins'])
+
+
+class _Clock:
+    """Stands in for perf_counter(), advanced by hand"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(frame_profiler, 'perf_counter', clock)
+    return clock
+
+
+def _record(profiler: FrameProfiler, clock: _Clock, timings_ms: np.ndarray) -> None:
+    """timings_ms: (frames, phases) phase durations, the frame column is their sum"""
+    for row in timings_ms:
+        profiler.begin_frame()
+        for phase, ms in zip(PHASES, row):
+            clock.now += ms / 1000.0
+            profiler.mark(phase)
+        profiler.end_frame()
+
+
+@pytest.fixture
+def timings():
+    rng = np.random.default_rng(0)
+    return np.column_stack((rng.lognormal(0.0, 0.5, 400), rng.lognormal(1.5, 0.3, 400)))    # ~1 ms and ~4.5 ms
+
+
+def _expected(samples: np.ndarray) -> dict:
+    samples = np.column_stack((samples, samples.sum(axis=1)))
+    return {phase: samples[:, i] for i, phase in enumerate(PHASES + [FRAME])}
+
+
+def test_rolling_is_exact_over_the_window(clock, timings):
+    profiler = FrameProfiler(PHASES, SETTINGS)
+    assert profiler.rolling() == {} and profiler.run() == {}
+    _record(profiler, clock, timings)
+
+    stats = profiler.rolling()
+    for phase, values in _expected(timings[-SETTINGS['window']:]).items():
+        for q in SETTINGS['percentiles']:
+            assert stats[phase][f"p{q:g}"] == pytest.approx(np.percentile(values, q), abs=1e-4)
+        assert stats[phase]['mean'] == pytest.approx(values.mean(), abs=1e-4)
+        assert stats[phase]['max'] == pytest.approx(values.max(), abs=1e-4)
+
+
+def test_run_percentiles_within_one_bin(clock, timings):
+    profiler = FrameProfiler(PHASES, SETTINGS)
+    _record(profiler, clock, timings)
+
+    stats = profiler.run()
+    assert profiler.frames == len(timings)
+    for phase, values in _expected(timings).items():
+        for q in SETTINGS['percentiles']:
+            exact = np.percentile(values, q)
+            assert exact / BIN_RATIO <= stats[phase][f"p{q:g}"] <= exact * BIN_RATIO
+        assert stats[phase]['mean'] == pytest.approx(values.mean(), abs=1e-4)
+        assert stats[phase]['max'] == pytest.approx(values.max(), abs=1e-4)
+
+
+def test_histogram_counts_with_under_and_overflow(clock):
+    profiler = FrameProfiler(PHASES, SETTINGS)
+    low, high = SETTINGS['histogram_range_ms']
+    _record(profiler, clock, np.array([[low / 10, 1.5], [high * 2, 1.5], [1.5, 1.5]]))
+
+    update = profiler.histogram[0]
+    assert update.sum() == 3 and update[0] == 1 and update[-1] == 1
+    assert (profiler.histogram.sum(axis=1) == 3).all()
+    # the 1.5 ms bin of the render column holds all three frames
+    assert profiler.histogram[1, np.searchsorted(profiler.bin_edges_ms, 1.5)] == 3
+    # overflow percentiles are capped at the largest time seen
+    assert profiler.run()['update']['p99'] <= high * 2 + 1e-6
+
+
+def test_disabled_profiler_records_nothing(clock, timings):
+    profiler = FrameProfiler(PHASES, {**SETTINGS, 'enabled': False})
+    _record(profiler, clock, timings[:10])
+    assert profiler.frames == 0 and profiler.histogram.sum() == 0 and profiler.rolling() == {}
+
+
+def test_write_json_and_csv(clock, timings, tmp_path):
+    profiler = FrameProfiler(PHASES, SETTINGS)
+    _record(profiler, clock, timings)
+    rolling, run = profiler.rolling(), profiler.run()
+
+    path = profiler.write(str(tmp_path / 'logs' / 'profile.json'))
+    with open(path, encoding='utf-8') as file:
+        report = json.load(file)
+    assert report['frames'] == len(timings) and report['window'] == SETTINGS['window']
+    assert report['rolling'] == rolling and report['run'] == run
+    assert len(report['histogram']['bin_edges_ms']) == SETTINGS['histogram_bins'] + 1
+    assert report['histogram']['counts'][FRAME] == profiler.histogram[-1].tolist()
+
+    path = profiler.write(str(tmp_path / 'profile.csv'))
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 2 * len(PHASES + [FRAME])
+    for row in rows:
+        stats = (rolling if row['view'] == 'rolling' else run)[row['phase']]
+        assert int(row['frames']) == (SETTINGS['window'] if row['view'] == 'rolling' else len(timings))
+        assert {column: float(row[f"{column}_ms"]) for column in stats} == stats
+
+
+def test_overlay_leaves_the_shared_text_cache_alone(clock, timings):
+    pygame.font.init()
+    profiler = FrameProfiler(PHASES, SETTINGS)
+    _record(profiler, clock, timings)
+    overlay = ProfilerOverlay(pygame.Surface((800, 600)), (10, 10), profiler, {**SETTINGS, 'overlay': True})
+
+    size, stats = len(TEXT_CACHE), dict(TEXT_CACHE.stats)
+    for _ in range(3 * SETTINGS['overlay_refresh']):
+        _record(profiler, clock, timings[:1])
+        overlay.draw(pygame.Rect(0, 0, 800, 600))
+    assert len(TEXT_CACHE) == size and TEXT_CACHE.stats == stats
@@ -0,0 +1,38 @@
+"""
+Instance_Generator.generate_filler_locations: seeding and placement of the synthetic stations
+"""
+import random
+
+from source.classes.location.station_class import Station
+from source.generators.instance_generator import Instance_Generator
+
+TEMPLATE = {
+    'info': {'tag': 'depot', 'name': 'Depot', 'location_type': 'station', 'station_type': 'orbital',
+             'description': '', 'faction': 'Free Traders', 'level_requirement': 1},
+    'location': {'coordinates': [0.0, 0.0], 'location_parent_tag': None},
+    'functions': {'services': ['fuel']},
+    'flags': {'is_hidden': False},
+}
+SPAWN_RANGE = {'x': [-1000, 1000], 'y': [500, 2000]}
+
+
+def _coordinates(locations):
+    return [tuple(location.coordinates) for location in locations]
+
+
+def test_default_rng_follows_random_seed():
+    random.seed(42)
+    first = Instance_Generator.generate_filler_locations(TEMPLATE, 50, SPAWN_RANGE)
+    random.seed(42)
+    second = Instance_Generator.generate_filler_locations(TEMPLATE, 50, SPAWN_RANGE)
+    assert _coordinates(first) == _coordinates(second)
+
+
+def test_explicit_rng_and_placement():
+    locations = Instance_Generator.generate_filler_locations(TEMPLATE, 50, SPAWN_RANGE, rng=random.Random(7))
+    assert _coordinates(locations) == _coordinates(
+        Instance_Generator.generate_filler_locations(TEMPLATE, 50, SPAWN_RANGE, rng=random.Random(7)))
+    assert all(isinstance(location, Station) for location in locations)
+    assert len({location.tag for location in locations}) == 50
+    assert all(-1000 <= x <= 1000 and 500 <= y <= 2000 for x, y in _coordinates(locations))
+    assert TEMPLATE['location']['coordinates'] == [0.0, 0.0]     # the template itself is left alone
@@ -0,0 +1,59 @@
+"""
+KDTree nearest-k and radius queries against brute force
+"""
+import numpy as np
+import pytest
+
+from engine.logic.kd_tree import KDTree
+
+
+def _points(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # clustered catalogue: dense systems, a sparse field and duplicated positions
+    clusters = rng.normal(0, 150, (2000, 2)) + rng.uniform(-80000, 80000, (20, 2)).repeat(100, axis=0)
+    field = rng.uniform(-100000, 100000, (1500, 2))
+    return np.concatenate((clusters, field, field[:50]))
+
+
+def _distances(points: np.ndarray, center) -> np.ndarray:
+    return np.linalg.norm(points - np.asarray(center), axis=1)
+
+
+@pytest.mark.parametrize('leaf_size', [1, 16, 256])
+def test_query_nearest_matches_brute_force(leaf_size):
+    points = _points()
+    tree = KDTree(points, leaf_size)
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        center = tuple(rng.uniform(-110000, 110000, 2)) if rng.random() < 0.5 else tuple(points[rng.integers(len(points))])
+        k = int(rng.choice([1, 2, 7, 16, 100]))
+        items, distances = tree.query_nearest(center, k)
+
+        expected = np.sort(_distances(points, center))[:k]
+        np.testing.assert_allclose(distances, expected, rtol=1e-12)
+        np.testing.assert_allclose(_distances(points[items], center), distances, rtol=1e-12)
+        assert len(set(items.tolist())) == k
+
+
+@pytest.mark.parametrize('leaf_size', [1, 16, 256])
+def test_query_radius_matches_brute_force(leaf_size):
+    points = _points(2)
+    tree = KDTree(points, leaf_size)
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        center = tuple(rng.uniform(-110000, 110000, 2))
+        radius = float(rng.choice([0.0, 100.0, 2000.0, 30000.0, 300000.0]))
+        expected = np.flatnonzero(_distances(points, center) <= radius)
+        np.testing.assert_array_equal(tree.query_radius(center, radius), expected)
+
+
+def test_small_and_empty_trees():
+    empty = KDTree(np.empty((0, 2)))
+    assert len(empty) == 0
+    assert empty.query_nearest((0, 0), 3)[0].size == 0 and empty.query_radius((0, 0), 1e9).size == 0
+
+    tree = KDTree(np.array([[0.0, 0.0], [3.0, 4.0], [10.0, 0.0]]))
+    items, distances = tree.query_nearest((0.0, 0.0), 10)      # k larger than the tree
+    assert items.tolist() == [0, 1, 2] and distances.tolist() == [0.0, 5.0, 10.0]
+    assert tree.query_nearest((0.0, 0.0), 0)[0].size == 0
+    assert tree.query_radius((0.0, 0.0), 5.0).tolist() == [0, 1]
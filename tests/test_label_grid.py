@@ -0,0 +1,58 @@
+"""
+LabelGrid: the vectorized free_mask() prefilter against per-box is_free()
+"""
+import numpy as np
+
+from engine.logic.label_grid import LabelGrid
+
+
+def _random_boxes(rng, count: int, size) -> np.ndarray:
+    width, height = size
+    # boxes partly or fully off the grid included
+    x = rng.integers(-80, width + 20, count)
+    y = rng.integers(-40, height + 20, count)
+    return np.column_stack((x, y, rng.integers(1, 90, count), rng.integers(1, 40, count)))
+
+
+def test_free_mask_matches_is_free():
+    rng = np.random.default_rng(0)
+    size = (1060, 1000)
+    for cell_size in (1, 8, 13):
+        grid = LabelGrid(size, cell_size)
+        for _ in range(20):
+            for x, y, w, h in _random_boxes(rng, 15, size).tolist():
+                grid.occupy(x, y, w, h)
+            grid.occupy_points(rng.integers(-10, 1070, (30, 2)), radius=1)
+
+            boxes = _random_boxes(rng, 300, size)
+            expected = [grid.is_free(x, y, w, h) for x, y, w, h in boxes.tolist()]
+            assert grid.free_mask(boxes).tolist() == expected
+            assert any(expected) and not all(expected)
+        grid.clear()
+        assert grid.free_mask(_random_boxes(rng, 50, size)).all()
+
+
+def test_placed_labels_never_overlap():
+    rng = np.random.default_rng(1)
+    grid = LabelGrid((800, 600), 8)
+    placed = []
+    boxes = _random_boxes(rng, 500, (800, 600))
+    # off-grid parts count as free, only boxes fully on the grid are guaranteed apart
+    boxes = boxes[(boxes[:, 0] >= 0) & (boxes[:, 1] >= 0) & (boxes[:, 0] + boxes[:, 2] <= 800) & (boxes[:, 1] + boxes[:, 3] <= 600)]
+    for x, y, w, h in boxes.tolist():
+        if grid.is_free(x, y, w, h):
+            grid.occupy(x, y, w, h)
+            placed.append((x, y, w, h))
+
+    assert len(placed) > 10
+    for i, (ax, ay, aw, ah) in enumerate(placed):
+        for bx, by, bw, bh in placed[i + 1:]:
+            # boxes can share a grid cell edge but never cover the same pixel
+            assert ax + aw <= bx or bx + bw <= ax or ay + ah <= by or by + bh <= ay
+
+
+def test_points_mark_their_cells():
+    grid = LabelGrid((64, 64), 8)
+    grid.occupy_points(np.array([[20, 20], [-5, 3], [100, 100]]), radius=0)
+    assert grid.cells.sum() == 1 and grid.cells[2, 2]
+    assert not grid.is_free(16, 16, 1, 1) and grid.is_free(24, 16, 8, 8)
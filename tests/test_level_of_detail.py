@@ -0,0 +1,120 @@
+"""
+LevelOfDetail: tier assignment, phase offsets and the dt a coarse row builds up between its updates
+"""
+import numpy as np
+import pytest
+
+from data.config.gameplay_config_settings import LOD_SETTINGS
+from source.simulation.fleet_state import FleetState
+from source.simulation.level_of_detail import LevelOfDetail
+
+DT = 0.1
+FAR = LOD_SETTINGS['tiers'][-1]['update_interval']
+
+
+def _cruising(fleet: FleetState, start, destination) -> int:
+    """A row already at max speed with a deceleration so high it brakes on its last step only (exact under any dt)."""
+    row = fleet.add(None, start)
+    fleet.destinations[row] = destination
+    fleet.has_destination[row] = True
+    fleet.speeds[row] = fleet.max_speeds[row] = 100.0
+    fleet.accelerations[row] = 50.0
+    fleet.decelerations[row] = 1e9
+    return row
+
+
+def test_tiers_and_phases():
+    lod = LevelOfDetail()
+    fleet = FleetState(capacity=16)
+    distances = [0.0, 5999.0, 6001.0, 19999.0, 20001.0, 1e6]
+    for i, distance in enumerate(distances * 2):
+        fleet.add(None, (distance, 0.0) if i < len(distances) else (0.0, -distance))
+    rows = np.arange(fleet.count)
+
+    lod.assign_tiers(fleet, rows, (0.0, 0.0), now=0.0)
+    intervals = [interval for interval in (1, 1, 4, 4, FAR, FAR)] * 2
+    np.testing.assert_array_equal(fleet.lod_intervals[rows], intervals)
+    np.testing.assert_array_equal(fleet.lod_phases[rows], rows % intervals)
+    np.testing.assert_array_equal(lod.tier_counts, [4, 4, 4])
+
+    # throttled until reassign_interval has passed, then rows are moved between tiers
+    fleet.positions[0] = (1e6, 0.0)
+    lod.assign_tiers(fleet, rows, (0.0, 0.0), now=LOD_SETTINGS['reassign_interval'] / 2)
+    assert fleet.lod_intervals[0] == 1
+    lod.assign_tiers(fleet, rows, (0.0, 0.0), now=LOD_SETTINGS['reassign_interval'])
+    assert fleet.lod_intervals[0] == FAR
+    np.testing.assert_array_equal(lod.tier_counts, [3, 4, 5])
+
+
+def test_every_row_is_due_once_per_interval():
+    lod = LevelOfDetail()
+    fleet = FleetState(capacity=64)
+    for i in range(60):
+        fleet.add(None, (1000.0 * i, 0.0))
+    rows = np.arange(fleet.count)
+    lod.assign_tiers(fleet, rows, (0.0, 0.0), now=0.0)
+
+    due = np.zeros(fleet.count, dtype=np.int64)
+    for tick in range(FAR * 3):
+        ready, row_dt = lod.due_rows(fleet, DT, tick)
+        due[ready] += 1
+        if tick >= FAR:     # once every row had its first update, each update carries exactly one interval
+            np.testing.assert_allclose(row_dt, fleet.lod_intervals[ready] * DT)
+    np.testing.assert_array_equal(due, FAR * 3 // fleet.lod_intervals[rows])
+
+    # coarse rows are spread over their interval instead of all landing on the same tick
+    far = rows[fleet.lod_intervals[rows] == FAR]
+    assert len(set(far % FAR)) == min(len(far), FAR)
+
+
+def test_inactive_rows_do_not_build_up_time():
+    lod = LevelOfDetail()
+    fleet = FleetState(capacity=4)
+    row = fleet.add(None, (1e6, 0.0))
+    lod.assign_tiers(fleet, np.array([row]), (0.0, 0.0), now=0.0)
+    fleet.active[row] = False
+    for tick in range(FAR * 2):
+        lod.due_rows(fleet, DT, tick)
+    fleet.active[row] = True
+
+    ready, row_dt = [], []
+    for tick in range(FAR * 2, FAR * 3):
+        rows, dt = lod.due_rows(fleet, DT, tick)
+        ready += rows.tolist()
+        row_dt += dt.tolist()
+    assert ready == [row]
+    assert row_dt == [pytest.approx(DT)]    # due on the first tick back (phase 0), with that tick only
+
+
+def test_far_row_matches_full_rate_row():
+    lod = LevelOfDetail()
+    fleet = FleetState(capacity=4)
+    offset = np.array([0.0, 1e6])      # same flight, one copy out in the far tier
+    near = _cruising(fleet, (0.0, 0.0), (2345.6, 789.0))
+    far = _cruising(fleet, offset, offset + (2345.6, 789.0))
+    rows = np.array([near, far])
+    lod.assign_tiers(fleet, rows, (0.0, 0.0), now=0.0)
+    assert fleet.lod_intervals[near] == 1 and fleet.lod_intervals[far] == FAR
+
+    applied = np.zeros(fleet.count)
+    arrival = {}
+    ticks = 400
+    for tick in range(ticks):
+        ready, row_dt = lod.due_rows(fleet, DT, tick)
+        fleet.update_flight(row_dt, ready)
+        applied[ready] += row_dt
+        for row in rows.tolist():
+            # on the destination, the arrival snap (has_destination cleared) only comes with the next step
+            if row not in arrival and np.array_equal(fleet.positions[row], fleet.destinations[row]):
+                arrival[row] = tick * DT
+
+        if far in ready.tolist():
+            # whenever the far row is stepped it has caught up with exactly the time it skipped
+            assert applied[far] == pytest.approx(applied[near], abs=1e-9)
+            np.testing.assert_allclose(fleet.positions[far] - offset, fleet.positions[near], atol=1e-6)
+
+    assert applied[far] + fleet.lod_elapsed[far] == pytest.approx(ticks * DT)
+    assert applied[near] == pytest.approx(ticks * DT)
+    np.testing.assert_array_equal(fleet.positions[far] - offset, fleet.positions[near])
+    assert set(arrival) == {near, far}
+    assert 0.0 <= arrival[far] - arrival[near] <= FAR * DT
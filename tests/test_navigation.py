@@ -0,0 +1,129 @@
+"""
+NavigationGraph: kNN edges against brute force, A* against Dijkstra, the shared path cache and save/load
+"""
+import heapq
+import math
+
+import numpy as np
+import pytest
+
+from data.config.gameplay_config_settings import NAVIGATION_SETTINGS
+from source.classes.location._location import Location
+from source.simulation.navigation import NavigationGraph
+
+
+def _locations(positions) -> list[Location]:
+    return [
+        Location({
+            'location': {'coordinates': [float(x), float(y)], 'location_parent_tag': None},
+            'info': {'name': f'loc {i}', 'tag': f'loc_{i}', 'location_type': 'asteroid', 'description': ''},
+            'flags': {'is_hidden': False},
+        }) for i, (x, y) in enumerate(positions)
+    ]
+
+
+def _graph(count: int = 400, seed: int = 0, **settings) -> NavigationGraph:
+    rng = np.random.default_rng(seed)
+    positions = np.concatenate((rng.uniform(-20000, 20000, (count - count // 4, 2)), rng.normal(5000, 300, (count // 4, 2))))
+    return NavigationGraph(_locations(positions), {**NAVIGATION_SETTINGS, **settings})
+
+
+def _dijkstra(graph: NavigationGraph, start: int, goal: int) -> float:
+    distances = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if node == goal:
+            return cost
+        if cost > distances[node]:
+            continue
+        for i in range(graph.indptr[node], graph.indptr[node + 1]):
+            nxt, new_cost = int(graph.neighbors[i]), cost + float(graph.weights[i])
+            if new_cost < distances.get(nxt, math.inf):
+                distances[nxt] = new_cost
+                heapq.heappush(heap, (new_cost, nxt))
+    return math.inf
+
+
+def _path_cost(graph: NavigationGraph, path: tuple) -> float:
+    cost = 0.0
+    for a, b in zip(path, path[1:]):
+        lo, hi = graph.indptr[a], graph.indptr[a + 1]
+        hop = np.flatnonzero(graph.neighbors[lo:hi] == b)
+        assert hop.size == 1, f"{a} -> {b} is not an edge"
+        cost += float(graph.weights[lo + hop[0]])
+    return cost
+
+
+def test_edges_link_k_nearest_and_are_symmetric():
+    graph = _graph()
+    k = graph.neighbor_count
+    edges = {tuple(e) for e in graph._edges().tolist()}
+    assert all((b, a) in edges for a, b in edges)
+
+    for i, position in enumerate(graph.positions):
+        distances = np.linalg.norm(graph.positions - position, axis=1)
+        distances[i] = np.inf
+        nearest = np.argsort(distances, kind='stable')[:k]
+        assert all((i, int(j)) in edges for j in nearest)
+    np.testing.assert_allclose(
+        graph.weights, np.linalg.norm(graph.positions[graph._edges()[:, 1]] - graph.positions[graph._edges()[:, 0]], axis=1))
+
+
+def test_a_star_matches_dijkstra():
+    graph = _graph()
+    rng = np.random.default_rng(1)
+    for start, goal in rng.integers(0, len(graph), (150, 2)).tolist():
+        path = graph.shortest_path(start, goal)
+        expected = _dijkstra(graph, start, goal)
+        assert path is not None and path[0] == start and path[-1] == goal
+        assert _path_cost(graph, path) == pytest.approx(expected, rel=1e-12)
+
+
+def test_unreachable_goal_and_edge_changes():
+    # two far apart clusters and a range limit: no edge between them
+    positions = [(0, 0), (100, 0), (200, 0), (50000, 0), (50100, 0)]
+    graph = NavigationGraph(_locations(positions), {**NAVIGATION_SETTINGS, 'neighbors': 2, 'max_edge_range': 1000})
+    assert graph.shortest_path(0, 4) is None
+    assert graph.shortest_path(2, 2) == (2,)
+
+    graph.add_edge(2, 3)
+    path = graph.shortest_path(0, 4)
+    assert path[-3:] == (2, 3, 4) and _path_cost(graph, path) == pytest.approx(50100.0)
+    graph.remove_edge(2, 3)
+    assert graph.shortest_path(4, 0) is None
+
+
+def test_path_cache_is_shared_and_undirected():
+    graph = _graph(200, seed=2)
+    forward = graph.shortest_path(3, 150)
+    assert graph.stats == {'hits': 0, 'misses': 1}
+    assert graph.shortest_path(150, 3) == forward[::-1]
+    assert graph.shortest_path(3, 150) == forward
+    assert graph.stats == {'hits': 2, 'misses': 1}
+
+    route = graph.route(graph.locations[3], graph.locations[150])
+    assert [graph.node_of[id(loc)] for loc in route] == list(forward)
+
+    version = graph.version
+    graph.add_edge(3, 150)
+    assert graph.version == version + 1 and graph.shortest_path(3, 150) == (3, 150)
+
+
+def test_save_and_load(tmp_path):
+    graph = _graph(200, seed=3)
+    paths = {pair: graph.shortest_path(*pair) for pair in [(0, 199), (5, 17), (42, 42)]}
+    path = str(tmp_path / 'navigation.npz')
+    graph.save(path)
+
+    loaded = NavigationGraph.load(path, graph.locations)
+    np.testing.assert_array_equal(loaded.indptr, graph.indptr)
+    np.testing.assert_array_equal(loaded.neighbors, graph.neighbors)
+    assert {pair: loaded.shortest_path(*pair) for pair in paths} == paths
+    assert loaded.stats['misses'] == 0
+
+    # a graph saved for other positions or settings is not reused
+    moved = _locations(graph.positions + 1.0)
+    assert NavigationGraph.load(path, moved) is None
+    assert NavigationGraph.load(path, graph.locations, {**NAVIGATION_SETTINGS, 'neighbors': 3}) is None
+    assert NavigationGraph.load(str(tmp_path / 'missing.npz'), graph.locations) is None
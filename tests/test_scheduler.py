@@ -0,0 +1,55 @@
+"""
+WakeupScheduler against a plain dict of pending wakeups
+"""
+import random
+
+from source.simulation.scheduler import WakeupScheduler
+
+
+def test_random_operations_match_reference():
+    rng = random.Random(0)
+    scheduler = WakeupScheduler()
+    reference: dict[int, float] = {}        # object -> wakeup time
+    now = 0.0
+
+    for _ in range(5000):
+        op = rng.random()
+        obj = rng.randrange(200)
+        if op < 0.5:
+            when = now + rng.uniform(0, 20)
+            scheduler.schedule(obj, when)
+            reference[obj] = when
+        elif op < 0.6:
+            scheduler.cancel(obj)
+            reference.pop(obj, None)
+        else:
+            now += rng.uniform(0, 2)
+            due = scheduler.pop_due(now)
+            expected = sorted((when, o) for o, when in reference.items() if when <= now)
+            assert due == [o for _, o in expected]
+            for o in due:
+                del reference[o]
+
+        assert len(scheduler) == len(reference)
+        assert scheduler.next_wakeup() == (min(reference.values()) if reference else None)
+
+    assert scheduler.pending() == sorted(((when, o) for o, when in reference.items()), key=lambda e: e[0])
+
+
+def test_reschedule_replaces_earlier_entry():
+    scheduler = WakeupScheduler()
+    scheduler.schedule('ship', 1.0)
+    scheduler.schedule('ship', 5.0)
+    assert scheduler.pop_due(2.0) == []
+    assert scheduler.pop_due(5.0) == ['ship']
+    assert scheduler.pop_due(10.0) == [] and len(scheduler) == 0
+
+
+def test_cancelled_object_never_fires():
+    scheduler = WakeupScheduler()
+    scheduler.schedule('a', 1.0)
+    scheduler.schedule('b', 2.0)
+    scheduler.cancel('a')
+    scheduler.cancel('missing')
+    assert scheduler.next_wakeup() == 2.0
+    assert scheduler.pop_due(3.0) == ['b']
@@ -0,0 +1,88 @@
+"""
+ShipTemplate sharing and copy-on-write ModuleState: per-ship writes never reach the template or other ships
+"""
+import json
+
+import pytest
+
+from source.classes.ship.ship_class import Ship
+from source.classes.ship.ship_template import ShipTemplate
+
+DEFINITION = {
+    'info': {'tag': 'gunship_01', 'name': 'Gunship 01', 'vessel_type': 'ship', 'ship_type': 'gunship',
+             'description': 'test ship'},
+    'location': {'coordinates': [0.0, 0.0]},
+    'engine': {'fuel_use_p_Mm': 1.2, 'durability': 100},
+    'fuel': {'capacity': 60, 'durability': 200},
+    'hull': {'armor': 10, 'durability': 200},
+    'weapons': {
+        'pdc': {'name': 'PDC', 'tag': 'pdc', 'type': ['attack'], 'storage': 20},
+        'torpedo': {'name': 'Torpedo', 'tag': 'torpedo', 'type': ['attack'], 'storage': 12,
+                    'guidance': {'mode': 'active', 'retargets': 2}},
+    },
+    'sensors': {'radar_sensor': {'range_Mm': 1.0, 'accuracy': 0.7}},
+    'signature': {'heat': 0.5, 'reflect': 0.6, 'radar': 0.12},
+}
+
+
+@pytest.fixture
+def template():
+    return ShipTemplate(DEFINITION)
+
+
+def test_ships_from_one_template_have_independent_ammo(template):
+    first, second = Ship(template), Ship(template)
+
+    first.weapons['pdc']['storage'] -= 1
+    first.weapons['pdc']['storage'] -= 1
+    second.weapons['torpedo']['storage'] -= 3
+
+    assert first.weapons['pdc']['storage'] == 18 and second.weapons['pdc']['storage'] == 20
+    assert first.weapons['torpedo']['storage'] == 12 and second.weapons['torpedo']['storage'] == 9
+    assert template['weapons']['pdc']['storage'] == 20 and template['weapons']['torpedo']['storage'] == 12
+    assert Ship(template).weapons == template['weapons']
+
+
+def test_deeper_nested_write_copies_only_its_entry(template):
+    ship = Ship(template)
+    ship.weapons['torpedo']['guidance']['retargets'] = 0
+
+    assert ship.weapons['torpedo']['guidance'] == {'mode': 'active', 'retargets': 0}
+    assert template['weapons']['torpedo']['guidance']['retargets'] == 2
+    assert list(ship._module_changes['weapons']) == ['torpedo']    # pdc still reads from the template
+
+
+def test_top_level_writes_and_reset(template):
+    first, second = Ship(template), Ship(template)
+    first.hull['durability'] = 150
+    first.sensors['radar_sensor']['range_Mm'] = 2.0
+
+    assert first.hull['durability'] == 150 and second.hull['durability'] == 200
+    assert dict(first.hull) == {'armor': 10, 'durability': 150}
+    assert first.sensors['radar_sensor']['range_Mm'] == 2.0 and second.sensors['radar_sensor']['range_Mm'] == 1.0
+
+    first.hull.reset()
+    first.sensors['radar_sensor'].reset()
+    assert first.hull['durability'] == 200 and first.sensors['radar_sensor']['range_Mm'] == 1.0
+
+
+def test_untouched_ship_stores_nothing(template):
+    ship = Ship(template)
+    assert ship.weapons['pdc']['storage'] == 20 and len(ship.weapons['torpedo']) == 5
+    assert ship._module_changes is None
+
+
+def test_changes_are_plain_json(template):
+    ship = Ship(template)
+    ship.weapons['pdc']['storage'] = 5
+    ship.fuel_cell['capacity'] = 30
+    # world snapshots store _module_changes as JSON
+    assert json.loads(json.dumps(ship._module_changes)) == {
+        'weapons': {'pdc': {'name': 'PDC', 'tag': 'pdc', 'type': ['attack'], 'storage': 5}},
+        'fuel': {'capacity': 30},
+    }
+
+
+def test_template_itself_is_read_only(template):
+    with pytest.raises(TypeError):
+        template['weapons']['pdc']['storage'] = 0
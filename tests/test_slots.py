@@ -0,0 +1,93 @@
+"""
+Slot-based Location / Vessel hierarchies: no instance __dict__ anywhere, and the per-object memory figures
+quoted in the Location and Vessel docstrings still hold
+"""
+import tracemalloc
+
+import pytest
+
+from source.classes.AI.AI_controller import AIController
+from source.classes.location._location import Location
+from source.classes.location.station_class import Station
+from source.classes.player.player import Player
+from source.classes.ship._vessel import Vessel
+from source.classes.ship.ship_class import Ship
+from source.classes.ship.ship_template import ShipTemplate
+from source.simulation.fleet_state import FleetState
+from utility.tools.dataloader import Dataloader
+
+HIERARCHY = (Location, Station, Vessel, Ship, Player, AIController)
+
+# figures quoted in the class docstrings, (docstring text, bytes), the measurement must stay within TOLERANCE
+DOCUMENTED = {
+    Station: ("~520 -> ~260 bytes per object", 260),
+    AIController: ("~3.1 KB -> ~0.4 KB", 400),
+    FleetState: ("~0.9 KB per FleetState row", 900),
+}
+DOCSTRING_OF = {Station: Location, AIController: Vessel, FleetState: Vessel}
+TOLERANCE = 0.25
+SAMPLE = 4000
+
+
+@pytest.fixture(scope='module')
+def data():
+    return Dataloader().load_data()
+
+
+@pytest.fixture(scope='module')
+def station_data(data):
+    return next(iter(data['stations']['station_data_generated']['game'].values()))
+
+
+@pytest.fixture(scope='module')
+def ship_template(data):
+    return ShipTemplate(next(iter(data['ships']['ship_data']['game'].values())))
+
+
+def _instances(station_data, ship_template):
+    fleet = FleetState(capacity=8)
+    return [
+        Location(station_data), Station(station_data), Vessel(ship_template, fleet), Ship(ship_template, fleet),
+        Player(ship_template, fleet), AIController(ship_template, [], fleet=fleet),
+    ]
+
+
+@pytest.mark.parametrize('cls', HIERARCHY, ids=lambda cls: cls.__name__)
+def test_every_class_declares_slots(cls):
+    for klass in cls.__mro__[:-1]:
+        assert '__slots__' in vars(klass), f"{klass.__name__} has no __slots__, its instances get a __dict__"
+
+
+def test_instances_have_no_dict(station_data, ship_template):
+    for obj in _instances(station_data, ship_template):
+        assert not hasattr(obj, '__dict__'), type(obj).__name__
+        with pytest.raises(AttributeError):
+            obj.not_a_slot = 1
+
+
+def _bytes_per_object(build) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = build()
+        return (tracemalloc.get_traced_memory()[0] - before) / SAMPLE
+    finally:
+        del objects
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('cls', list(DOCUMENTED), ids=lambda cls: cls.__name__)
+def test_documented_memory_per_object(cls, station_data, ship_template):
+    text, documented = DOCUMENTED[cls]
+    assert text in DOCSTRING_OF[cls].__doc__, f"{DOCSTRING_OF[cls].__name__} docstring no longer quotes {text!r}"
+
+    if cls is Station:
+        measured = _bytes_per_object(lambda: [Station(station_data) for _ in range(SAMPLE)])
+    elif cls is AIController:
+        fleet = FleetState(capacity=SAMPLE)     # rows are counted separately, no growth while measuring
+        measured = _bytes_per_object(lambda: [AIController(ship_template, [], fleet=fleet) for _ in range(SAMPLE)])
+    else:
+        measured = _bytes_per_object(lambda: FleetState(capacity=SAMPLE))
+
+    assert abs(measured - documented) <= documented * TOLERANCE, \
+        f"{cls.__name__}: measured {measured:.0f} B per object, docstring says {documented} B"
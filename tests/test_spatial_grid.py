@@ -0,0 +1,43 @@
+"""
+SpatialGrid range queries against a brute force distance test
+"""
+import numpy as np
+import pytest
+
+from engine.logic.spatial_grid import SpatialGrid
+
+
+def _brute_force(positions: np.ndarray, center, radius: float) -> np.ndarray:
+    delta = positions - center
+    return np.flatnonzero(np.einsum('ij,ij->i', delta, delta) <= radius * radius)
+
+
+@pytest.mark.parametrize('cell_size', [50.0, 1000.0, 25000.0])
+def test_query_radius_matches_brute_force(cell_size):
+    rng = np.random.default_rng(0)
+    # uniform field plus a dense cluster, negative coordinates included
+    positions = np.concatenate((rng.uniform(-50000, 50000, (4000, 2)), rng.normal(3000, 200, (1000, 2))))
+    grid = SpatialGrid(cell_size)
+    grid.build(positions)
+
+    for _ in range(200):
+        center = tuple(rng.uniform(-55000, 55000, 2))
+        radius = float(rng.choice([0.0, 10.0, 500.0, 5000.0, 40000.0]))
+        np.testing.assert_array_equal(grid.query_radius(center, radius), _brute_force(positions, center, radius))
+
+
+def test_points_on_cell_edges_and_circle_boundary():
+    positions = np.array([[0.0, 0.0], [100.0, 0.0], [-100.0, 0.0], [0.0, -100.0], [100.0, 100.0]])
+    grid = SpatialGrid(100.0)
+    grid.build(positions)
+    # the circle includes its boundary, items exactly radius away are returned
+    np.testing.assert_array_equal(grid.query_radius((0.0, 0.0), 100.0), [0, 1, 2, 3])
+
+
+def test_empty_and_rebuilt_index():
+    grid = SpatialGrid(10.0)
+    assert grid.query_radius((0.0, 0.0), 1e9).size == 0
+    grid.build(np.array([[5.0, 5.0]]))
+    assert grid.query_radius((0.0, 0.0), 10.0).tolist() == [0]
+    grid.build(np.empty((0, 2)))
+    assert len(grid) == 0 and grid.query_radius((0.0, 0.0), 10.0).size == 0
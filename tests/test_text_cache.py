@@ -0,0 +1,64 @@
+"""
+Text cache: quantised labels and the bounded LRU of rendered surfaces
+"""
+import pygame
+import pytest
+
+from engine.renderers.text_cache import TextCache, distance_label, quantize
+
+
+@pytest.fixture(scope='module')
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 16)
+
+
+@pytest.mark.parametrize('value, step, expected', [
+    (347.0, 10, 350),
+    (347.0, 5, 345),
+    (0.34, 0.1, 0.3),
+    (4.26, 0.1, 4.3),
+    (1.337, 0.25, 1.25),
+    (0.123456, 1e-05, 0.12346),
+    (12345.0, 1e3, 12000),
+    (-0.07, 0.1, -0.1),
+])
+def test_quantize(value, step, expected):
+    result = quantize(value, step)
+    assert result == expected
+    assert type(result) is type(expected)
+    assert repr(result) == repr(expected)      # no float noise such as 0.30000000000000004
+
+
+def test_distance_label():
+    assert distance_label(0.3472, 10, 0.1) == '350 km'
+    assert distance_label(0.9999, 10, 0.1) == '1000 km'
+    assert distance_label(1.0, 10, 0.1) == '1.0 Mm'
+    assert distance_label(4.26, 10, 0.1) == '4.3 Mm'
+    assert distance_label(12.7, 10, 1) == '13 Mm'
+    # nearby distances share a label (and so a cached surface)
+    assert len({distance_label(d, 10, 0.1) for d in (4.21, 4.23, 4.249)}) == 1
+
+
+def test_hits_misses_and_lru_eviction(font):
+    cache = TextCache(capacity=3)
+    a = cache.render(font, 'a', (0, 255, 0))
+    assert cache.render(font, 'a', (0, 255, 0)) is a
+    assert cache.stats == {'hits': 1, 'misses': 1}
+
+    # colour, antialias and background are part of the key
+    assert cache.render(font, 'a', (255, 0, 0)) is not a
+    cache.render(font, 'a', (0, 255, 0), antialias=False)
+    assert cache.stats == {'hits': 1, 'misses': 3} and len(cache) == 3
+
+    # 'a' green was used last before 'a' red, touching it makes 'a' red the least recently used
+    cache.render(font, 'a', (0, 255, 0))
+    cache.render(font, 'b', (0, 255, 0))
+    assert len(cache) == 3
+    assert cache.render(font, 'a', (0, 255, 0)) is a
+    hits, misses = cache.stats['hits'], cache.stats['misses']
+    cache.render(font, 'a', (255, 0, 0))
+    assert cache.stats == {'hits': hits, 'misses': misses + 1}     # evicted, rendered again
+
+    cache.clear()
+    assert len(cache) == 0
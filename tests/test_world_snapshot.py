@@ -0,0 +1,147 @@
+"""
+World snapshots: capture -> write -> read -> restore round trip, and snapshots of a sharded world
+"""
+import random
+
+import numpy as np
+import pytest
+
+from engine.managers.world_manager import WorldManager
+from engine.managers.world_snapshot import WorldSnapshot
+from source.classes.AI.AI_controller import AIController
+from source.simulation.fleet_state import FleetState
+
+DT = 1 / 60
+
+
+def _world(sharded: bool = False, ships: int = 60) -> WorldManager:
+    world = WorldManager(sharded=sharded)
+    world.logger.logger_enabled = False
+    world.scale_spawn_table(ships)
+    world.load()
+    return world
+
+
+def _fleet_columns(world: WorldManager) -> dict:
+    fleet = world.fleet
+    return fleet.export_rows(np.arange(fleet.count), tuple(fleet._columns()))
+
+
+def _ai_state(world: WorldManager) -> list:
+    location_index = {id(loc): i for i, loc in enumerate(world.locations)}
+
+    def index(obj):
+        if obj is None or isinstance(obj, tuple):
+            return obj
+        return location_index[id(obj)] if id(obj) in location_index else ('vessel', obj.row)
+
+    return [
+        (v.tag, v.state, index(v.destination), index(v.last_location), [location_index[id(h)] for h in v.itinerary])
+        for v in world.vessels if isinstance(v, AIController)
+    ]
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_round_trip_restores_the_world(tmp_path, mmap):
+    random.seed(7)
+    world = _world()
+    for _ in range(300):
+        world.update(DT)
+
+    path = str(tmp_path / 'world.snap')
+    world.save_snapshot(path, background=True).join()
+
+    restored = WorldManager()
+    restored.logger.logger_enabled = False
+    restored.load_snapshot(path, mmap=mmap)
+
+    assert restored.clock.now == world.clock.now and restored.clock.ticks == world.clock.ticks
+    assert [loc.coordinates for loc in restored.locations] == [loc.coordinates for loc in world.locations]
+    assert [loc.name for loc in restored.locations] == [loc.name for loc in world.locations]
+    for name, values in _fleet_columns(world).items():
+        np.testing.assert_array_equal(_fleet_columns(restored)[name], values, err_msg=name)
+    assert _ai_state(restored) == _ai_state(world)
+    assert [(when, obj.row) for when, obj in restored.scheduler.pending()] == \
+           [(when, obj.row) for when, obj in world.scheduler.pending()]
+    assert restored.player.row == world.player.row and restored.player.name == world.player.name
+
+
+def test_restored_world_continues_like_the_original(tmp_path):
+    random.seed(11)
+    world = _world()
+    for _ in range(120):
+        world.update(DT)
+    path = str(tmp_path / 'world.snap')
+    world.save_snapshot(path, background=False)
+    state = random.getstate()
+
+    for _ in range(600):
+        world.update(DT)
+    expected = world.fleet.positions[:world.fleet.count].copy(), _ai_state(world)
+
+    random.setstate(state)
+    restored = WorldManager()
+    restored.logger.logger_enabled = False
+    restored.load_snapshot(path)        # also restores the rng state captured with the snapshot
+    for _ in range(600):
+        restored.update(DT)
+
+    np.testing.assert_allclose(restored.fleet.positions[:restored.fleet.count], expected[0])
+    assert _ai_state(restored) == expected[1]
+
+
+def test_sharded_snapshot_keeps_queued_ai_decisions(tmp_path):
+    random.seed(1)
+    world = _world(sharded=True, ships=10)
+    try:
+        # ships wake after their 2 s idle time, their new destinations wait in push_controls for the next step
+        for _ in range(121):
+            world.update(DT)
+        queued = sorted(set().union(*world.shards._pending_controls))
+        assert queued, "no AI decision queued, the regression is not exercised"
+        before = world.fleet.export_rows(np.array(queued), ('destinations', 'has_destination', 'active'))
+
+        snapshot = WorldSnapshot.capture(world)
+
+        after = world.fleet.export_rows(np.array(queued), ('destinations', 'has_destination', 'active'))
+        for name, values in before.items():
+            np.testing.assert_array_equal(after[name], values, err_msg=name)
+            np.testing.assert_array_equal(snapshot.arrays[f'fleet/{name}'][queued], values, err_msg=name)
+
+        # the woken ships actually fly: the workers got the decisions, not their own stale columns back
+        start = world.fleet.positions[queued].copy()
+        for _ in range(60):
+            world.update(DT)
+        world.shards.sync_all()
+        moved = np.linalg.norm(world.fleet.positions[queued] - start, axis=1)
+        traveling = [row for row in queued if world.fleet.active[row]]
+        assert traveling and (moved[[queued.index(row) for row in traveling]] > 0).all()
+    finally:
+        world.shards.close()
+
+
+def test_snapshot_is_not_changed_by_the_running_world(tmp_path):
+    random.seed(3)
+    world = _world(ships=20)
+    ship = world.vessels[0]
+    ship.sensors['radar_sensor']['range_Mm'] = 3.0
+    ranges = [v.sensors['radar_sensor']['range_Mm'] for v in world.vessels]
+    snapshot = WorldSnapshot.capture(world)
+
+    # the frame loop keeps going while the background write has not started yet
+    ship.sensors['radar_sensor']['range_Mm'] = 9.0
+    for vessel in world.vessels[1:]:
+        vessel.sensors['radar_sensor']['range_Mm'] = 42.0
+    world.SHIP_SPAWN_TABLE[next(iter(world.SHIP_SPAWN_TABLE))] += 100
+    world.SHIP_SPAWN_RANGE['x'][0] -= 100
+    spawn_table, spawn_range = snapshot.meta['spawn_table'], snapshot.meta['spawn_range']
+
+    path = str(tmp_path / 'world.snap')
+    snapshot.write_in_background(path).join()
+    restored = WorldManager()
+    restored.logger.logger_enabled = False
+    restored.load_snapshot(path)
+
+    assert [v.sensors['radar_sensor']['range_Mm'] for v in restored.vessels] == ranges
+    assert restored.SHIP_SPAWN_TABLE == spawn_table != world.SHIP_SPAWN_TABLE
+    assert restored.SHIP_SPAWN_RANGE == spawn_range != world.SHIP_SPAWN_RANGE
@@ -0,0 +1,196 @@
+"""
+Indexed data packs
+
+A data pack is a JSON data file opened through a byte offset index instead of a full json.load. The
+index records where every entry of every top-level section starts and ends, e.g. each station under
+station_data_generated.json's 'game' section. Entries are decoded on first access and kept in a small
+LRU, so memory and decode time follow what a session touches rather than the size of the catalogue.
+
+Decoded entries are shared between callers (and with the LRU): treat them as read-only templates.
+
+Packs only pay off for callers that read individual entries (lookups by key, tools and editors, a world
+that needs a few ship types out of a large table). Iterating a whole section still decodes every entry
+once, and the LRU then only holds the tail of the walk. WorldManager.load() builds a Location for every
+station in the catalogue, so on that path pack mode saves nothing and startup and memory still grow with
+the catalogue.
+"""
+import json
+import mmap
+import re
+from collections import OrderedDict
+from collections.abc import Mapping
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class DataPack:
+    def __init__(self, file_path: str, index: dict, cache_entries: int = 256):
+        """
+        :param file_path: JSON data file the index was built from
+        :param index: result of DataPack.build_index() for the current file contents
+        :param cache_entries: decoded entries kept in the LRU
+        """
+        self.file_path = file_path
+        self.index = index
+        self.cache_entries = cache_entries
+
+        self._cache: OrderedDict[tuple[str, str], object] = OrderedDict()
+        self._file = None
+        self._map = None
+        self.stats = {'hits': 0, 'misses': 0}
+
+
+    def __repr__(self):
+        return f"DataPack('{self.file_path}', sections={list(self.index['sections'])})"
+
+
+    @staticmethod
+    def build_index(raw: bytes) -> dict:
+        """
+        Scan a JSON document and record the byte range of every entry of its object-valued top-level sections
+
+        :param raw: file contents (utf-8)
+        :return: {'sections': {section: {key: (offset, length)}}, 'values': {key: value}} where values holds
+            top-level members that are not objects (decoded directly, they are small)
+        """
+        text = raw.decode('utf-8')
+        decoder = json.JSONDecoder()
+        ascii_only = len(text) == len(raw)
+
+        # char index -> byte offset, offsets are requested in increasing order
+        last = [0, 0]
+        def byte_offset(i: int) -> int:
+            if ascii_only:
+                return i
+            last[1] += len(text[last[0]:i].encode('utf-8'))
+            last[0] = i
+            return last[1]
+
+        def members(pos: int):
+            """yield (key, value position) of the object starting at pos, then its end position"""
+            if text[pos] != '{':
+                raise ValueError(f"expected an object at char {pos}")
+            pos = _WHITESPACE.match(text, pos + 1).end()
+            if text[pos] == '}':
+                yield None, pos + 1
+                return
+            while True:
+                key, pos = json.decoder.scanstring(text, pos + 1)
+                pos = _WHITESPACE.match(text, pos).end()
+                if text[pos] != ':':
+                    raise ValueError(f"expected ':' at char {pos}")
+                pos = _WHITESPACE.match(text, pos + 1).end()
+                pos = yield key, pos
+                pos = _WHITESPACE.match(text, pos).end()
+                if text[pos] == '}':
+                    yield None, pos + 1
+                    return
+                if text[pos] != ',':
+                    raise ValueError(f"expected ',' or '}}' at char {pos}")
+                pos = _WHITESPACE.match(text, pos + 1).end()
+
+        sections, values = {}, {}
+        top = members(_WHITESPACE.match(text, 0).end())
+        key, pos = next(top)
+        while key is not None:
+            if text[pos] == '{':
+                entries = sections[key] = {}
+                inner = members(pos)
+                entry_key, entry_pos = next(inner)
+                while entry_key is not None:
+                    # decode only to find the end of the entry, the object is dropped right away
+                    _, end = decoder.raw_decode(text, entry_pos)
+                    start = byte_offset(entry_pos)
+                    entries[entry_key] = (start, byte_offset(end) - start)
+                    entry_key, entry_pos = inner.send(end)
+                pos = entry_pos
+            else:
+                values[key], pos = decoder.raw_decode(text, pos)
+            key, pos = top.send(pos)
+
+        return {'sections': sections, 'values': values}
+
+
+    def section(self, name: str) -> "DataPackSection":
+        """
+        Lazy mapping view of one top-level section
+
+        :param name: section name ('game', 'debug', ...)
+        :return: DataPackSection
+        """
+        return DataPackSection(self, name)
+
+
+    def as_dict(self) -> dict:
+        """
+        Top-level view of the file: sections as lazy mappings, other members as plain values
+
+        :return: dict shaped like json.load() of the file
+        """
+        return {**{name: self.section(name) for name in self.index['sections']}, **self.index['values']}
+
+
+    def get_entry(self, section: str, key: str):
+        """
+        Decode one entry (or return it from the LRU)
+
+        :param section: top-level section name
+        :param key: entry key inside the section
+        :return: decoded entry
+        """
+        cache_key = (section, key)
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            self.stats['hits'] += 1
+            return self._cache[cache_key]
+
+        offset, length = self.index['sections'][section][key]
+        if self._map is None:
+            self._file = open(self.file_path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        entry = json.loads(self._map[offset:offset + length])
+
+        self.stats['misses'] += 1
+        self._cache[cache_key] = entry
+        if len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return entry
+
+
+    def close(self) -> None:
+        """Release the file mapping (entries are remapped on the next miss)."""
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+
+class DataPackSection(Mapping):
+    """Read-only mapping over one section of a DataPack, entries are decoded on access."""
+
+    def __init__(self, pack: DataPack, name: str):
+        self.pack = pack
+        self.name = name
+        self._keys = pack.index['sections'][name]
+
+
+    def __getitem__(self, key: str):
+        if key not in self._keys:
+            raise KeyError(key)
+        return self.pack.get_entry(self.name, key)
+
+
+    def __iter__(self):
+        return iter(self._keys)
+
+
+    def __len__(self):
+        return len(self._keys)
+
+
+    def __contains__(self, key):
+        return key in self._keys
+
+
+    def __repr__(self):
+        return f"DataPackSection('{self.name}', {len(self)} entries)"
@@ -1,18 +1,37 @@
+import gc
+import hashlib
 import logging
 import os
+import pickle
+import time
 from os.path import dirname, abspath
 from pathlib import Path
 import json
 
 from data.config.config_settings import DATALOADER_SETTINGS
+from utility.tools.data_pack import DataPack
 from utility.tools.dev_logger import DevLogger
 
 class Dataloader:
-    def __init__(self):
+    CACHE_VERSION = 1      # bump when the cached layout changes
+
+    def __init__(self, use_cache: bool | None = None, pack_mode: bool | None = None):
+        """
+        :param use_cache: read/write compiled data files, defaults to DATALOADER_SETTINGS['cache_enabled']
+        :param pack_mode: open files as indexed DataPacks (sections become lazy mappings), defaults to
+            DATALOADER_SETTINGS['pack_mode']. Only helps callers reading single entries, walking a whole
+            section (e.g. Instance_Generator.generate_all_locations) decodes every entry anyway
+        """
         self.logger = DevLogger(Dataloader)
 
         self.cwd = dirname(dirname(dirname(abspath(__file__))))
         self.data_paths = DATALOADER_SETTINGS['data_paths']
+        self.use_cache = DATALOADER_SETTINGS['cache_enabled'] if use_cache is None else use_cache
+        self.cache_dir = f"{self.cwd}{DATALOADER_SETTINGS['cache_dir']}"
+        self.pack_mode = DATALOADER_SETTINGS['pack_mode'] if pack_mode is None else pack_mode
+        self.packs: list[DataPack] = []
+
+        self.stats = {'hits': 0, 'misses': 0, 'load_time': 0.0}
 
     def load_data(self):
         """
@@ -22,10 +41,12 @@ class Dataloader:
         """
         data_dict = {}
         self.logger.info(f'loading data...')
+        start = time.perf_counter()
         for path in self.data_paths:
             full_path = f"{self.cwd}{self.data_paths[path]}"
             folder_name = Path(full_path).name  # <-- get just the folder name
             data_dict[folder_name] = self.load_data_from_path(full_path)
+        self.stats['load_time'] += time.perf_counter() - start
         return data_dict
 
 
@@ -41,12 +62,148 @@ class Dataloader:
             if filename.endswith(".json"):
                 file_path = os.path.join(full_path, filename)
                 self.logger.info(f'loading \'{filename}\'')
-                with open(file_path, "r") as file:
-                    loaded_data = json.load(file)
-                    data_dict[filename.removesuffix('.json')] = loaded_data
+                data_dict[filename.removesuffix('.json')] = self.load_file(file_path)
         return data_dict
 
 
+    def load_file(self, file_path):
+        """
+        Load a single json data file (through the compiled cache or as a pack, like load_data)
+
+        :param file_path:
+        :return: data dict
+        """
+        if self.pack_mode:
+            return self.open_pack(file_path).as_dict()
+        if self.use_cache:
+            return self._load_cached(file_path)
+        with open(file_path, "r") as file:
+            return json.load(file)
+
+
+    def open_pack(self, file_path: str) -> DataPack:
+        """
+        Open a json file as an indexed DataPack, the index goes through the compiled cache like parsed data
+
+        :param file_path: json file
+        :return: DataPack
+        """
+        if self.use_cache:
+            index = self._load_cached(file_path, kind='index')
+        else:
+            with open(file_path, 'rb') as file:
+                index = DataPack.build_index(file.read())
+        pack = DataPack(file_path, index, DATALOADER_SETTINGS['pack_cache_entries'])
+        self.packs.append(pack)
+        return pack
+
+
+    def get_cache_stats(self) -> dict:
+        """
+        Cache statistics since this Dataloader was created
+
+        :return: {'hits', 'misses', 'load_time' (seconds spent in load_data), and in pack mode
+            'entry_hits', 'entry_misses' (decoded entry LRU)}
+        """
+        stats = dict(self.stats)
+        if self.packs:
+            stats['entry_hits'] = sum(pack.stats['hits'] for pack in self.packs)
+            stats['entry_misses'] = sum(pack.stats['misses'] for pack in self.packs)
+        return stats
+
+
+    def _cache_path(self, file_path: str, kind: str) -> str:
+        """
+        Cache entry of a json file, keyed by a hash of its absolute path (works for files outside the repo
+        and on other drives), the file name is kept in front for readability
+
+        :param file_path: json file
+        :param kind: 'data' or 'index'
+        :return: cache file path
+        """
+        file_path = os.path.abspath(file_path)
+        key = hashlib.sha1(os.path.normcase(file_path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{os.path.basename(file_path)}.{key}.{kind}.pickle")
+
+
+    def _load_cached(self, file_path: str, kind: str = 'data'):
+        """
+        Load a json file through its compiled cache entry. The entry is valid while size and mtime match,
+        a changed mtime with identical content (same hash) revalidates the entry instead of reparsing
+
+        :param file_path: json file
+        :param kind: 'data' (parsed document) or 'index' (DataPack index)
+        :return: parsed data or pack index
+        """
+        stat = os.stat(file_path)
+        cache_path = self._cache_path(file_path, kind)
+
+        entry = None
+        try:
+            with open(cache_path, 'rb') as file:
+                entry = self._without_gc(pickle.load, file)
+            if entry.get('version') != self.CACHE_VERSION:
+                entry = None
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            self.logger.warning(f'dropping unreadable cache entry \'{cache_path}\': {e}')
+
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            self.stats['hits'] += 1
+            return entry['data']
+
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+        digest = hashlib.sha1(raw).hexdigest()
+
+        if entry is not None and entry['hash'] == digest:
+            self.stats['hits'] += 1
+            data = entry['data']
+        else:
+            self.stats['misses'] += 1
+            self.logger.info(f'compiling \'{os.path.basename(file_path)}\'')
+            data = self._without_gc(json.loads if kind == 'data' else DataPack.build_index, raw)
+
+        self._write_cache(cache_path, {
+            'version': self.CACHE_VERSION, 'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': digest, 'data': data,
+        })
+        return data
+
+
+    @staticmethod
+    def _without_gc(function, *args):
+        """
+        Run function with the cyclic garbage collector paused. Building large nested dicts triggers
+        many collections that find nothing (the data holds no cycles) and cost more than the parsing
+
+        :param function: loader to call
+        :param args: loader arguments
+        :return: loader result
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return function(*args)
+        finally:
+            if enabled:
+                gc.enable()
+
+
+    def _write_cache(self, cache_path: str, entry: dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # write to a temp file first so a crash never leaves a half written entry behind
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f'could not write cache entry \'{cache_path}\': {e}')
+
+
 if __name__ == '__main__':
-    data = Dataloader().load_data()
+    loader = Dataloader()
+    data = loader.load_data()
     print(data)
+    print(loader.get_cache_stats())
@@ -0,0 +1,174 @@
+"""
+Frame profiler
+Author: larscd
+Description:
+    Per-phase frame timing for the game loop, cheap enough to stay on in release builds.
+    The loop calls begin_frame() once, mark(phase) after each phase and end_frame() at the end. A mark is a
+    single perf_counter() call, end_frame() stores the frame's phase times as one row.
+
+    Two views of the timings are kept:
+        - rolling: the last `window` frames in a ring buffer, percentiles over what the game does right now
+        - run: a log-binned histogram per phase over every frame since start, percentiles for the whole
+          session without keeping every sample
+
+    write() saves both as JSON or CSV (picked from the file extension).
+"""
+
+import csv
+import json
+import os
+from time import perf_counter
+
+import numpy as np
+
+from data.config.config_settings import PROFILER_SETTINGS
+
+FRAME = 'frame'     # extra column, the whole frame from begin_frame() to end_frame()
+
+
+class FrameProfiler:
+    def __init__(self, phases: list[str], settings: dict = PROFILER_SETTINGS):
+        """
+        :param phases: phase names in loop order, mark() only accepts these
+        :param settings: PROFILER_SETTINGS like dict
+        """
+        self.settings = settings
+        self.enabled: bool = settings['enabled']
+        self.phases: list[str] = list(phases) + [FRAME]
+        self._column: dict[str, int] = {phase: i for i, phase in enumerate(self.phases)}
+        self.percentiles: tuple[float, ...] = tuple(settings['percentiles'])
+
+        # --- rolling window, seconds per frame and phase ---
+        self.window: int = max(1, settings['window'])
+        self._samples = np.zeros((self.window, len(self.phases)))
+        self._row = np.zeros(len(self.phases))        # phase times of the frame in progress
+        self.frames: int = 0                            # frames recorded since start
+
+        # --- whole run, log spaced histogram bins in milliseconds ---
+        low, high = settings['histogram_range_ms']
+        self.bin_edges_ms = np.geomspace(low, high, settings['histogram_bins'] + 1)
+        self.histogram = np.zeros((len(self.phases), len(self.bin_edges_ms) + 1), dtype=np.int64)  # + under/overflow
+        self._max = np.zeros(len(self.phases))
+        self._total = np.zeros(len(self.phases))
+
+        self._frame_start: float = 0.0
+        self._last: float = 0.0
+
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._frame_start = self._last = perf_counter()
+        self._row[:] = 0.0
+
+
+    def mark(self, phase: str) -> None:
+        """
+        Close a phase: the time since the previous mark (or begin_frame) is added to it
+
+        :param phase: phase name, a phase marked twice in one frame is summed
+        :return:
+        """
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self._row[self._column[phase]] += now - self._last
+        self._last = now
+
+
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+        row = self._row
+        row[-1] = perf_counter() - self._frame_start
+        self._samples[self.frames % self.window] = row
+        self.frames += 1
+
+        bins = np.searchsorted(self.bin_edges_ms, row * 1000.0)
+        self.histogram[np.arange(len(row)), bins] += 1
+        np.maximum(self._max, row, out=self._max)
+        self._total += row
+
+
+    # --- statistics ---
+    def rolling(self) -> dict[str, dict[str, float]]:
+        """
+        Percentiles over the last `window` frames
+
+        :return: {phase: {'p50': ms, 'p95': ms, ..., 'mean': ms, 'max': ms}}
+        """
+        samples = self._samples[:min(self.frames, self.window)] * 1000.0
+        if not len(samples):
+            return {}
+        values = np.percentile(samples, self.percentiles, axis=0)
+        means, maxima = samples.mean(axis=0), samples.max(axis=0)
+        return {phase: self._stats(values[:, i], means[i], maxima[i]) for i, phase in enumerate(self.phases)}
+
+
+    def run(self) -> dict[str, dict[str, float]]:
+        """
+        Percentiles over every frame since start, read from the histograms (accurate to one bin width)
+
+        :return: {phase: {'p50': ms, 'p95': ms, ..., 'mean': ms, 'max': ms}}
+        """
+        if not self.frames:
+            return {}
+        # a percentile is placed inside its bin by linear interpolation between the bin edges
+        edges = np.concatenate(([0.0], self.bin_edges_ms, [max(self._max.max() * 1000.0, self.bin_edges_ms[-1])]))
+        cumulative = np.cumsum(self.histogram, axis=1)
+        result = {}
+        for i, phase in enumerate(self.phases):
+            values = []
+            for q in self.percentiles:
+                rank = q / 100.0 * self.frames
+                b = min(int(np.searchsorted(cumulative[i], rank)), self.histogram.shape[1] - 1)
+                below = cumulative[i, b - 1] if b else 0
+                fraction = (rank - below) / self.histogram[i, b] if self.histogram[i, b] else 0.0
+                values.append(min(edges[b] + fraction * (edges[b + 1] - edges[b]), self._max[i] * 1000.0))
+            result[phase] = self._stats(values, self._total[i] * 1000.0 / self.frames, self._max[i] * 1000.0)
+        return result
+
+
+    def _stats(self, values, mean: float, maximum: float) -> dict[str, float]:
+        stats = {f"p{q:g}": round(float(v), 4) for q, v in zip(self.percentiles, values)}
+        stats['mean'] = round(float(mean), 4)
+        stats['max'] = round(float(maximum), 4)
+        return stats
+
+
+    # --- output ---
+    def write(self, path: str) -> str:
+        """
+        Save rolling and whole run statistics, .csv gives one row per phase and view, anything else JSON
+        (which also holds the histograms)
+
+        :param path: output file, parent directories are created
+        :return: path written
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        rolling, run = self.rolling(), self.run()
+
+        if path.lower().endswith('.csv'):
+            columns = [f"p{q:g}" for q in self.percentiles] + ['mean', 'max']
+            with open(path, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(['phase', 'view', 'frames'] + [f"{c}_ms" for c in columns])
+                for view, stats, frames in (('rolling', rolling, min(self.frames, self.window)),
+                                            ('run', run, self.frames)):
+                    for phase, values in stats.items():
+                        writer.writerow([phase, view, frames] + [values[c] for c in columns])
+            return path
+
+        report = {
+            'frames': self.frames,
+            'window': self.window,
+            'rolling': rolling,
+            'run': run,
+            'histogram': {
+                'bin_edges_ms': [round(float(e), 6) for e in self.bin_edges_ms],
+                'counts': {phase: self.histogram[i].tolist() for i, phase in enumerate(self.phases)},  # [under, ..., over]
+            },
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        return path